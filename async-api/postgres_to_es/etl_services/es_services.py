@@ -36,6 +36,9 @@ class ElasticsearchService:
             if not self.client.indices.exists(index=index):
                 self.create_index(index=index, file_path=file_path)
                 logger.info('Index "%s" successfully created!', index)
+            else:
+                # new fields of the index schema are added to the existing index mapping
+                self.update_mapping(index=index, file_path=file_path)
 
     @backoff(
         logger=logger,
@@ -52,6 +55,23 @@ class ElasticsearchService:
                 index=index, **index_settings, ignore=ignore_http_response
             )
 
+    @backoff(
+        logger=logger,
+        verbose_name='ElasticsearchService.update_mapping()',
+        max_attempt=settings.BACKOFF.MAX_ATTEMPT,
+        exception=ElasticsearchException,
+    )
+    def update_mapping(
+        self, index: str, file_path: str, ignore_http_response: int = 400
+    ) -> None:
+        with open(file_path, 'r', encoding='UTF8') as index_schema_file:
+            index_settings = json.load(index_schema_file)
+            result = self.client.indices.put_mapping(
+                index=index, body=index_settings['mappings'], ignore=ignore_http_response
+            )
+            if 'error' in result:
+                logger.error('Index "%s" mapping was not updated: %s', index, result['error'])
+
     @backoff(
         logger=logger,
         verbose_name='ElasticsearchService.migrate_data()',
@@ -211,7 +211,12 @@ def get_persons(
 ) -> tuple[Union[Generator, list], PersonStateSchema]:
     """Function get cursor with all updated persons"""
     pg_cursor = PostgresExtract(cursor=pg_cursor, state=status)
-    db_result, status.person_updated_at = pg_cursor.get_persons()
+    db_result, person_updated_at, filmwork_updated_at = pg_cursor.get_persons()
+    # keep the previous state if there are no updated persons or film works
+    if person_updated_at:
+        status.person_updated_at = person_updated_at
+    if filmwork_updated_at:
+        status.filmwork_updated_at = filmwork_updated_at
     return db_result, status
 
 
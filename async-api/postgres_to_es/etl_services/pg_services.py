@@ -11,6 +11,7 @@ from postgres_to_es.queries import (
     query_genres_by_ids,
     query_last_updated_genre,
     query_last_updated_person,
+    query_persons_by_film_works,
     query_persons_by_ids,
     query_updated_film_works,
     query_updated_genres,
@@ -132,8 +133,9 @@ class PostgresExtract:
             )
             return db_result
 
-    def get_persons(self) -> Tuple[Union[Generator, list], Optional[str]]:
-        """Return db cursor on result query all persons and related data and last updated_at person"""
+    def get_persons(self) -> Tuple[Union[Generator, list], Optional[str], Optional[str]]:
+        """Return db cursor on result query updated persons and persons of updated film_works
+        with related data, last updated_at person and last updated_at film_work"""
         updated_at = self.state.person_updated_at
         chunk_persons = self.query_batch_executor(query=query_updated_persons(updated_at))
         persons = []
@@ -141,14 +143,19 @@ class PostgresExtract:
             if not row:
                 break
             persons.append(row)
-        if persons:
-            persons_ids = tuple([person['id'] for person in persons])
+        persons_ids = [person['id'] for person in persons]
+        person_status = str(persons[-1].get(settings.ETL.STATE_FIELD)) if persons else None
+        # person's films with titles and ratings are stored in the persons index,
+        # so persons of updated film works are reloaded too
+        film_works_id, film_work_status = self.get_film_works_id()
+        if film_works_id:
+            persons_ids += self.get_persons_id_by_film_works(film_works_id=film_works_id)
+        if persons_ids:
             db_result = self.query_batch_executor(
-                query=query_persons_by_ids(persons_ids=persons_ids)
+                query=query_persons_by_ids(persons_ids=tuple(set(persons_ids)))
             )
-            person_status = str(persons[-1].get(settings.ETL.STATE_FIELD))
-            return db_result, person_status
-        return [], None
+            return db_result, person_status, film_work_status
+        return [], None, None
 
     def get_genres(self) -> Tuple[Union[Generator, list], Optional[str]]:
         """Return db cursor on result query all genres and related data and last updated_at genres"""
@@ -245,3 +252,11 @@ class PostgresExtract:
             query=query_film_works_by_genres(genres_id=genres_id)
         )
         return [film_works_by_genre['id'] for film_works_by_genre in film_works_by_genres]
+
+    def get_persons_id_by_film_works(self, film_works_id: list[str]) -> list[str]:
+        """Return list of persons id for specified film_works id"""
+        # get film work's persons id
+        persons_by_film_works = self.query_batch_executor(
+            query=query_persons_by_film_works(film_works_id=film_works_id)
+        )
+        return [person_by_film_work['id'] for person_by_film_work in persons_by_film_works]
@@ -3,6 +3,11 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+def sql_ids(ids) -> str:
+    """Return ids as a list for the IN clause. Unlike str(tuple), a single id has no trailing comma"""
+    return ', '.join(f"'{object_id}'" for object_id in ids)
+
+
 def query_all_film_works_id() -> str:
     """Query return all film works (id, updated_at)"""
     query = """
@@ -92,19 +97,51 @@ def query_film_works_by_persons(persons_id: list) -> str:
     return query
 
 
+def query_persons_by_film_works(film_works_id: list) -> str:
+    """Query return persons (id), who took part in specific film works"""
+    query = f"""
+        SELECT DISTINCT pfw.person_id AS id
+        FROM content.person_film_work pfw
+        WHERE pfw.film_work_id IN ({sql_ids(film_works_id)});
+    """
+    return query
+
+
 def query_persons_by_ids(persons_ids: tuple):
-    """Query return all persons by specific ids"""
+    """Query return all persons by specific ids.
+    Person's films are sorted by rating, so the API returns person's top films without a nested search
+    over the film works index"""
     query = f"""
         SELECT
             content.person.id AS uuid,
             content.person.full_name,
             content.person.full_name_ru,
             array_agg(distinct(cast(content.film_work.id AS text))) AS film_ids,
-            array_agg(distinct(content.person_film_work.role)) AS roles
+            array_agg(distinct(content.person_film_work.role)) AS roles,
+            (
+                SELECT coalesce(
+                    jsonb_agg(
+                        person_film ORDER BY person_film.imdb_rating DESC NULLS LAST, person_film.title
+                    ),
+                    '[]'::jsonb
+                )
+                FROM (
+                    SELECT DISTINCT
+                        fw.id AS uuid,
+                        fw.title,
+                        fw.title_ru,
+                        fw.imdb_image,
+                        fw.rating AS imdb_rating,
+                        fw.subscription_required
+                    FROM content.film_work fw
+                    JOIN content.person_film_work pfw ON pfw.film_work_id = fw.id
+                    WHERE pfw.person_id = content.person.id
+                ) AS person_film
+            ) AS films
         FROM content.person
         LEFT OUTER JOIN content.person_film_work ON content.person_film_work.person_id = content.person.id
         LEFT OUTER JOIN content.film_work ON content.film_work.id = content.person_film_work.film_work_id
-        WHERE content.person.id IN {persons_ids}
+        WHERE content.person.id IN ({sql_ids(persons_ids)})
         GROUP BY content.person.id;
     """
     return query
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime, date
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 from pydantic import BaseModel, validator
 
@@ -86,11 +86,15 @@ class ESPersonSchema(ESBaseSchema):
     full_name_ru: str
     roles: Optional[list[str]] = None
     film_ids: Optional[list[uuid.UUID]] = None
+    # Person's films (uuid, title, title_ru, imdb_image, imdb_rating, subscription_required)
+    # sorted by imdb_rating desc
+    films: Optional[list[dict[str, Any]]] = None
 
     class Meta:
         LIST_FIELDS = (
             'roles',
             'film_ids',
+            'films',
         )
 
     @validator(*Meta.LIST_FIELDS, pre=True, always=True)
@@ -121,3 +125,4 @@ class GenreStateSchema(BaseStateSchema):
 
 class PersonStateSchema(BaseStateSchema):
     person_updated_at: Optional[datetime] = datetime.min
+    filmwork_updated_at: Optional[datetime] = datetime.min
@@ -153,6 +153,14 @@ class GetFilmsByPersonKWARGS(KWARGS):
     response_description = 'Список с названием и рейтингом фильмов.'
 
 
+class GetPersonsKWARGS(KWARGS):
+    summary = 'Получение списка персон'
+    description = 'Получение списка персон с учетом пагинации'
+    response_description = (
+        'Список из Имен персон, их роли в фильмах и списками из UUID фильмов с их участием'
+    )
+
+
 class SearchPersonsKWARGS(KWARGS):
     summary = 'Поиск по персонам'
     description = 'Полнотекстовый поиск по Персонам'
@@ -177,6 +185,7 @@ class ExceptionMessages(Enum):
     OBJECT_NOT_FOUND = 'No objects were found matching the parameters.'
     SEARCH_SERVICE_NOT_AVAILABLE = 'Search service not available.'
     PAGE_OUT_OF_RANGE = 'Page number out of range. Max page is {}'
+    UNKNOWN_FIELDS = 'Unknown fields: {}'
 
 
 class Pagination(ORJSONModel):
@@ -0,0 +1,27 @@
+from typing import Optional
+
+from app.api.v1.api_schemas import ExceptionMessages
+from fastapi import HTTPException
+from starlette import status
+
+from app.models.base import ORJSONModel
+
+
+def get_fields(fields: Optional[str], model: ORJSONModel.__class__) -> Optional[list[str]]:
+    """
+    Разбор параметра запроса fields для получения части полей объекта.
+    Поле uuid возвращается всегда.
+    @param fields: строка с именами полей через запятую.
+    @param model: pydantic модель ответа эндпоинта, определяющая допустимые поля.
+    @return: отсортированный список полей или None, если необходимо вернуть объект полностью.
+    """
+    if not fields:
+        return None
+    requested = {field.strip() for field in fields.split(',') if field.strip()}
+    unknown = requested - model.__fields__.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=ExceptionMessages.UNKNOWN_FIELDS.value.format(', '.join(sorted(unknown))),
+        )
+    return sorted(requested | {'uuid'})
@@ -1,3 +1,5 @@
+from typing import Optional, Union
+
 from app.api.v1.api_schemas import (
     APIFilmworkDetail,
     APIFilmworksList,
@@ -8,9 +10,11 @@ from app.api.v1.api_schemas import (
     Params,
     SearchFilmsKWARGS,
 )
+from app.api.v1.fields import get_fields
 from app.core.dependencies import get_film_service
 from app.services.controllers.film import FilmService
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from starlette import status
 
 from app.core.config import settings
@@ -72,10 +76,19 @@ async def search_films(
 )
 async def film_details(
     film_id: str = Query(..., min_length=36, max_length=36, description='UUID объекта'),
+    fields: Optional[str] = Query(
+        None,
+        description='Поля фильма через запятую, например title_ru,imdb_rating. По умолчанию все поля',
+    ),
     film_service: FilmService = Depends(get_film_service),
     is_subscriber: bool = Depends(check_is_subscriber),
-) -> APIFilmworkDetail:
+) -> Union[APIFilmworkDetail, ORJSONResponse]:
     if not is_subscriber:
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail='Subscribers only')
+    requested_fields = get_fields(fields, APIFilmworkDetail)
+    if requested_fields:
+        # Частичный объект не проходит валидацию полной модели ответа, поэтому возвращается как есть
+        film = await film_service.get_fields_by_id(film_id, requested_fields)
+        return ORJSONResponse(content=film)
     film = await film_service.get_by_id(film_id)
     return APIFilmworkDetail(**film.dict())
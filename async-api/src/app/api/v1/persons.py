@@ -1,18 +1,23 @@
+from typing import Optional, Union
+
 from app.api.v1.api_schemas import (
     APIFilmworksList,
     APIPersonDetail,
     APIPersonsList,
     Filter,
     GetFilmsByPersonKWARGS,
+    GetPersonsKWARGS,
     GetPersonByIdKWARGS,
     Pagination,
     Params,
     SearchPersonsKWARGS,
 )
+from app.api.v1.fields import get_fields
 from app.core.dependencies import get_film_service, get_person_service
 from app.services.controllers.film import FilmService
-from app.services.controllers.person import PersonService
+from app.services.controllers.person import FILMS_BY_RATING_SORT_FIELDS, PersonService
 from fastapi import APIRouter, Depends, Query
+from fastapi.responses import ORJSONResponse
 
 from app.core.config import settings
 from app.core.oauth import check_is_subscriber
@@ -20,6 +25,22 @@ from app.core.oauth import check_is_subscriber
 router = APIRouter()
 
 
+@router.get('', response_model=APIPersonsList, **GetPersonsKWARGS.get_kwargs())
+async def get_persons(
+    page: int = Query(settings.ES.DEFAULT_PAGE, gt=0, description='Номер страницы'),
+    limit: int = Query(
+        settings.ES.DEFAULT_PAGE_SIZE, gt=0, description='Количество объектов на странице'
+    ),
+    person_service: PersonService = Depends(get_person_service),
+) -> APIPersonsList:
+    pagination = Pagination(page=page, limit=limit)
+    params = Params(query='', pagination=pagination)
+    persons, total = await person_service.get_by_params(params)
+    return APIPersonsList(
+        total=total, items=persons, page=page, limit=limit, count=len(persons)
+    )
+
+
 @router.get('/search', response_model=APIPersonsList, **SearchPersonsKWARGS.get_kwargs())
 async def search_persons(
     q: str,
@@ -40,8 +61,17 @@ async def search_persons(
 @router.get('/{person_id}', response_model=APIPersonDetail, **GetPersonByIdKWARGS.get_kwargs())
 async def person_details(
     person_id: str = Query(..., min_length=36, max_length=36, description='UUID объекта'),
+    fields: Optional[str] = Query(
+        None,
+        description='Поля персоны через запятую, например full_name_ru,roles. По умолчанию все поля',
+    ),
     person_service: PersonService = Depends(get_person_service),
-) -> APIPersonDetail:
+) -> Union[APIPersonDetail, ORJSONResponse]:
+    requested_fields = get_fields(fields, APIPersonDetail)
+    if requested_fields:
+        # Частичный объект не проходит валидацию полной модели ответа, поэтому возвращается как есть
+        person = await person_service.get_fields_by_id(person_id, requested_fields)
+        return ORJSONResponse(content=person)
     person = await person_service.get_by_id(person_id)
     return APIPersonDetail(**person.dict())
 
@@ -61,6 +91,7 @@ async def filmworks_for_person(
         description='Поле и направление сортировки',
     ),
     film_service: FilmService = Depends(get_film_service),
+    person_service: PersonService = Depends(get_person_service),
     is_subscriber: bool = Depends(check_is_subscriber),
 ) -> APIFilmworksList:
     fil = Filter(person=uuid)
@@ -68,5 +99,11 @@ async def filmworks_for_person(
     params = Params(
         pagination=pagination, sort_field=sort, filter_query=fil, is_subscriber=is_subscriber
     )
+    if sort in FILMS_BY_RATING_SORT_FIELDS:
+        # Фильмы по рейтингу берутся из документа персоны без поиска по вложенным ролям в индексе фильмов
+        result = await person_service.get_films_by_rating(uuid, params)
+        if result is not None:
+            films, total = result
+            return APIFilmworksList(total=total, items=films, count=len(films), page=page)
     films, total = await film_service.get_by_params(params)
     return APIFilmworksList(total=total, items=films, count=len(films), page=page)
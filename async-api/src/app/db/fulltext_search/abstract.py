@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from typing import Any
 
 from app.api.v1.api_schemas import Pagination
 
@@ -18,6 +19,18 @@ class FullTextSearchService(ABC):
         @return: искомый объект сериализованый с помощью pydantic модели.
         """
 
+    @abstractmethod
+    async def get_object_fields_by_id(
+        self, index: str, object_id: str, fields: list[str]
+    ) -> dict[str, Any]:
+        """
+        Метод для получения части полей конкретного объекта по его id.
+        @param index: индекс из которого необходимо получить объект.
+        @param object_id: uuid объекта.
+        @param fields: список полей объекта, которые необходимо получить.
+        @return: словарь с запрошенными полями объекта.
+        """
+
     @abstractmethod
     async def search(self, index, pagination: Pagination, body: dict) -> ORJSONModel:
         """
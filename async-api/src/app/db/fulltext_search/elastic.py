@@ -1,5 +1,6 @@
 from http import HTTPStatus
 from math import ceil
+from typing import Any
 
 from app.api.v1.api_schemas import ExceptionMessages, Pagination
 from app.db.fulltext_search.abstract import FullTextSearchService
@@ -31,6 +32,24 @@ class ESService(FullTextSearchService):
             )
         return model(**doc['_source'])
 
+    async def get_object_fields_by_id(
+        self, index: str, object_id: str, fields: list[str]
+    ) -> dict[str, Any]:
+        try:
+            # ES возвращает только запрошенные поля, остальные не читаются из _source и не передаются по сети
+            doc = await self.service.get(index=index, id=object_id, _source_includes=fields)
+        except NotFoundError:
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=ExceptionMessages.OBJECT_NOT_FOUND.value,
+            )
+        except ConnectionError:
+            raise HTTPException(
+                status_code=HTTPStatus.SERVICE_UNAVAILABLE,
+                detail=ExceptionMessages.SEARCH_SERVICE_NOT_AVAILABLE.value,
+            )
+        return doc['_source']
+
     async def search(self, index: str, pagination: Pagination, body: dict) -> ESSearchAnswer:
         try:
             docs = await self.service.search(
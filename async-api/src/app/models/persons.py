@@ -1,3 +1,4 @@
+from typing import Optional
 from uuid import UUID
 
 from pydantic import Field
@@ -5,6 +6,15 @@ from pydantic import Field
 from app.models.base import BaseFilmworkModel, ORJSONModel
 
 
+class ESPersonFilm(BaseFilmworkModel):
+    """Schema describe Film instance in the precomputed films list
+    of Person instance doc from persons index ElasticSearch"""
+
+    subscription_required: bool = Field(
+        True, title='Требуется подписка', description='Фильм доступен только подписчикам'
+    )
+
+
 class ESPerson(ORJSONModel):
     """Schema describe Person instance doc,
     which will get from persons index ElasticSearch"""
@@ -24,6 +34,11 @@ class ESPerson(ORJSONModel):
     film_ids: list[UUID] = Field(
         title='Фильмы', description='Перечень фильмов, в которых принимал участие'
     )
+    films: Optional[list[ESPersonFilm]] = Field(
+        None,
+        title='Фильмы по рейтингу',
+        description='Фильмы персоны по убыванию рейтинга, рассчитанные при загрузке в ElasticSearch',
+    )
 
 
 class ESFilmworkPerson(BaseFilmworkModel):
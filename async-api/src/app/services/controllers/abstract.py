@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Any, Optional
 
 from app.api.v1.api_schemas import Params
 
@@ -20,6 +20,15 @@ class Controller(ABC):
         @return: искомый объект сериализованый в pydantic модели
         """
 
+    @abstractmethod
+    async def get_fields_by_id(self, object_id: str, fields: list[str]) -> dict[str, Any]:
+        """
+        Метод для получения части полей объекта по его id.
+        @param object_id: uuid необходимого объекта.
+        @param fields: список полей объекта, которые необходимо получить.
+        @return: словарь с запрошенными полями объекта.
+        """
+
     @abstractmethod
     async def get_by_params(self, params: Params) -> (Optional[list[ORJSONModel]], int):
         """
@@ -1,7 +1,8 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, Optional
 
 import backoff
+from fastapi import HTTPException
 from app.api.v1.api_schemas import Params
 from app.db.cache.abstract import Cache
 from app.db.fulltext_search.abstract import FullTextSearchService
@@ -44,6 +45,24 @@ class BaseService(Controller):
             await self.cache.set(cache_key, obj.json())
         return obj
 
+    @backoff.on_exception(
+        wait_gen=backoff.expo,
+        max_tries=settings.BACKOFF.RETRIES,
+        max_time=settings.BACKOFF.MAX_TIME,
+        exception=Exception,
+        # Отсутствующий объект (404) - ответ, а не сбой ES: он возвращается сразу, без повторов
+        giveup=lambda err: isinstance(err, HTTPException),
+        on_backoff=backoff_hdlr,
+        on_success=backoff_hdlr_success,
+    )
+    async def get_fields_by_id(self, object_id: str, fields: list[str]) -> dict[str, Any]:
+        cache_key = ':::'.join([self.index, object_id, ','.join(fields)])
+        obj = await self.cache.get(cache_key)
+        if not obj:
+            obj = await self.search_service.get_object_fields_by_id(self.index, object_id, fields)
+            await self.cache.set(cache_key, obj)
+        return obj
+
     @backoff.on_exception(
         wait_gen=backoff.expo,
         max_tries=settings.BACKOFF.RETRIES,
@@ -1,11 +1,18 @@
 import logging
+from http import HTTPStatus
+from math import ceil
+from typing import Any, Optional
 
-from app.api.v1.api_schemas import Params
+from app.api.v1.api_schemas import ExceptionMessages, Params
 from app.models.persons import ESPerson
 from app.services.controllers.base import BaseService, IndexEnum
+from fastapi import HTTPException
 
 logger = logging.getLogger(__name__)
 
+# Сортировки, для которых фильмы персоны отдаются из рассчитанного при загрузке в ES списка
+FILMS_BY_RATING_SORT_FIELDS = ('-imdb_rating', 'imdb_rating')
+
 
 class PersonService(BaseService):
     index = IndexEnum.PERSONS.value
@@ -22,3 +29,56 @@ class PersonService(BaseService):
         ]
         logger.debug('PersonService cache key: %s', ':::'.join(str(i) for i in args))
         return ':::'.join(str(i) for i in args)
+
+    async def get_films_by_rating(
+        self, person_id: str, params: Params
+    ) -> Optional[tuple[list[dict[str, Any]], int]]:
+        """
+        Метод для получения страницы фильмов персоны, отсортированных по рейтингу.
+        Список фильмов персоны по убыванию рейтинга рассчитывается при загрузке в ES и хранится
+        в документе персоны, поэтому вместо поиска по вложенным ролям в индексе фильмов
+        документ читается по ключу.
+        @param person_id: uuid персоны.
+        @param params: параметры пагинации, сортировки и доступа к фильмам по подписке.
+        @return: фильмы страницы и общее количество фильмов персоны
+        или None, если персоны нет в индексе или список ее фильмов еще не рассчитан.
+        """
+        # Запрос выполняется без повторов get_fields_by_id: отсутствие персоны в индексе персон
+        # не ошибка, а сигнал сразу перейти к поиску в индексе фильмов
+        cache_key = ':::'.join([self.index, person_id, 'films'])
+        person = await self.cache.get(cache_key)
+        if not person:
+            try:
+                person = await self.search_service.get_object_fields_by_id(
+                    self.index, person_id, ['films']
+                )
+            except HTTPException as err:
+                # Персона еще не загружена в индекс персон, ее фильмы ищутся в индексе фильмов
+                if err.status_code != HTTPStatus.NOT_FOUND:
+                    raise
+                return None
+            await self.cache.set(cache_key, person)
+        films = person.get('films')
+        if films is None:
+            return None
+        if params.is_subscriber is False:
+            films = [film for film in films if not film.get('subscription_required', True)]
+        if params.sort_field == 'imdb_rating':
+            # Фильмы без рейтинга остаются в конце списка, как при сортировке в ES
+            films = [film for film in reversed(films) if film.get('imdb_rating') is not None] + [
+                film for film in films if film.get('imdb_rating') is None
+            ]
+        pagination = params.pagination
+        page_films = films[pagination.offset:pagination.offset + pagination.limit]
+        if not page_films:
+            max_page = ceil(len(films) / pagination.limit)
+            if max_page and pagination.page > max_page:
+                raise HTTPException(
+                    status_code=HTTPStatus.UNPROCESSABLE_ENTITY,
+                    detail=ExceptionMessages.PAGE_OUT_OF_RANGE.value.format(max_page),
+                )
+            raise HTTPException(
+                status_code=HTTPStatus.NOT_FOUND,
+                detail=ExceptionMessages.OBJECT_NOT_FOUND.value,
+            )
+        return page_films, len(films)
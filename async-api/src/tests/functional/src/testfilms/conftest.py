@@ -23,6 +23,11 @@ def person_id():
     return '26e83050-29ef-4163-a99d-b546cac208f8'  # Person: Mark Hamill
 
 
+@pytest.fixture
+def person_with_films_id():
+    return '7f1c7a3e-8d52-4b3f-9c1e-2f0a5e6d4b21'  # Person: Carrie Fisher, films precomputed by ETL
+
+
 @pytest.fixture
 def film_id():
     return '0312ed51-8833-413f-bff5-0e139c11264a'  # Filmwork: Star Wars: Episode V - The Empire Strikes Back
@@ -37,3 +42,11 @@ async def v1_film_detail_url(v1_films_url, film_id):
 async def es_load_films(es_client_load):
     total, successes = await es_client_load(file='docs_for_es_movies.json', index='movies')
     assert total == successes
+
+
+@pytest.fixture(scope='module')
+async def es_load_persons_with_films(es_client_load):
+    total, successes = await es_client_load(
+        file='docs_for_es_persons_with_films.json', index='persons'
+    )
+    assert total == successes
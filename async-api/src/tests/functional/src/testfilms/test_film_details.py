@@ -24,6 +24,41 @@ async def test_film_detail(
     assert response.body == expected_detail
 
 
+async def test_film_detail_with_fields(
+    es_load_films,
+    clear_cache,
+    make_get_request,
+    v1_film_detail_url,
+    expected_detail,
+    subscriber_headers,
+):
+    response = await make_get_request(
+        v1_film_detail_url, params={'fields': 'title,imdb_rating'}, headers=subscriber_headers
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body == {
+        field: expected_detail[field] for field in ('uuid', 'title', 'imdb_rating')
+    }
+
+
+async def test_film_detail_with_unknown_fields(
+    es_load_films,
+    clear_cache,
+    make_get_request,
+    v1_film_detail_url,
+    subscriber_headers,
+):
+    response = await make_get_request(
+        v1_film_detail_url,
+        params={'fields': 'title,subscription_required'},
+        headers=subscriber_headers,
+    )
+
+    assert response.status == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert response.body == {'detail': 'Unknown fields: subscription_required'}
+
+
 async def test_film_detail_with_not_subscriber__unauthorized(
     es_load_films,
     clear_cache,
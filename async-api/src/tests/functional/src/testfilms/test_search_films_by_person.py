@@ -176,6 +176,84 @@ async def test_person_film_list_use_default_page_and_limit_not_subscriber_ok(
     assert len(response.body['items']) == default_page_limit
 
 
+async def test_person_film_list_precomputed_sort_desc_imdb_rating(
+    es_load_persons_with_films,
+    clear_cache,
+    make_get_request,
+    v1_search_films_by_person_url,
+    person_with_films_id,
+    load_fixture,
+    subscriber_headers,
+):
+    film_by_person_url = v1_search_films_by_person_url.format(person_id=person_with_films_id)
+    response = await make_get_request(
+        film_by_person_url, params={'sort': '-imdb_rating'}, headers=subscriber_headers
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body == load_fixture('person_precomputed_film_list_sort_desc_imdb_rating.json')
+
+
+async def test_person_film_list_precomputed_sort_asc_imdb_rating_and_page_2(
+    es_load_persons_with_films,
+    clear_cache,
+    make_get_request,
+    v1_search_films_by_person_url,
+    person_with_films_id,
+    subscriber_headers,
+):
+    film_by_person_url = v1_search_films_by_person_url.format(person_id=person_with_films_id)
+    response = await make_get_request(
+        film_by_person_url,
+        params={'sort': 'imdb_rating', 'page': 2, 'limit': 2},
+        headers=subscriber_headers,
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body['total'] == 4
+    assert response.body['count'] == 2
+    # Фильмы без рейтинга остаются в конце списка, как при сортировке в ES
+    assert [item['imdb_rating'] for item in response.body['items']] == [8.7, None]
+
+
+async def test_person_film_list_precomputed_not_subscriber(
+    es_load_persons_with_films,
+    clear_cache,
+    make_get_request,
+    v1_search_films_by_person_url,
+    person_with_films_id,
+    not_subscriber_headers,
+):
+    film_by_person_url = v1_search_films_by_person_url.format(person_id=person_with_films_id)
+    response = await make_get_request(
+        film_by_person_url, params={'sort': '-imdb_rating'}, headers=not_subscriber_headers
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body['total'] == 3
+    assert '3d825f60-9fff-4dfe-b294-1a45fa1e115d' not in [
+        item['uuid'] for item in response.body['items']
+    ]
+
+
+async def test_person_film_list_precomputed_page_out_of_range(
+    es_load_persons_with_films,
+    clear_cache,
+    make_get_request,
+    v1_search_films_by_person_url,
+    person_with_films_id,
+    subscriber_headers,
+):
+    film_by_person_url = v1_search_films_by_person_url.format(person_id=person_with_films_id)
+    response = await make_get_request(
+        film_by_person_url,
+        params={'sort': '-imdb_rating', 'page': 3, 'limit': 2},
+        headers=subscriber_headers,
+    )
+
+    assert response.status == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 async def test_person_film_list_when_there_is_no_movies_index_in_es(
     clear_es_client_func,
     make_get_request,
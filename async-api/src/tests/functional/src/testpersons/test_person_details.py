@@ -29,6 +29,26 @@ async def test_person_detail_ok(
     assert response.body['full_name'] == expected_detail['full_name']
 
 
+async def test_person_detail_with_fields(
+    es_load_persons,
+    clear_cache,
+    make_get_request,
+    v1_persons_url,
+    person_id,
+    expected_detail,
+    subscriber_headers,
+):
+    person_detail_url = urljoin(v1_persons_url, person_id)
+    response = await make_get_request(
+        person_detail_url, params={'fields': 'full_name,roles'}, headers=subscriber_headers
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body == {
+        field: expected_detail[field] for field in ('uuid', 'full_name', 'roles')
+    }
+
+
 async def test_person_detail_when_there_is_no_persons_index_in_es(
     clear_es_client_func,
     make_get_request,
@@ -0,0 +1,32 @@
+import pytest
+from starlette import status
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.mark.parametrize(
+    'query_param, count',
+    [
+        pytest.param({}, 10, id='ok_default_pagination'),
+        pytest.param({'page': 3, 'limit': 50}, 50, id='ok_page_3_and_limit_50'),
+    ],
+)
+async def test_person_list(
+    es_load_persons,
+    clear_cache,
+    make_get_request,
+    v1_persons_url,
+    query_param,
+    count,
+    subscriber_headers,
+):
+    response = await make_get_request(
+        v1_persons_url, params=query_param, headers=subscriber_headers
+    )
+
+    assert response.status == status.HTTP_200_OK
+    assert response.body['total'] == 4166
+    assert response.body['count'] == count
+    assert len(response.body['items']) == count
+    for item in response.body['items']:
+        assert {'uuid', 'full_name', 'roles', 'film_ids'} <= item.keys()
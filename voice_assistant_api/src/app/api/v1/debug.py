@@ -0,0 +1,179 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+from starlette.requests import Request
+
+from app.core import session
+from app.core.session import get_pool_stats
+from app.db.cache.memory import get_response_cache
+from app.services.alice.state import get_state_codec
+from app.services.image_storage import get_image_storage
+from app.services.movies_data_search import get_movies_data_search, MoviesDataSearch
+from app.services.query_log_miner import get_query_log_miner
+from app.utils.timing import get_handler_stats
+
+router = APIRouter()
+
+
+@router.get(
+    '/session',
+    summary='Состояние пула соединений',
+    description='Количество открытых, свободных и занятых соединений сессии с AsyncAPI',
+)
+async def get_session_stats() -> dict[str, Any]:
+    return get_pool_stats(session.session)
+
+
+@router.get(
+    '/cache',
+    summary='Статистика кеша',
+    description=(
+        'Счетчики попаданий, промахов и вытеснений кеша результатов запросов к AsyncAPI '
+        'кеша поиска UUID по названию фильма или имени персоны и кеша отрисованных ответов'
+    ),
+)
+async def get_cache_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return {
+        'data': search_service.cache.get_stats(),
+        'slots': search_service.slot_cache.get_stats(),
+        'responses': get_response_cache().get_stats(),
+    }
+
+
+@router.get(
+    '/requests',
+    summary='Статистика запросов к AsyncAPI',
+    description=(
+        'Количество выполняющихся запросов, запросов, объединенных с уже выполняющимися, '
+        'фоновых загрузок следующих страниц списков фильмов и фоновых обновлений устаревших записей кеша'
+    ),
+)
+async def get_requests_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return {
+        'in_flight': len(search_service.in_flight),
+        'deduplicated': search_service.deduplicated,
+        'prefetch': {'in_flight': len(search_service.prefetch_tasks), **search_service.prefetch_stats},
+        'revalidate': {
+            'in_flight': len(search_service.revalidate_tasks),
+            **search_service.revalidate_stats,
+        },
+    }
+
+
+@router.get(
+    '/breaker',
+    summary='Состояние размыкателя цепи запросов к AsyncAPI',
+    description=(
+        'Состояние цепи, доля ошибочных и медленных запросов в скользящем окне, 95-й перцентиль времени '
+        'ответа в секундах, количество отклоненных запросов и переходов между состояниями'
+    ),
+)
+async def get_breaker_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return search_service.breaker.get_stats()
+
+
+@router.get(
+    '/handlers',
+    summary='Время обработки интентов',
+    description='Количество вызовов, среднее и максимальное время выполнения обработчиков интентов',
+)
+async def get_handlers_stats() -> dict[str, Any]:
+    return get_handler_stats()
+
+
+@router.get(
+    '/snapshot',
+    summary='Состояние снимка топов фильмов',
+    description='Количество страниц в снимке, его возраст и интервал обновления в секундах',
+)
+async def get_snapshot_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return search_service.snapshot.get_stats()
+
+
+@router.get(
+    '/title_index',
+    summary='Состояние локального индекса названий',
+    description=(
+        'Количество названий фильмов и имен персон в индексе, состояние синхронизации, '
+        'количество определений UUID без поиска в ES и среднее время поиска в индексе в секундах'
+    ),
+)
+async def get_title_index_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return search_service.title_index.get_stats()
+
+
+@router.get(
+    '/state',
+    summary='Размер состояния сессии',
+    description=(
+        'Количество закодированных состояний сессии, их суммарный размер в прежнем и компактном виде '
+        'в байтах, экономия в байтах на ход диалога и количество найденных и не найденных в кеше '
+        'последних фраз'
+    ),
+)
+async def get_state_stats() -> dict[str, Any]:
+    return get_state_codec().get_stats()
+
+
+@router.get(
+    '/mongo',
+    summary='Состояние записи в MongoDB',
+    description=(
+        'Глубина очереди записи запросов навыка, количество записанных, отброшенных и не записанных '
+        'документов, время записи пачки в секундах и состояние локального спула'
+    ),
+)
+async def get_mongo_stats(request: Request) -> dict[str, Any]:
+    writer = getattr(request.app, 'mongodb_writer', None)
+    if writer is None:
+        return {}
+    return writer.get_stats()
+
+
+@router.get(
+    '/images',
+    summary='Статистика хранилища изображений навыка',
+    description=(
+        'Количество найденных и не найденных в кеше идентификаторов постеров, загруженных, '
+        'неудачных и пропущенных фоновых загрузок изображений для карточек'
+    ),
+)
+async def get_images_stats() -> dict[str, Any]:
+    return get_image_storage().get_stats()
+
+
+@router.get(
+    '/prewarm',
+    summary='Прогрев кеша по журналу запросов',
+    description=(
+        'Количество прогревов и ошибок, отчет о последнем прогреве: количество самых запрашиваемых '
+        'фильмов, персон и страниц топов, загруженные записи, доля запросов окна журнала, обслуживаемых '
+        'из кеша, до и после прогрева и доля попаданий в кеш с предыдущего прогрева'
+    ),
+)
+async def get_prewarm_stats() -> dict[str, Any]:
+    return get_query_log_miner().get_stats()
+
+
+@router.get(
+    '/last_known_good',
+    summary='Снимок последних успешных ответов AsyncAPI на диске',
+    description=(
+        'Режим деградации, количество объектов, отданных из снимка и не найденных в нем, количество '
+        'и длительность сохранений снимка, количество объектов, размер и возраст снимка'
+    ),
+)
+async def get_last_known_good_stats(
+    search_service: MoviesDataSearch = Depends(get_movies_data_search),
+) -> dict[str, Any]:
+    return search_service.last_known_good.get_stats()
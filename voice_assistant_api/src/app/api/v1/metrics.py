@@ -0,0 +1,20 @@
+from fastapi import APIRouter
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from starlette.responses import Response
+
+from app.utils.metrics import REGISTRY
+
+router = APIRouter()
+
+
+@router.get(
+    '/metrics',
+    summary='Метрики Prometheus',
+    description=(
+        'Гистограммы времени обработки запросов навыка по сцене и интенту, методов поиска данных о фильмах '
+        'и запросов к AsyncAPI, количество таймаутов, нераспознанных запросов, отставание записи журнала '
+        'в MongoDB и счетчики кешей, размыкателя цепи и фоновых задач в текстовом формате Prometheus'
+    ),
+)
+async def get_metrics() -> Response:
+    return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,16 +1,15 @@
-import collections
-from typing import Awaitable
-
+import orjson
 from fastapi import APIRouter, Depends
 from fastapi.responses import ORJSONResponse
-from starlette.background import BackgroundTasks
 from starlette.requests import Request
 
+from app.core.config import settings
 from app.services.alice_voice_assistant import (
     AliceVoiceAssistantService,
     get_alice_voice_assistant_service,
 )
 from app.services.save_to_mongodb import save_doc
+from app.utils.deadline import Deadline
 
 router = APIRouter()
 
@@ -22,15 +21,12 @@ router = APIRouter()
 )
 async def get_movies_info(
     request: Request,
-    background_tasks: BackgroundTasks,
-    alice_service: Awaitable[AliceVoiceAssistantService] = Depends(
-        get_alice_voice_assistant_service
-    ),
+    alice_service: AliceVoiceAssistantService = Depends(get_alice_voice_assistant_service),
 ) -> ORJSONResponse:
-    if isinstance(alice_service, collections.Awaitable):
-        alice_service = await alice_service
-    event: dict = await request.json()
-    response, collection = await alice_service.handler(request_body=event)
-    background_tasks.add_task(save_doc, request, event, response, collection)
+    # Отсчет времени на ответ навыку начинается до чтения и разбора тела запроса
+    deadline = Deadline(settings.APP.RESPONSE_TIMEOUT)
+    event: dict = orjson.loads(await request.body())
+    response, collection = await alice_service.handler(request_body=event, deadline=deadline)
+    save_doc(request, event, response, collection)
 
     return ORJSONResponse(content=response)
@@ -9,6 +9,16 @@ logger = logging.getLogger(__name__)
 class RedisSettings(BaseSettings):
     HOST: str = Field('127.0.0.1', description='Адрес хоста DB Redis')
     PORT: str = Field(6379, description='Порт хоста DB Redis')
+    ENABLED: bool = Field(
+        False, description='Использовать Redis как общий для воркеров второй уровень кеша результатов запросов'
+    )
+    POOL_MINSIZE: int = Field(1, description='Минимальное количество соединений пула Redis')
+    POOL_MAXSIZE: int = Field(10, description='Максимальное количество соединений пула Redis')
+    TIMEOUT: float = Field(0.1, description='Максимальное время ожидания ответа Redis в секундах')
+    TTL_JITTER: float = Field(
+        0.1, description='Максимальная случайная добавка к времени жизни ключа в долях TTL'
+    )
+    KEY_PREFIX: str = Field('voice:v1:', description='Префикс ключей кеша в Redis')
 
     class Config:
         env_prefix = 'REDIS_'
@@ -19,6 +29,56 @@ class CacheSettings(BaseSettings):
     TTL: Optional[int] = Field(
         300, description='Время истечения срока действия ключа в секундах'
     )
+    MAX_ITEMS: int = Field(2000, description='Максимальное количество ключей в кеше процесса')
+    MAX_MEMORY: int = Field(
+        32 * 1024 * 1024, description='Максимальный объем памяти кеша процесса в байтах'
+    )
+    SLOT_TTL: int = Field(
+        3600, description='Время хранения найденного UUID фильма или персоны по названию/имени'
+    )
+    SLOT_MAX_ITEMS: int = Field(
+        10000, description='Максимальное количество названий/имен в кеше поиска UUID'
+    )
+    NOT_FOUND_TTL: int = Field(
+        60, description='Время хранения результата "не найдено" при поиске по названию/имени'
+    )
+    RESPONSE_TTL: float = Field(
+        300, description='Время хранения отрисованного ответа на вопрос о фильме или персоне в секундах'
+    )
+    RESPONSE_MAX_ITEMS: int = Field(
+        5000, description='Максимальное количество ответов в кеше отрисованных ответов'
+    )
+    LIST_FILMS_SOFT_TTL: float = Field(
+        60, description='Время в секундах, после которого страница списка фильмов обновляется в фоне'
+    )
+    LIST_FILMS_HARD_TTL: float = Field(
+        600, description='Максимальное время в секундах, в течение которого отдается страница списка фильмов'
+    )
+    FILM_DETAIL_SOFT_TTL: float = Field(
+        300, description='Время в секундах, после которого информация о фильме обновляется в фоне'
+    )
+    FILM_DETAIL_HARD_TTL: float = Field(
+        3600, description='Максимальное время в секундах, в течение которого отдается информация о фильме'
+    )
+    PERSON_DETAIL_SOFT_TTL: float = Field(
+        300, description='Время в секундах, после которого информация о персоне обновляется в фоне'
+    )
+    PERSON_DETAIL_HARD_TTL: float = Field(
+        3600, description='Максимальное время в секундах, в течение которого отдается информация о персоне'
+    )
+    FILMS_BY_PERSON_SOFT_TTL: float = Field(
+        300, description='Время в секундах, после которого список фильмов персоны обновляется в фоне'
+    )
+    FILMS_BY_PERSON_HARD_TTL: float = Field(
+        1800, description='Максимальное время в секундах, в течение которого отдается список фильмов персоны'
+    )
+    PREFETCH_MAX_TASKS: int = Field(
+        20,
+        description=(
+            'Максимальное количество одновременных фоновых загрузок следующей страницы списка фильмов, '
+            '0 отключает предварительную загрузку'
+        ),
+    )
 
     class Config:
         env_prefix = 'CACHE_'
@@ -30,6 +90,13 @@ class APPSettings(BaseSettings):
     PER_PAGE: int = Field(
         5, description='Количество результатов в ответе голосового помощника'
     )
+    RESPONSE_TIMEOUT: float = Field(
+        2.7,
+        description=(
+            'Время на обработку запроса навыка в секундах. '
+            'Алиса ожидает ответ webhook не более 3 секунд, с учетом передачи по сети'
+        ),
+    )
 
     class Config:
         env_prefix = 'APP_'
@@ -69,11 +136,166 @@ class AuthSettings(BaseSettings):
 class RequestSettings(BaseSettings):
     ASYNC_API_URL: AnyUrl = Field(..., description='Строка url к корневому эндпоинту AsyncAPI')
     AUTH_API_URL: AnyUrl = Field(..., description='Строка url к корневому эндпоинту AuthAPI')
+    TIMEOUT: float = Field(2.5, description='Максимальное время ожидания ответа AsyncAPI в секундах')
 
     class Config:
         env_prefix = 'REQUEST_'
 
 
+class BreakerSettings(BaseSettings):
+    WINDOW: float = Field(30, description='Длительность скользящего окна результатов запросов в секундах')
+    MIN_CALLS: int = Field(10, description='Минимальное количество запросов в окне для размыкания цепи')
+    FAILURE_RATE: float = Field(0.5, description='Доля ошибочных запросов в окне для размыкания цепи')
+    SLOW_CALL_DURATION: float = Field(
+        2.0, description='Длительность запроса в секундах, после которой он считается медленным'
+    )
+    SLOW_CALL_RATE: float = Field(0.5, description='Доля медленных запросов в окне для размыкания цепи')
+    OPEN_DURATION: float = Field(
+        15, description='Время в секундах, в течение которого запросы к AsyncAPI отклоняются'
+    )
+    HALF_OPEN_PROBES: int = Field(
+        3, description='Количество успешных пробных запросов для замыкания цепи'
+    )
+
+    class Config:
+        env_prefix = 'BREAKER_'
+        env_file = '.env'
+
+
+class SessionSettings(BaseSettings):
+    LIMIT: int = Field(100, description='Максимальное количество одновременных соединений пула')
+    LIMIT_PER_HOST: int = Field(
+        50, description='Максимальное количество одновременных соединений с одним хостом'
+    )
+    KEEPALIVE_TIMEOUT: float = Field(
+        30, description='Время жизни неиспользуемого keep-alive соединения в секундах'
+    )
+    TTL_DNS_CACHE: int = Field(300, description='Время кеширования DNS-записей в секундах')
+
+    class Config:
+        env_prefix = 'SESSION_'
+        env_file = '.env'
+
+
+class SnapshotSettings(BaseSettings):
+    PAGES: int = Field(3, description='Количество страниц топа фильмов каждого жанра в снимке')
+    REFRESH_INTERVAL: float = Field(600, description='Интервал обновления снимка топов фильмов в секундах')
+    CONCURRENCY: int = Field(
+        5, description='Максимальное количество одновременных запросов к AsyncAPI при обновлении снимка'
+    )
+
+    class Config:
+        env_prefix = 'SNAPSHOT_'
+        env_file = '.env'
+
+
+class TitleIndexSettings(BaseSettings):
+    MIN_SCORE: float = Field(
+        0.85, description='Минимальная схожесть названия или имени для ответа без поиска в ES, от 0 до 1'
+    )
+    MAX_CANDIDATES: int = Field(
+        20, description='Количество кандидатов с наибольшим числом общих триграмм для сравнения с запросом'
+    )
+    PAGE_SIZE: int = Field(100, description='Количество фильмов и персон на странице синхронизации индекса')
+    SYNC_INTERVAL: float = Field(1.0, description='Интервал загрузки страниц синхронизации в секундах')
+    RESYNC_INTERVAL: float = Field(
+        3600, description='Интервал между полными проходами синхронизации индекса в секундах'
+    )
+
+    class Config:
+        env_prefix = 'TITLE_INDEX_'
+        env_file = '.env'
+
+
+class StateSettings(BaseSettings):
+    COMPACT: bool = Field(
+        True,
+        description=(
+            'Передавать состояние сессии Алисе в компактном виде. Последняя фраза хранится в кеше Redis, '
+            'если он включен, иначе передается в состоянии в сжатом виде'
+        ),
+    )
+    PHRASE_TTL: float = Field(3600, description='Время хранения последней фразы сессии в секундах')
+    PHRASE_MAX_ITEMS: int = Field(
+        20000, description='Максимальное количество последних фраз в кеше процесса'
+    )
+
+    class Config:
+        env_prefix = 'STATE_'
+        env_file = '.env'
+
+
+class PrewarmSettings(BaseSettings):
+    ENABLED: bool = Field(
+        True, description='Прогревать кеши фильмами, персонами и топами, о которых чаще всего спрашивают'
+    )
+    WINDOW: float = Field(
+        24 * 3600, description='Глубина скользящего окна журнала запросов навыка в секундах'
+    )
+    INTERVAL: float = Field(900, description='Интервал между прогревами кеша в секундах')
+    START_DELAY: float = Field(
+        10, description='Задержка первого прогрева после старта приложения в секундах'
+    )
+    LIMIT: int = Field(
+        100, description='Количество самых запрашиваемых фильмов, персон и страниц топов для прогрева'
+    )
+    CONCURRENCY: int = Field(
+        5, description='Максимальное количество одновременных запросов к AsyncAPI при прогреве'
+    )
+    MAX_TIME: float = Field(
+        10, description='Максимальное время выполнения агрегации журнала в MongoDB в секундах'
+    )
+    REPORT_COLLECTION: str = Field(
+        'cache_prewarm', description='Коллекция MongoDB для отчетов о прогреве кеша'
+    )
+
+    class Config:
+        env_prefix = 'PREWARM_'
+        env_file = '.env'
+
+
+class CardSettings(BaseSettings):
+    ENABLED: bool = Field(
+        False, description='Показывать топы фильмов и фильмографии персон карточками с постерами'
+    )
+    SKILL_ID: str = Field('', description='Идентификатор навыка в Яндекс Диалогах')
+    OAUTH_TOKEN: str = Field('', description='OAuth-токен для загрузки изображений в хранилище навыка')
+    UPLOAD_URL: str = Field(
+        'https://dialogs.yandex.net/api/v1', description='Адрес API загрузки изображений Яндекс Диалогов'
+    )
+    UPLOAD_TIMEOUT: float = Field(10, description='Максимальное время загрузки одного изображения в секундах')
+    UPLOAD_MAX_TASKS: int = Field(
+        10, description='Максимальное количество одновременных фоновых загрузок изображений'
+    )
+    IMAGE_TTL: float = Field(
+        30 * 24 * 3600, description='Время хранения идентификатора загруженного изображения в секундах'
+    )
+    IMAGE_MAX_ITEMS: int = Field(
+        10000, description='Максимальное количество идентификаторов изображений в кеше процесса'
+    )
+    FAILED_TTL: float = Field(
+        600, description='Время в секундах до повторной загрузки изображения после неудачной попытки'
+    )
+
+    class Config:
+        env_prefix = 'CARD_'
+        env_file = '.env'
+
+
+class DiskSnapshotSettings(BaseSettings):
+    ENABLED: bool = Field(
+        True,
+        description='Сохранять топы и самые запрашиваемые объекты в снимок на диске для работы без AsyncAPI',
+    )
+    PATH: str = Field('snapshot/last_known_good.bin', description='Путь к файлу снимка на диске')
+    REFRESH_INTERVAL: float = Field(600, description='Интервал обновления снимка на диске в секундах')
+    MAX_ITEMS: int = Field(5000, description='Максимальное количество объектов в снимке на диске')
+
+    class Config:
+        env_prefix = 'DISK_SNAPSHOT_'
+        env_file = '.env'
+
+
 class MongoDBSettings(BaseSettings):
     DB_USER: str = Field('', description='Имя пользователя')
     DB_PASS: str = Field('', description='Пароль пользователя')
@@ -81,6 +303,27 @@ class MongoDBSettings(BaseSettings):
     DB_RS: str = Field('', description='Имя реплики')
     DB_NAME: str = Field('', description='Имя базы данных MongoDB')
     CACERT: str = Field('', description='Путь к файлу сертификата SSL')
+    BATCH_SIZE: int = Field(100, description='Максимальное количество документов в одной пачке записи')
+    FLUSH_INTERVAL: float = Field(
+        1.0, description='Максимальное время накопления пачки документов перед записью в секундах'
+    )
+    QUEUE_SIZE: int = Field(
+        10000, description='Максимальное количество документов в очереди записи, остальные отбрасываются'
+    )
+    WRITE_TIMEOUT: float = Field(5.0, description='Максимальное время записи пачки документов в секундах')
+    LATENCY_THRESHOLD: float = Field(
+        2.0, description='Время записи пачки в секундах, после которого запись считается неуспешной'
+    )
+    ERROR_THRESHOLD: int = Field(
+        3, description='Количество неуспешных записей подряд для перехода на запись в локальный спул'
+    )
+    RETRY_INTERVAL: float = Field(
+        10, description='Интервал проверки доступности MongoDB для воспроизведения спула в секундах'
+    )
+    SPOOL_PATH: str = Field('spool/mongodb.spool', description='Путь к файлу локального спула')
+    SPOOL_MAX_SIZE: int = Field(
+        512 * 1024 * 1024, description='Максимальный размер локального спула в байтах'
+    )
 
     class Config:
         env_prefix = 'MONGO_'
@@ -96,4 +339,12 @@ class CommonSettings(BaseSettings):
     JAEGER: TracingSettings = TracingSettings()
     AUTH: AuthSettings = AuthSettings()
     REQUEST: RequestSettings = RequestSettings()
+    BREAKER: BreakerSettings = BreakerSettings()
+    SESSION: SessionSettings = SessionSettings()
+    SNAPSHOT: SnapshotSettings = SnapshotSettings()
+    TITLE_INDEX: TitleIndexSettings = TitleIndexSettings()
+    STATE: StateSettings = StateSettings()
+    CARD: CardSettings = CardSettings()
+    PREWARM: PrewarmSettings = PrewarmSettings()
+    DISK_SNAPSHOT: DiskSnapshotSettings = DiskSnapshotSettings()
     MONGO: MongoDBSettings = MongoDBSettings()
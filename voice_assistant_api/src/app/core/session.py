@@ -1,5 +1,50 @@
-from aiohttp import ClientSession
+from typing import Any, Optional
 
+from aiohttp import ClientSession, TCPConnector
 
-async def get_session() -> ClientSession:
-    return ClientSession()
+from app.core.config import settings
+
+session: Optional[ClientSession] = None
+
+
+async def create_session() -> ClientSession:
+    """Создание долгоживущей сессии aiohttp с настроенным пулом соединений.
+    Сессия создается один раз на воркер при старте приложения и переиспользуется всеми запросами
+    к AsyncAPI, что исключает TCP-рукопожатие и DNS-запрос на каждый webhook Алисы.
+
+    :return: сессия aiohttp.
+    """
+    connector = TCPConnector(
+        limit=settings.SESSION.LIMIT,
+        limit_per_host=settings.SESSION.LIMIT_PER_HOST,
+        keepalive_timeout=settings.SESSION.KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=settings.SESSION.TTL_DNS_CACHE,
+        use_dns_cache=True,
+    )
+    return ClientSession(connector=connector)
+
+
+async def get_session() -> Optional[ClientSession]:
+    return session
+
+
+def get_pool_stats(client_session: Optional[ClientSession]) -> dict[str, Any]:
+    """Метод получения состояния пула соединений сессии.
+
+    :param client_session: сессия aiohttp.
+    :return: словарь с количеством открытых, свободных и занятых соединений и лимитами пула.
+    """
+    if client_session is None or client_session.closed:
+        return {'closed': True}
+    connector: TCPConnector = client_session.connector
+    # aiohttp не предоставляет публичного API для статистики пула, поэтому читаем внутреннее состояние
+    idle = sum(len(connections) for connections in connector._conns.values())
+    acquired = len(connector._acquired)
+    return {
+        'closed': False,
+        'open': idle + acquired,
+        'idle': idle,
+        'acquired': acquired,
+        'limit': connector.limit,
+        'limit_per_host': connector.limit_per_host,
+    }
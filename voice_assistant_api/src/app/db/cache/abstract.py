@@ -0,0 +1,65 @@
+from abc import ABC, abstractmethod
+from typing import Any, Optional, Sequence
+
+
+class Cache(ABC):
+    """Абстрактный класс кеша результатов запросов к AsyncAPI."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        """Метод получает данные из кеша.
+
+        :param key: ключ, по которому получаем данные.
+        :return: кешированные данные или None, если ключ отсутствует или срок его действия истек.
+        """
+        pass
+
+    @abstractmethod
+    async def get_entry(self, key: str) -> Optional[tuple[Any, bool]]:
+        """Метод получает данные из кеша вместе с признаком их устаревания.
+
+        :param key: ключ, по которому получаем данные.
+        :return: кортеж из кешированных данных и признака истечения мягкого TTL
+            или None, если ключ отсутствует или истек его жесткий TTL.
+        """
+        pass
+
+    @abstractmethod
+    async def get_entries(self, keys: Sequence[str]) -> list[Optional[tuple[Any, bool]]]:
+        """Метод получает из кеша несколько объектов вместе с признаками их устаревания.
+
+        :param keys: ключи, по которым получаем данные.
+        :return: список результатов get_entry в порядке ключей.
+        """
+        pass
+
+    @abstractmethod
+    async def set(
+        self, key: str, data: Any, ttl: Optional[float] = None, soft_ttl: Optional[float] = None
+    ) -> None:
+        """Метод кеширует данные.
+
+        :param key: ключ, по которому сохраняем данные.
+        :param data: данные для кеширования.
+        :param ttl: время жизни ключа в секундах (жесткий TTL). По умолчанию используется TTL кеша.
+        :param soft_ttl: время в секундах, после которого данные считаются устаревшими, но еще отдаются
+            из кеша (мягкий TTL). По умолчанию совпадает с жестким TTL.
+        """
+        pass
+
+    @abstractmethod
+    async def contains(self, key: str) -> bool:
+        """Метод проверяет наличие актуальных данных в кеше без учета в статистике попаданий.
+
+        :param key: ключ, по которому проверяем данные.
+        :return: True, если ключ присутствует и срок его действия не истек.
+        """
+        pass
+
+    @abstractmethod
+    def get_stats(self) -> dict[str, Any]:
+        """Метод получения статистики работы кеша.
+
+        :return: словарь со счетчиками попаданий, промахов и вытеснений.
+        """
+        pass
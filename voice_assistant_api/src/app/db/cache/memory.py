@@ -0,0 +1,165 @@
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.db.cache.abstract import Cache
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    stale_hits: int = 0
+
+
+class CacheEntry:
+    __slots__ = ('value', 'expires_at', 'stale_at', 'size')
+
+    def __init__(self, value: Any, expires_at: float, stale_at: float, size: int) -> None:
+        self.value = value
+        self.expires_at = expires_at
+        self.stale_at = stale_at
+        self.size = size
+
+
+def get_object_size(obj: Any) -> int:
+    """Приблизительный размер объекта в памяти с учетом вложенных объектов.
+
+    :param obj: объект (в том числе pydantic-модель) для оценки размера.
+    :return: размер в байтах.
+    """
+    seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size += sys.getsizeof(item)
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+        elif isinstance(item, BaseModel):
+            stack.append(item.__dict__)
+    return size
+
+
+class MemoryCache(Cache):
+    """Кеш в памяти процесса с вытеснением по TTL и LRU.
+    Размер кеша ограничен как количеством ключей, так и суммарным объемом занимаемой памяти.
+    """
+
+    def __init__(self, ttl: float, max_items: int, max_memory: int) -> None:
+        self.ttl = ttl
+        self.max_items = max_items
+        self.max_memory = max_memory
+        self.memory = 0
+        self.stats = CacheStats()
+        self._data: OrderedDict[str, CacheEntry] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        return entry.value
+
+    async def get_entry(self, key: str) -> Optional[tuple[Any, bool]]:
+        entry = self._get_entry(key)
+        if entry is None:
+            return None
+        stale = entry.stale_at <= time.monotonic()
+        if stale:
+            self.stats.stale_hits += 1
+        return entry.value, stale
+
+    async def get_entries(self, keys: Sequence[str]) -> list[Optional[tuple[Any, bool]]]:
+        return [await self.get_entry(key) for key in keys]
+
+    def _get_entry(self, key: str) -> Optional[CacheEntry]:
+        entry = self._data.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._data.move_to_end(key)
+        self.stats.hits += 1
+        return entry
+
+    async def set(
+        self, key: str, data: Any, ttl: Optional[float] = None, soft_ttl: Optional[float] = None
+    ) -> None:
+        size = get_object_size(data)
+        if size > self.max_memory:
+            return
+        if key in self._data:
+            self._remove(key)
+        now = time.monotonic()
+        ttl = self.ttl if ttl is None else ttl
+        soft_ttl = ttl if soft_ttl is None else min(soft_ttl, ttl)
+        self._data[key] = CacheEntry(data, now + ttl, now + soft_ttl, size)
+        self.memory += size
+        while len(self._data) > self.max_items or self.memory > self.max_memory:
+            oldest_key = next(iter(self._data))
+            self._remove(oldest_key)
+            self.stats.evictions += 1
+
+    async def contains(self, key: str) -> bool:
+        entry = self._data.get(key)
+        return entry is not None and entry.expires_at > time.monotonic()
+
+    def get_stats(self) -> dict[str, Any]:
+        requests = self.stats.hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            'hit_rate': self.stats.hits / requests if requests else 0.0,
+            'items': len(self._data),
+            'memory': self.memory,
+            'max_items': self.max_items,
+            'max_memory': self.max_memory,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._data.pop(key)
+        self.memory -= entry.size
+
+
+@lru_cache()
+def get_memory_cache() -> MemoryCache:
+    return MemoryCache(
+        ttl=settings.CACHE.TTL,
+        max_items=settings.CACHE.MAX_ITEMS,
+        max_memory=settings.CACHE.MAX_MEMORY,
+    )
+
+
+@lru_cache()
+def get_slot_cache() -> MemoryCache:
+    return MemoryCache(
+        ttl=settings.CACHE.SLOT_TTL,
+        max_items=settings.CACHE.SLOT_MAX_ITEMS,
+        max_memory=settings.CACHE.MAX_MEMORY,
+    )
+
+
+@lru_cache()
+def get_response_cache() -> MemoryCache:
+    return MemoryCache(
+        ttl=settings.CACHE.RESPONSE_TTL,
+        max_items=settings.CACHE.RESPONSE_MAX_ITEMS,
+        max_memory=settings.CACHE.MAX_MEMORY,
+    )
@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+import aioredis
+import orjson
+from aioredis import Redis
+
+from app.core.config import settings
+from app.db.cache.abstract import Cache
+from app.models.base import BaseFilmModel, ORJSONModel
+from app.models.models import (
+    APIFilmDetail,
+    APIFilmsList,
+    APIPersonDetail,
+    APIPersonsList,
+    SessionPhrase,
+    SkillImage,
+)
+
+logger = logging.getLogger(__name__)
+
+# Модели, объекты которых хранятся в Redis. Значение содержит имя модели для восстановления объекта
+MODELS: dict[str, type[ORJSONModel]] = {
+    model.__name__: model
+    for model in (
+        BaseFilmModel, APIFilmDetail, APIFilmsList, APIPersonDetail, APIPersonsList, SessionPhrase, SkillImage
+    )
+}
+
+
+@dataclass
+class RedisCacheStats:
+    hits: int = 0
+    misses: int = 0
+    errors: int = 0
+
+
+def encode_value(data: ORJSONModel, stale_at: float, expires_at: float) -> bytes:
+    # Поля со значениями по умолчанию не хранятся и восстанавливаются моделью при чтении
+    return orjson.dumps([type(data).__name__, stale_at, expires_at, data.dict(exclude_defaults=True)])
+
+
+def decode_value(value: bytes) -> tuple[ORJSONModel, float, float]:
+    model_name, stale_at, expires_at, data = orjson.loads(value)
+    return MODELS[model_name].parse_obj(data), stale_at, expires_at
+
+
+class RedisCache(Cache):
+    """Общий для всех воркеров и реплик кеш результатов запросов к AsyncAPI в Redis.
+    Объекты хранятся в компактном виде orjson вместе со временем устаревания и истечения, поэтому после
+    чтения из Redis они попадают в кеш процесса с оставшимся временем жизни. К жесткому TTL добавляется
+    случайная доля jitter, чтобы ключи, записанные одновременно, не истекали одновременно.
+    Ошибки и превышение времени ожидания Redis считаются промахом и не влияют на ответ навыка.
+    """
+
+    def __init__(self, ttl: float, jitter: float, timeout: float, prefix: str) -> None:
+        self.ttl = ttl
+        self.jitter = jitter
+        self.timeout = timeout
+        self.prefix = prefix
+        self.redis: Optional[Redis] = None
+        self.stats = RedisCacheStats()
+
+    async def connect(self, address: tuple[str, int], minsize: int, maxsize: int) -> None:
+        self.redis = await aioredis.create_redis_pool(address, minsize=minsize, maxsize=maxsize)
+
+    async def close(self) -> None:
+        if self.redis is not None:
+            self.redis.close()
+            await self.redis.wait_closed()
+            self.redis = None
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = await self.get_entry(key)
+        if entry is None:
+            return None
+        return entry[0]
+
+    async def get_entry(self, key: str) -> Optional[tuple[Any, bool]]:
+        return (await self.get_entries([key]))[0]
+
+    async def get_entries(self, keys: Sequence[str]) -> list[Optional[tuple[Any, bool]]]:
+        now = time.time()
+        return [
+            None if value is None else (value[0], value[1] <= now) for value in await self.get_many(keys)
+        ]
+
+    async def get_many(self, keys: Sequence[str]) -> list[Optional[tuple[ORJSONModel, float, float]]]:
+        """Получение нескольких объектов одним запросом MGET.
+
+        :param keys: ключи кеша.
+        :return: список из объекта, времени устаревания и времени истечения в секундах Unix
+            или None для отсутствующих ключей в порядке ключей.
+        """
+        if self.redis is None or not keys:
+            return [None] * len(keys)
+        try:
+            values = await asyncio.wait_for(
+                self.redis.mget(*(self.prefix + key for key in keys)), timeout=self.timeout
+            )
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as err:
+            self.stats.errors += 1
+            logger.warning('Redis MGET failed: %r', err)
+            return [None] * len(keys)
+        result = []
+        for value in values:
+            if value is None:
+                self.stats.misses += 1
+                result.append(None)
+                continue
+            try:
+                result.append(decode_value(value))
+                self.stats.hits += 1
+            except (ValueError, KeyError, TypeError):
+                # Значение записано несовместимой версией модели
+                self.stats.misses += 1
+                result.append(None)
+        return result
+
+    async def set(
+        self, key: str, data: Any, ttl: Optional[float] = None, soft_ttl: Optional[float] = None
+    ) -> None:
+        if self.redis is None or not isinstance(data, ORJSONModel):
+            return
+        ttl = self.ttl if ttl is None else ttl
+        soft_ttl = ttl if soft_ttl is None else min(soft_ttl, ttl)
+        ttl *= 1 + random.uniform(0, self.jitter)
+        now = time.time()
+        value = encode_value(data, stale_at=now + soft_ttl, expires_at=now + ttl)
+        try:
+            await asyncio.wait_for(
+                self.redis.set(self.prefix + key, value, pexpire=int(ttl * 1000)), timeout=self.timeout
+            )
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as err:
+            self.stats.errors += 1
+            logger.warning('Redis SET failed: %r', err)
+
+    async def contains(self, key: str) -> bool:
+        if self.redis is None:
+            return False
+        try:
+            return bool(await asyncio.wait_for(self.redis.exists(self.prefix + key), timeout=self.timeout))
+        except (aioredis.RedisError, OSError, asyncio.TimeoutError) as err:
+            self.stats.errors += 1
+            logger.warning('Redis EXISTS failed: %r', err)
+            return False
+
+    def get_stats(self) -> dict[str, Any]:
+        requests = self.stats.hits + self.stats.misses
+        return {
+            **asdict(self.stats),
+            'hit_rate': self.stats.hits / requests if requests else 0.0,
+            'connected': self.redis is not None,
+        }
+
+
+@lru_cache()
+def get_redis_cache() -> RedisCache:
+    return RedisCache(
+        ttl=settings.CACHE.TTL,
+        jitter=settings.REDIS.TTL_JITTER,
+        timeout=settings.REDIS.TIMEOUT,
+        prefix=settings.REDIS.KEY_PREFIX,
+    )
@@ -0,0 +1,70 @@
+import time
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from app.core.config import settings
+from app.db.cache.abstract import Cache
+from app.db.cache.memory import get_memory_cache
+from app.db.cache.redis import RedisCache, get_redis_cache
+
+
+class TieredCache(Cache):
+    """Двухуровневый кеш: кеш процесса и, если он подключен, общий кеш в Redis.
+    Промахи кеша процесса запрашиваются из Redis, найденные там объекты сохраняются в кеш процесса
+    с оставшимся временем жизни. Запись выполняется в оба уровня.
+    """
+
+    def __init__(self, local: Cache, remote: Optional[RedisCache]) -> None:
+        self.local = local
+        self.remote = remote
+
+    async def get(self, key: str) -> Optional[Any]:
+        entry = await self.get_entry(key)
+        if entry is None:
+            return None
+        return entry[0]
+
+    async def get_entry(self, key: str) -> Optional[tuple[Any, bool]]:
+        return (await self.get_entries([key]))[0]
+
+    async def get_entries(self, keys: Sequence[str]) -> list[Optional[tuple[Any, bool]]]:
+        # Отсутствующие в кеше процесса ключи запрашиваются из Redis одним запросом
+        entries = await self.local.get_entries(keys)
+        missing = [index for index, entry in enumerate(entries) if entry is None]
+        if self.remote is None or not missing:
+            return entries
+        values = await self.remote.get_many([keys[index] for index in missing])
+        now = time.time()
+        for index, value in zip(missing, values):
+            if value is None:
+                continue
+            obj, stale_at, expires_at = value
+            if expires_at <= now:
+                continue
+            await self.local.set(keys[index], obj, ttl=expires_at - now, soft_ttl=max(stale_at - now, 0))
+            entries[index] = obj, stale_at <= now
+        return entries
+
+    async def set(
+        self, key: str, data: Any, ttl: Optional[float] = None, soft_ttl: Optional[float] = None
+    ) -> None:
+        await self.local.set(key, data, ttl=ttl, soft_ttl=soft_ttl)
+        if self.remote is not None:
+            await self.remote.set(key, data, ttl=ttl, soft_ttl=soft_ttl)
+
+    async def contains(self, key: str) -> bool:
+        if await self.local.contains(key):
+            return True
+        return self.remote is not None and await self.remote.contains(key)
+
+    def get_stats(self) -> dict[str, Any]:
+        stats = self.local.get_stats()
+        if self.remote is not None:
+            stats['redis'] = self.remote.get_stats()
+        return stats
+
+
+@lru_cache()
+def get_data_cache() -> TieredCache:
+    remote = get_redis_cache() if settings.REDIS.ENABLED else None
+    return TieredCache(local=get_memory_cache(), remote=remote)
@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import time
+from typing import Any, Mapping, Optional
+
+import orjson
+
+from app.db.cache.redis import MODELS
+from app.models.base import ORJSONModel
+
+logger = logging.getLogger(__name__)
+
+# Заголовок файла: сигнатура формата, время создания, смещение и длина индекса
+HEADER = struct.Struct('>8sdQQ')
+MAGIC = b'VASNAP01'
+
+# Положение объекта в файле: имя модели, смещение и длина тела
+Location = tuple[str, int, int]
+
+
+def encode_snapshot(entries: Mapping[str, ORJSONModel], created_at: float) -> bytes:
+    """Файл снимка вида <заголовок><тела объектов orjson><индекс orjson>.
+
+    :param entries: объекты по ключу кеша.
+    :param created_at: время создания снимка по time.time.
+    :return: содержимое файла.
+    """
+    bodies = []
+    index: dict[str, Location] = {}
+    offset = HEADER.size
+    for key, obj in entries.items():
+        # Поля со значениями по умолчанию не хранятся и восстанавливаются моделью при чтении
+        body = orjson.dumps(obj.dict(exclude_defaults=True))
+        index[key] = (type(obj).__name__, offset, len(body))
+        bodies.append(body)
+        offset += len(body)
+    index_body = orjson.dumps(index)
+    header = HEADER.pack(MAGIC, created_at, offset, len(index_body))
+    return b''.join((header, *bodies, index_body))
+
+
+class MappedSnapshot:
+    """Открытый через mmap файл снимка. В памяти процесса находится только индекс,
+    тела объектов читаются из отображенного файла и разбираются моделью при обращении.
+    """
+
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self.mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, self.created_at, index_offset, index_length = HEADER.unpack_from(self.mmap)
+            if magic != MAGIC:
+                raise ValueError(f'Unknown snapshot format: {magic!r}')
+            self.index: dict[str, Location] = {
+                key: tuple(location)
+                for key, location in orjson.loads(self.mmap[index_offset:index_offset + index_length]).items()
+            }
+        except Exception:
+            self.mmap.close()
+            raise
+        self.size = len(self.mmap)
+
+    def get(self, key: str) -> Optional[ORJSONModel]:
+        location = self.index.get(key)
+        if location is None:
+            return None
+        model_name, offset, length = location
+        return MODELS[model_name].parse_obj(orjson.loads(self.mmap[offset:offset + length]))
+
+    def close(self) -> None:
+        self.mmap.close()
+
+
+class DiskSnapshot:
+    """Снимок объектов, полученных от AsyncAPI, в локальном файле.
+    Файл перезаписывается атомарно: новый снимок пишется во временный файл и подменяет прежний,
+    поэтому при аварийной остановке на диске остается последний целый снимок. Снимок читается через mmap
+    и доступен сразу после старта приложения, даже если AsyncAPI недоступен.
+    Операции с файлами выполняются в пуле потоков, чтобы не блокировать цикл событий.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.tmp_path = f'{path}.tmp'
+        self._mapped: Optional[MappedSnapshot] = None
+
+    @property
+    def created_at(self) -> Optional[float]:
+        return self._mapped.created_at if self._mapped is not None else None
+
+    def keys(self) -> list[str]:
+        return list(self._mapped.index) if self._mapped is not None else []
+
+    def get(self, key: str) -> Optional[ORJSONModel]:
+        if self._mapped is None:
+            return None
+        return self._mapped.get(key)
+
+    async def load(self) -> bool:
+        """Открытие снимка, сохраненного на диске.
+
+        :return: True, если снимок найден и открыт.
+        """
+        try:
+            mapped = await asyncio.to_thread(self._open)
+        except (OSError, ValueError, struct.error):
+            logger.exception('Failed to open disk snapshot %s', self.path)
+            return False
+        if mapped is None:
+            return False
+        # Прежнее отображение закрывается в цикле событий, где из него читают обработчики запросов
+        previous, self._mapped = self._mapped, mapped
+        if previous is not None:
+            previous.close()
+        return True
+
+    def _open(self) -> Optional[MappedSnapshot]:
+        if not os.path.exists(self.path):
+            return None
+        return MappedSnapshot(self.path)
+
+    async def save(self, entries: Mapping[str, ORJSONModel]) -> None:
+        """Запись нового снимка на диск и его открытие.
+
+        :param entries: объекты по ключу кеша.
+        """
+        data = encode_snapshot(entries, time.time())
+        await asyncio.to_thread(self._write, data)
+        await self.load()
+
+    def _write(self, data: bytes) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.tmp_path, 'wb') as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.tmp_path, self.path)
+
+    def close(self) -> None:
+        if self._mapped is not None:
+            self._mapped.close()
+            self._mapped = None
+
+    def get_stats(self) -> dict[str, Any]:
+        if self._mapped is None:
+            return {'loaded': False, 'items': 0, 'size': 0, 'age': None}
+        return {
+            'loaded': True,
+            'items': len(self._mapped.index),
+            'size': self._mapped.size,
+            'age': time.time() - self._mapped.created_at,
+        }
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+import struct
+import threading
+from typing import Any, BinaryIO, Optional
+
+import orjson
+from bson import ObjectId
+from bson.errors import BSONError
+
+logger = logging.getLogger(__name__)
+
+# Заголовок записи: длина тела записи в байтах
+HEADER = struct.Struct('>I')
+
+Record = tuple[str, dict[str, Any]]
+
+
+def encode_record(collection: str, document: dict[str, Any]) -> bytes:
+    body = orjson.dumps({'collection': collection, 'document': document}, default=str)
+    return HEADER.pack(len(body)) + body
+
+
+def decode_record(body: bytes) -> Record:
+    record = orjson.loads(body)
+    document = record['document']
+    if '_id' in document:
+        document['_id'] = ObjectId(document['_id'])
+    return record['collection'], document
+
+
+class SpoolReader:
+    """Последовательное чтение записей файла спула, переданного на воспроизведение."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.file: BinaryIO = open(path, 'rb')
+        # Позиция после последней записи, сохраненной в MongoDB
+        self.offset = 0
+        # Позиция после последней прочитанной записи
+        self.position = 0
+        # Позиция первой поврежденной записи. Записи начиная с нее не читаются
+        self.corrupted_offset: Optional[int] = None
+
+    def read(self, limit: int) -> list[Record]:
+        """Чтение очередной пачки записей. Чтение останавливается на записи, оборванной при аварийной
+        остановке или нарушающей разметку файла: после такой записи границы следующих неизвестны.
+
+        :param limit: максимальное количество записей.
+        :return: список пар из имени коллекции и документа.
+        """
+        records = []
+        while len(records) < limit and self.corrupted_offset is None:
+            header = self.file.read(HEADER.size)
+            if not header:
+                break
+            try:
+                if len(header) < HEADER.size:
+                    raise ValueError('truncated header')
+                (length,) = HEADER.unpack(header)
+                body = self.file.read(length)
+                if len(body) < length:
+                    raise ValueError('truncated body')
+                records.append(decode_record(body))
+            except (ValueError, KeyError, TypeError, BSONError) as err:
+                self.corrupted_offset = self.position
+                logger.error(
+                    'Corrupted record in spool file %s at offset %s: %r', self.path, self.position, err
+                )
+            else:
+                self.position = self.file.tell()
+        return records
+
+    def commit(self) -> None:
+        """Отметка прочитанных записей как сохраненных в MongoDB."""
+        self.offset = self.position
+
+    def close(self) -> None:
+        self.file.close()
+
+
+class DiskSpool:
+    """Локальный файл для записей, которые не удалось сохранить в MongoDB.
+    Файл только дополняется записями вида <длина><тело orjson>. Для воспроизведения файл атомарно
+    переименовывается, поэтому новые записи продолжают попадать в новый файл спула.
+    Операции с файлами выполняются в пуле потоков, чтобы не блокировать цикл событий.
+    """
+
+    def __init__(self, path: str, max_size: int) -> None:
+        self.path = path
+        self.replay_path = f'{path}.replay'
+        self.corrupted_path = f'{path}.corrupted'
+        self.max_size = max_size
+        self.spooled = 0
+        self.dropped = 0
+        self.corrupted = 0
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        paths = (self.path, self.replay_path)
+        return sum(os.path.getsize(path) for path in paths if os.path.exists(path))
+
+    async def append(self, records: list[Record]) -> None:
+        data = b''.join(encode_record(collection, document) for collection, document in records)
+        await asyncio.to_thread(self._append, data, len(records))
+
+    def _append(self, data: bytes, count: int) -> None:
+        with self._lock:
+            if self.size + len(data) > self.max_size:
+                self.dropped += count
+                logger.error('Spool file %s is full, %s documents dropped', self.path, count)
+                return
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.path, 'ab') as file:
+                file.write(data)
+            self.spooled += count
+
+    async def open_replay(self) -> Optional[SpoolReader]:
+        """Передача накопленных записей на воспроизведение.
+        Незавершенное ранее воспроизведение продолжается с начала файла: повторная вставка документов
+        с теми же _id отклоняется MongoDB как дубликат.
+
+        :return: объект чтения записей или None, если спул пуст.
+        """
+        return await asyncio.to_thread(self._open_replay)
+
+    def _open_replay(self) -> Optional[SpoolReader]:
+        with self._lock:
+            if not os.path.exists(self.replay_path):
+                if not os.path.exists(self.path):
+                    return
+                os.replace(self.path, self.replay_path)
+            return SpoolReader(self.replay_path)
+
+    async def close_replay(self, reader: SpoolReader, completed: bool) -> None:
+        await asyncio.to_thread(self._close_replay, reader, completed)
+
+    def _close_replay(self, reader: SpoolReader, completed: bool) -> None:
+        reader.close()
+        if completed:
+            os.remove(reader.path)
+            return
+        with self._lock:
+            # Невоспроизведенный остаток возвращается в файл спула, уже записанные документы отбрасываются
+            with open(reader.path, 'rb') as replay_file, open(self.path, 'ab') as file:
+                replay_file.seek(reader.offset)
+                if reader.corrupted_offset is None:
+                    file.write(replay_file.read())
+                else:
+                    file.write(replay_file.read(reader.corrupted_offset - reader.offset))
+                    # Остаток с поврежденной записью откладывается в отдельный файл, чтобы не блокировать спул
+                    with open(self.corrupted_path, 'ab') as corrupted_file:
+                        corrupted_file.write(replay_file.read())
+                    self.corrupted += 1
+                    logger.error('Unreadable rest of spool moved to %s', self.corrupted_path)
+            os.remove(reader.path)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'size': self.size,
+            'spooled': self.spooled,
+            'dropped': self.dropped,
+            'corrupted': self.corrupted,
+        }
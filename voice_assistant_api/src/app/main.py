@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from logging import config as logging_config
 from urllib.parse import quote_plus as quote
@@ -10,14 +11,28 @@ from fastapi.responses import ORJSONResponse
 from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo.errors import PyMongoError
 
-from app.api.v1 import voice_assistant
+from app.api.v1 import debug, metrics, voice_assistant
+from app.core import session
 from app.core.backoff_handler import backoff_hdlr, backoff_hdlr_success
 from app.core.config import settings
 from app.core.logger import LOGGING
-from app.core.session import get_session
+from app.db.cache.redis import get_redis_cache
+from app.db.cache.tiered import get_data_cache
+from app.db.spool import DiskSpool
 from app.jaeger_service import init_tracer
+from app.services.alice_voice_assistant import AliceVoiceAssistantService
+from app.services.image_storage import get_image_storage
+from app.services.last_known_good import get_last_known_good
+from app.services.movies_data_search import create_movies_data_search, MoviesDataSearch
+from app.services.query_log_miner import get_query_log_miner
+from app.services.save_to_mongodb import MongoBatchWriter
+from app.services.stats_collector import StatsCollector
+from app.services.title_index import get_title_index
+from app.services.top_films_snapshot import get_top_films_snapshot
+from app.utils.metrics import REGISTRY
 
 logging_config.dictConfig(LOGGING)
+logger = logging.getLogger(__name__)
 
 app = FastAPI(
     title=settings.APP.PROJECT_NAME,
@@ -38,6 +53,16 @@ url = 'mongodb://{user}:{pw}@{hosts}/?replicaSet={rs}&authSource={auth_src}'.for
 )
 
 
+def init_services(client_session: ClientSession) -> None:
+    """Создание сервисов навыка один раз на воркер. Зависимости FastAPI берут готовые экземпляры
+    из состояния приложения и не создают их на каждый запрос.
+
+    :param client_session: сессия aiohttp для запросов к AsyncAPI.
+    """
+    app.state.search_service = create_movies_data_search(client_session)
+    app.state.alice_service = AliceVoiceAssistantService(search_service=app.state.search_service)
+
+
 @app.on_event('startup')
 async def startup():
     app.mongodb_client = backoff.on_exception(
@@ -50,20 +75,95 @@ async def startup():
     )(AsyncIOMotorClient)(url, tlsCAFile=settings.MONGO.CACERT)
 
     app.mongodb = app.mongodb_client[settings.MONGO.DB_NAME]
-
-    app.state.session = await get_session()
+    # Запросы и ответы навыка записываются пачками в фоне, а не отдельной вставкой на каждый webhook
+    # При недоступности MongoDB записи сохраняются в локальный спул и воспроизводятся после восстановления
+    app.mongodb_writer = MongoBatchWriter(
+        app.mongodb,
+        spool=DiskSpool(settings.MONGO.SPOOL_PATH, max_size=settings.MONGO.SPOOL_MAX_SIZE),
+        batch_size=settings.MONGO.BATCH_SIZE,
+        flush_interval=settings.MONGO.FLUSH_INTERVAL,
+        queue_size=settings.MONGO.QUEUE_SIZE,
+        write_timeout=settings.MONGO.WRITE_TIMEOUT,
+        latency_threshold=settings.MONGO.LATENCY_THRESHOLD,
+        error_threshold=settings.MONGO.ERROR_THRESHOLD,
+        retry_interval=settings.MONGO.RETRY_INTERVAL,
+    )
+    app.mongodb_writer.start()
+
+    if settings.REDIS.ENABLED:
+        # Общий кеш в Redis сохраняет прогретые данные между перезапусками и разделяется воркерами
+        try:
+            await backoff.on_exception(
+                wait_gen=backoff.expo,
+                max_tries=settings.BACKOFF.RETRIES,
+                max_time=settings.BACKOFF.MAX_TIME,
+                exception=Exception,
+                on_backoff=backoff_hdlr,
+                on_success=backoff_hdlr_success,
+            )(get_redis_cache().connect)(
+                (settings.REDIS.HOST, int(settings.REDIS.PORT)),
+                minsize=settings.REDIS.POOL_MINSIZE,
+                maxsize=settings.REDIS.POOL_MAXSIZE,
+            )
+        except Exception:
+            # Redis - необязательный уровень кеша, без него навык работает с кешем процесса
+            logger.exception('Redis is unavailable, shared cache is disabled')
+
+    # Снимок последних успешных ответов AsyncAPI на диске позволяет отвечать, даже если AsyncAPI недоступен
+    # с момента старта. Снимок обновляется в фоне из кеша, пока цепь запросов к AsyncAPI замкнута
+    app.last_known_good_task = None
+    if settings.DISK_SNAPSHOT.ENABLED:
+        if await get_last_known_good().snapshot.load():
+            get_last_known_good().index_titles(get_title_index())
+        app.last_known_good_task = asyncio.create_task(
+            get_last_known_good().run(
+                get_data_cache(), get_top_films_snapshot(), lambda: get_query_log_miner().last_keys
+            )
+        )
+
+    # Одна сессия с пулом соединений на воркер для всех запросов к AsyncAPI
+    session.session = await session.create_session()
+    init_services(session.session)
+    search_service: MoviesDataSearch = app.state.search_service
+
+    # Топы фильмов по жанрам отдаются из снимка в памяти, который обновляется в фоне
+    app.snapshot_task = asyncio.create_task(get_top_films_snapshot().run(search_service))
+    # Локальный индекс названий фильмов и имен персон заполняется постранично в фоне
+    app.title_index_task = asyncio.create_task(get_title_index().run(search_service))
+    # Кеш прогревается тем, о чем пользователи спрашивали в последнее время, по журналу запросов в MongoDB
+    app.prewarm_task = None
+    if settings.PREWARM.ENABLED:
+        app.prewarm_task = asyncio.create_task(
+            get_query_log_miner().run(app.mongodb, search_service)
+        )
+    # Счетчики сервисов читаются при запросе метрик Prometheus
+    app.stats_collector = StatsCollector(search_service, writer=app.mongodb_writer)
+    REGISTRY.register(app.stats_collector)
 
 
 @app.on_event('shutdown')
 async def shutdown():
+    await app.mongodb_writer.close()
     app.mongodb_client.close()
-    session: ClientSession = app.state.session
-    await session.close()
+    app.snapshot_task.cancel()
+    app.title_index_task.cancel()
+    if app.prewarm_task is not None:
+        app.prewarm_task.cancel()
+    if app.last_known_good_task is not None:
+        app.last_known_good_task.cancel()
+    get_last_known_good().snapshot.close()
+    REGISTRY.unregister(app.stats_collector)
+    app.state.search_service.cancel_prefetch()
+    get_image_storage().cancel()
+    await session.session.close()
+    await get_redis_cache().close()
 
 
 app.include_router(
     voice_assistant.router, prefix='/api/v1', tags=['Голосовой помощник'],
 )
+app.include_router(debug.router, prefix='/api/v1/debug', tags=['Отладка'])
+app.include_router(metrics.router, prefix='/api/v1', tags=['Метрики'])
 
 
 if __name__ == '__main__':
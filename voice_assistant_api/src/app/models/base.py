@@ -2,7 +2,7 @@ from typing import Optional
 from uuid import UUID
 
 import orjson
-from pydantic import BaseModel, Field
+from pydantic import AnyUrl, BaseModel, Field
 
 
 def orjson_dumps(v, *, default):
@@ -31,3 +31,4 @@ class BaseFilmModel(ORJSONModel):
     imdb_rating: Optional[float] = Field(
         None, description='Рейтинг фильма по версии IMDb', ge=0, le=10
     )
+    imdb_image: Optional[AnyUrl] = Field(None, description='URL изображения постера фильма')
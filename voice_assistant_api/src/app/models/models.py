@@ -2,7 +2,7 @@ from datetime import date
 from typing import Optional
 from uuid import UUID
 
-from pydantic import Field, AnyUrl
+from pydantic import Field
 
 from app.models.base import BaseFilmModel, BaseItemModel, ORJSONModel
 
@@ -52,7 +52,6 @@ class APIFilmDetail(BaseFilmModel):
     directors_names_ru: list[str] = Field(
         default_factory=list, description='Список имён режиссёров на русском языке'
     )
-    imdb_image: Optional[AnyUrl] = Field(None, description='URL изображения постера фильма')
     runtime_mins: Optional[int] = Field(None, description='Продолжительность фильма в минутах')
     release_date: Optional[date] = Field(None, description='Дата релиза фильма')
     imdb_titleid: Optional[str] = Field(
@@ -70,7 +69,9 @@ class APIPersonDetail(ORJSONModel):
     )
     roles: list[str] = Field(..., description='Роль в фильме: актёр, сценарист или режиссёр')
     film_ids: list[UUID] = Field(
-        ..., title='Фильмы', description='Перечень фильмов, в которых принимал участие'
+        default_factory=list,
+        title='Фильмы',
+        description='Перечень фильмов, в которых принимал участие. Не запрашивается для ответов навыка',
     )
 
 
@@ -78,3 +79,15 @@ class APIPersonsList(APIBaseItemsList):
     """Модель списка персон"""
 
     items: list[APIPersonDetail]
+
+
+class SessionPhrase(ORJSONModel):
+    """Модель последней фразы навыка, хранимой в кеше вместо состояния сессии"""
+
+    text: str = Field(..., description='Текст последнего ответа навыка')
+
+
+class SkillImage(ORJSONModel):
+    """Модель изображения, загруженного в хранилище навыка Яндекс Диалогов"""
+
+    id: str = Field(..., description='Идентификатор изображения или пустая строка, если загрузка не удалась')
@@ -4,10 +4,18 @@ from typing import Optional, Any
 
 from app.services.alice.request import AliceRequest
 from app.services.alice.response_helpers import make_button
-from app.services.alice.state import STATE_RESPONSE_KEY
+from app.services.alice.state import STATE_RESPONSE_KEY, get_state_codec
 
 logger = logging.getLogger(__name__)
 
+TIMEOUT_TEXT = (
+    'Извините, я не успела найти ответ. Пожалуйста, повторите вопрос, '
+    'со второго раза я отвечу быстрее.'
+)
+UNAVAILABLE_TEXT = (
+    'Извините, каталог фильмов сейчас недоступен. Пожалуйста, спросите меня ещё раз чуть позже.'
+)
+
 
 class Scene(ABC):
     @classmethod
@@ -43,6 +51,21 @@ class Scene(ABC):
             text, buttons=[make_button('Что ты умеешь?', hide=True)]
         )
 
+    async def empty_response(
+        self, request: AliceRequest, state: Optional[dict[str, Any]] = None
+    ) -> dict[str, Any]:
+        """Метод создания ответа при отсутствии данных для ответа.
+        Если данные не получены из-за истечения времени на обработку запроса, пользователю предлагается
+        повторить вопрос: загрузка продолжается в фоне и повторный ответ будет получен из кеша.
+        Если запросы к AsyncAPI отклонены размыкателем цепи, сразу сообщается о недоступности каталога.
+        """
+        text = ''
+        if request.deadline is not None and request.deadline.expired:
+            text = TIMEOUT_TEXT
+        elif request.search_service is not None and not request.search_service.breaker.closed:
+            text = UNAVAILABLE_TEXT
+        return await self.make_response(text=text, state=state)
+
     async def make_response(
         self,
         text: str,
@@ -52,7 +75,45 @@ class Scene(ABC):
         buttons: Optional[list[dict[str, Any]]] = None,
         directives: Optional[dict[str, Any]] = None,
     ) -> dict[str, Any]:
-        """Метод создания ответа webhook
+        """Метод создания ответа webhook. Параметры совпадают с render_response.
+
+        :param state: Объект, содержащий состояние навыка для хранения в контексте сессии.
+        :return: Возвращает словарь параметров для ответа Алисе.
+        """
+        response = self.render_response(
+            text=text, tts=tts, card=card, buttons=buttons, directives=directives
+        )
+        return await self.wrap_response(response, state=state)
+
+    async def wrap_response(
+        self, response: dict[str, Any], state: Optional[dict[str, Any]] = None
+    ) -> dict[str, Any]:
+        """Метод создания ответа webhook из готового содержимого ответа и состояния сессии.
+        Содержимое ответа не изменяется, поэтому может быть взято из кеша отрисованных ответов.
+        Состояние сессии кодируется в компактный вид, последняя фраза сохраняется в кеше.
+
+        :param response: содержимое ответа, созданное render_response.
+        :param state: Объект, содержащий состояние навыка для хранения в контексте сессии.
+        :return: Возвращает словарь параметров для ответа Алисе.
+        """
+        session_state = {'scene': self.id(), 'last_phrase': response['text']}
+        if state is not None:
+            session_state.update(state)
+        return {
+            'response': response,
+            'version': '1.0',
+            STATE_RESPONSE_KEY: await get_state_codec().encode(session_state),
+        }
+
+    @staticmethod
+    def render_response(
+        text: str,
+        tts: Optional[str] = None,
+        card: Optional[dict[str, Any]] = None,
+        buttons: Optional[list[dict[str, Any]]] = None,
+        directives: Optional[dict[str, Any]] = None,
+    ) -> dict[str, Any]:
+        """Метод создания содержимого ответа webhook
 
         :param text: Текст, который следует показать и озвучить пользователю. Максимум 1024 символа.
             Не должен быть пустым.
@@ -63,7 +124,6 @@ class Scene(ABC):
             BigImage — одно изображение.
             ItemsList — список из нескольких изображений (от 1 до 5).
             ImageGallery — галерея из нескольких изображений (от 1 до 7).
-        :param state: Объект, содержащий состояние навыка для хранения в контексте сессии.
         :param buttons: Кнопки, которые следует показать пользователю. Все указанные кнопки выводятся после основного
             ответа Алисы, описанного в свойствах response.text и response.card. Кнопки можно использовать как релевантные
             ответу ссылки или подсказки для продолжения разговора.
@@ -72,7 +132,7 @@ class Scene(ABC):
             start_account_linking — запуск процесса авторизации в навыке;
             start_purchase — запуск сценария оплаты;
             confirm_purchase — подтверждение оплаты навыком.
-        :return: Возвращает словарь параметров для ответа Алисе.
+        :return: Возвращает словарь с содержимым поля response ответа Алисе.
         """
         if not text:
             text = (
@@ -95,13 +155,4 @@ class Scene(ABC):
             response['buttons'] = buttons
         if directives is not None:
             response['directives'] = directives
-
-        webhook_response = {
-            'response': response,
-            'version': '1.0',
-            STATE_RESPONSE_KEY: {'scene': self.id(), 'last_phrase': text},
-        }
-
-        if state is not None:
-            webhook_response[STATE_RESPONSE_KEY].update(state)
-        return webhook_response
+        return response
@@ -21,10 +21,10 @@ DETAILS_FILM = 'details_film'
 DETAILS_PERSON = 'details_person'
 REPEAT = 'YANDEX.REPEAT'
 
-HELP_INTENTS = [HELP, WHAT_CAN_YOU_DO]
+HELP_INTENTS = frozenset([HELP, WHAT_CAN_YOU_DO])
 
-TOP_FILM_INTENTS = [TOP_BY_GENRE, TOP_BY_RATING, REPEAT, NEXT, PREVIOUS]
-FILM_INFO_INTENTS = [
+TOP_FILM_INTENTS = frozenset([TOP_BY_GENRE, TOP_BY_RATING, REPEAT, NEXT, PREVIOUS])
+FILM_INFO_INTENTS = frozenset([
     FILM_RATING,
     FILM_GENRES,
     FILM_ACTORS,
@@ -35,5 +35,5 @@ FILM_INFO_INTENTS = [
     FILM_DURATION,
     DETAILS_FILM,
     REPEAT,
-]
-PERSON_INFO_INTENTS = [PERSON_ROLES, PERSON_FILMS, DETAILS_PERSON, REPEAT]
+])
+PERSON_INFO_INTENTS = frozenset([PERSON_ROLES, PERSON_FILMS, DETAILS_PERSON, REPEAT])
@@ -1,19 +1,53 @@
-from typing import Any
+from typing import Any, Optional
 
+from app.services.alice.state import STATE_REQUEST_KEY, get_state_codec
 from app.services.movies_data_search import MoviesDataSearch
+from app.utils.deadline import Deadline
+
+# Маркер еще не вычисленного значения: state запроса может отсутствовать и быть равным None
+_UNSET: Any = object()
 
 
 class AliceRequest:
-    def __init__(self, request_body: dict[str, Any], search_service: MoviesDataSearch) -> None:
+    """Запрос навыка Алисы.
+    Интенты, слоты и состояние сессии вычисляются из тела запроса при первом обращении и сохраняются,
+    поэтому повторные обращения сцен к ним не обходят вложенные словари заново.
+    Компактное состояние сессии раскодируется в прежний вид, кроме последней фразы: вместо нее
+    в состоянии находится ключ фразы в кеше.
+    """
+
+    __slots__ = ('request_body', 'search_service', 'deadline', 'partial', '_intents', '_slots', '_state')
+
+    def __init__(
+        self,
+        request_body: dict[str, Any],
+        search_service: MoviesDataSearch,
+        deadline: Optional[Deadline] = None,
+    ) -> None:
         self.request_body = request_body
         self.search_service = search_service
+        self.deadline = deadline
+        # Признак ответа, построенного по неполным данным: такой ответ не сохраняется в кеш ответов
+        self.partial = False
+        self._intents = _UNSET
+        self._slots = _UNSET
+        self._state = _UNSET
 
     def __getitem__(self, key):
         return self.request_body[key]
 
     @property
     def intents(self):
-        return self.request_body['request'].get('nlu', {}).get('intents', {})
+        if self._intents is _UNSET:
+            self._intents = self.request_body['request'].get('nlu', {}).get('intents', {})
+        return self._intents
+
+    def merge_intents(self, intents: dict[str, Any]) -> None:
+        """Добавление интентов предыдущего запроса, например при навигации по списку фильмов.
+
+        :param intents: словарь интентов из состояния сессии.
+        """
+        self.intents.update(intents)
 
     @property
     def type(self):
@@ -21,15 +55,21 @@ class AliceRequest:
 
     @property
     def slots(self):
-        request_intents = self.request_body['request']['nlu']['intents']
-        intent = list(request_intents.keys())[0]
-
-        result = {}
-        slots = self.request_body['request']['nlu']['intents'][intent]['slots']
-        for slot in slots:
-            result[slot] = slots[slot]['value']
+        if self._slots is _UNSET:
+            request_intents = self.intents
+            result = {}
+            if request_intents:
+                intent = next(iter(request_intents))
+                slots = request_intents[intent]['slots']
+                for slot in slots:
+                    result[slot] = slots[slot]['value']
+            self._slots = result
+        return self._slots
 
-        return result
+    @property
+    def has_screen(self) -> bool:
+        """Поддерживает ли устройство пользователя показ карточек с изображениями."""
+        return 'screen' in self.request_body.get('meta', {}).get('interfaces', {})
 
     @property
     def original_utterance(self):
@@ -37,4 +77,6 @@ class AliceRequest:
 
     @property
     def state(self):
-        return self.request_body.get('state', {}).get('session')
+        if self._state is _UNSET:
+            self._state = get_state_codec().decode(self.request_body.get('state', {}).get(STATE_REQUEST_KEY))
+        return self._state
@@ -30,3 +30,38 @@ def make_button(
     if url is not None:
         button['url'] = url
     return button
+
+
+def make_card_item(
+    title: str,
+    description: Optional[str] = None,
+    image_id: Optional[str] = None,
+    button: Optional[dict[str, Any]] = None,
+) -> dict[str, Any]:
+    """Метод формирования элемента карточки ItemsList.
+
+    :param title: Заголовок элемента. Максимум 128 символов.
+    :param description: Описание элемента. Максимум 256 символов.
+    :param image_id: Идентификатор изображения из хранилища изображений навыка. Если изображение
+        не загружено, элемент показывается без него.
+    :param button: Свойства кнопки, реагирующей на нажатие элемента: title, url и payload.
+    :return: словарь с параметрами элемента карточки
+    """
+    item = {'title': title[:128]}
+    if description is not None:
+        item['description'] = description[:256]
+    if image_id is not None:
+        item['image_id'] = image_id
+    if button is not None:
+        item['button'] = button
+    return item
+
+
+def make_items_list_card(header: str, items: list[dict[str, Any]]) -> dict[str, Any]:
+    """Метод формирования карточки ItemsList — списка из нескольких изображений.
+
+    :param header: Текст заголовка карточки. Максимум 64 символа.
+    :param items: Элементы карточки, созданные make_card_item. От 1 до 5 элементов.
+    :return: словарь с параметрами карточки
+    """
+    return {'type': 'ItemsList', 'header': {'text': header[:64]}, 'items': items[:5]}
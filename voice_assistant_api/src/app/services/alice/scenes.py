@@ -1,10 +1,14 @@
+import asyncio
 import inspect
 import logging
 import sys
+from operator import itemgetter
 from typing import Any, Awaitable, Callable, Optional
 
 from app.core.config import settings
-from app.models.models import APIFilmsList
+from app.db.cache.memory import get_response_cache
+from app.models.base import BaseFilmModel
+from app.models.models import APIFilmsList, APIPersonDetail
 from app.services.alice import intents
 from app.services.alice.base_scene import Scene
 from app.services.alice.fixtures import genres
@@ -15,7 +19,10 @@ from app.services.alice.intents import (
     PERSON_INFO_INTENTS,
 )
 from app.services.alice.request import AliceRequest
-from app.services.alice.response_helpers import make_button
+from app.services.alice.response_helpers import make_button, make_card_item, make_items_list_card
+from app.services.alice.state import get_state_codec
+from app.services.image_storage import get_image_storage
+from app.utils.timing import timed
 from app.utils.text import (
     get_plural_form,
     minute_plural,
@@ -27,25 +34,105 @@ from app.utils.text import (
 
 logger = logging.getLogger(__name__)
 
+# Поля фильма, которые запрашиваются у AsyncAPI для ответа на интент. Названия нужны во всех ответах
+FILM_TITLE_FIELDS = ('title', 'title_ru')
+FILM_FIELDS = {
+    intents.FILM_DIRECTOR: (*FILM_TITLE_FIELDS, 'directors_names_ru'),
+    intents.FILM_WRITERS: (*FILM_TITLE_FIELDS, 'writers_names_ru'),
+    intents.FILM_ACTORS: (*FILM_TITLE_FIELDS, 'actors_names_ru'),
+    intents.FILM_DESCRIPTION: (*FILM_TITLE_FIELDS, 'description_ru'),
+    intents.FILM_DURATION: (*FILM_TITLE_FIELDS, 'runtime_mins'),
+    intents.FILM_GENRES: (*FILM_TITLE_FIELDS, 'genre'),
+    intents.FILM_RELEASE_DATE: (*FILM_TITLE_FIELDS, 'release_date'),
+}
+# Поля персоны, используемые в ответах. Список UUID фильмов персоны может быть большим и не запрашивается
+PERSON_FIELDS = ('full_name', 'full_name_ru', 'roles')
+
 
 class CommonScene(Scene):
     async def reply(self, request):
         pass
 
     def handle_global_intents(self, request: AliceRequest):
-        intents_set = set(request.intents)
-        if intents_set & set(HELP_INTENTS):
-            return Helper()
-        if intents_set & set(TOP_FILM_INTENTS):
-            return TopFilms()
-        if intents_set & set(FILM_INFO_INTENTS):
-            return FilmInfo()
-        if intents_set & set(PERSON_INFO_INTENTS):
-            return PersonInfo()
+        routes = [GLOBAL_ROUTES[intent] for intent in request.intents if intent in GLOBAL_ROUTES]
+        if routes:
+            return min(routes, key=itemgetter(0))[1]
 
     def handle_local_intents(self, request: AliceRequest) -> Optional[str]:
         raise NotImplementedError()
 
+    async def reply_cached(
+        self,
+        request: AliceRequest,
+        intent: str,
+        handler: Callable[[AliceRequest, str], Awaitable[Optional[dict[str, Any]]]],
+        key: str,
+        object_id: str,
+    ) -> dict[str, Any]:
+        """Ответ на вопрос о фильме или персоне из кеша отрисованных ответов.
+        Содержимое ответа зависит только от интента и объекта, поэтому при повторном вопросе
+        заново создается только состояние сессии, а запросы к AsyncAPI и построение текста не выполняются.
+        Ответы, построенные по неполным данным из-за истечения времени или размыкания цепи, не кешируются.
+
+        :param request: запрос навыка.
+        :param intent: интент запроса.
+        :param handler: обработчик интента, возвращающий содержимое ответа или None при отсутствии данных.
+        :param key: имя поля состояния сессии с идентификатором объекта.
+        :param object_id: UUID фильма или персоны.
+        :return: ответ webhook.
+        """
+        if not object_id:
+            return await self.empty_response(request)
+        responses = get_response_cache()
+        cache_key = f'{intent}:{object_id}'
+        if settings.CARD.ENABLED and request.has_screen:
+            # Ответы для устройств с экраном могут содержать карточку
+            cache_key = f'{cache_key}:screen'
+        response = await responses.get(cache_key)
+        if response is None:
+            response = await handler(request, object_id)
+            if response is None:
+                return await self.empty_response(request)
+            if not request.partial and not request.search_service.is_interrupted(request.deadline):
+                await responses.set(cache_key, response)
+        return await self.wrap_response(response, state={key: object_id})
+
+    async def make_films_card(
+        self, request: AliceRequest, header: str, films: list[BaseFilmModel], start: int = 1
+    ) -> Optional[dict[str, Any]]:
+        """Карточка ItemsList со списком фильмов и их постерами.
+        URL постеров берутся из списка фильмов: если постера нет в списке, его нет и в детальной информации
+        о фильме. Фильмы без постера или с постером, еще не загруженным в хранилище навыка,
+        показываются в карточке без постера.
+        Если постеров нет ни у одного фильма, карточка не создается и ответ остается текстовым.
+
+        :param request: запрос навыка.
+        :param header: заголовок карточки.
+        :param films: фильмы текущей страницы списка.
+        :param start: номер первого фильма в списке.
+        :return: карточка или None.
+        """
+        if not settings.CARD.ENABLED or not request.has_screen or not films:
+            return None
+        films = films[:settings.APP.PER_PAGE]
+        image_urls = [film.imdb_image for film in films]
+        image_ids = await get_image_storage().get_image_ids(image_urls, deadline=request.deadline)
+        if not any(image_ids):
+            return None
+        # Карточку с еще не загруженными постерами не кешируем: при следующем вопросе они будут загружены
+        request.partial = any(
+            image_url is not None and image_id is None for image_url, image_id in zip(image_urls, image_ids)
+        )
+        items = [
+            make_card_item(
+                title=f'{idx}. {film.title_ru}',
+                description=f'Рейтинг IMDB - {film.imdb_rating}' if film.imdb_rating is not None else None,
+                image_id=image_id,
+            )
+            for idx, (film, image_id) in enumerate(zip(films, image_ids), start=start)
+        ]
+        return make_items_list_card(header, items)
+
 
 class Welcome(CommonScene):
     async def reply(self, request: AliceRequest):
@@ -110,15 +197,16 @@ class TopFilms(CommonScene):
         return self.intents_dict
 
     async def reply(self, request: AliceRequest) -> dict[str, Any]:
-        intent = list(request.intents.keys())[0]
+        intent = next(iter(request.intents))
         handler = self.intents_handler[intent]
         return await handler(request)
 
+    @timed
     async def top_by_genre(self, request: AliceRequest):
         genre, genre_id = self.get_genre(request)
         page = self.get_page(request)
         search_response = await request.search_service.get_list_films(
-            genre=genre_id, page=page
+            genre=genre_id, page=page, deadline=request.deadline
         )
         if search_response:
             films = self.get_string_film_list(response=search_response, page=page)
@@ -126,6 +214,8 @@ class TopFilms(CommonScene):
             plural_form = film_plural[get_plural_form(total_item)]
             per_page = settings.APP.PER_PAGE
             max_page = total_item // per_page + (1 - 0 ** (total_item % per_page))
+            if page < max_page:
+                await request.search_service.prefetch_list_films(genre=genre_id, page=page + 1)
             if page == 1:
                 text = (
                     f'Я нашла {total_item} {plural_form} в жанре {genre}. '
@@ -139,24 +229,33 @@ class TopFilms(CommonScene):
                 text=text, page=page, max_page=max_page
             )
             last_intents = request.state.get('last_intents') or request.intents
+            card = await self.make_films_card(
+                request, f'Фильмы в жанре {genre}', search_response.items, start=(page - 1) * per_page + 1
+            )
 
             return await self.make_response(
                 text=text,
                 state={'page': page, 'max_page': max_page, 'last_intents': last_intents,},
                 buttons=buttons,
                 tts=tts,
+                card=card,
             )
 
-        return await self.make_response(text='')
+        return await self.empty_response(request)
 
+    @timed
     async def top_by_rating(self, request: AliceRequest):
         page = self.get_page(request)
-        search_response = await request.search_service.get_list_films(page=page)
+        search_response = await request.search_service.get_list_films(
+            page=page, deadline=request.deadline
+        )
         if search_response:
             films = self.get_string_film_list(response=search_response, page=page)
             total_item = search_response.total
             per_page = settings.APP.PER_PAGE
             max_page = total_item // per_page + (1 - 0 ** (total_item % per_page))
+            if page < max_page:
+                await request.search_service.prefetch_list_films(page=page + 1)
             if page == 1:
                 text = f'Вот Топ-5 фильмов на основе IMDB рейтинга:\n {films}\n'
             elif 1 < page < max_page:
@@ -167,19 +266,26 @@ class TopFilms(CommonScene):
                 text=text, page=page, max_page=max_page
             )
             last_intents = request.state.get('last_intents') or request.intents
+            card = await self.make_films_card(
+                request,
+                'Топ фильмов по рейтингу IMDB',
+                search_response.items,
+                start=(page - 1) * per_page + 1,
+            )
 
             return await self.make_response(
                 text=text,
                 state={'page': page, 'max_page': max_page, 'last_intents': last_intents,},
                 buttons=buttons,
                 tts=tts,
+                card=card,
             )
 
-        return await self.make_response(text='')
+        return await self.empty_response(request)
 
     async def repeat(self, request: AliceRequest):
         state = request.state
-        last_phrase = state.get('last_phrase')
+        last_phrase = await get_state_codec().get_last_phrase(state)
 
         return await self.make_response(text=last_phrase, state=state)
 
@@ -187,10 +293,10 @@ class TopFilms(CommonScene):
         last_intents: dict = request.state.get('last_intents', {})
         if last_intents:
             if intents.TOP_BY_GENRE in last_intents.keys():
-                request.request_body['request']['nlu']['intents'].update(last_intents)
+                request.merge_intents(last_intents)
                 return await self.top_by_genre(request)
             elif intents.TOP_BY_RATING in last_intents.keys():
-                request.request_body['request']['nlu']['intents'].update(last_intents)
+                request.merge_intents(last_intents)
                 return await self.top_by_rating(request)
 
         return await self.make_response(
@@ -201,10 +307,10 @@ class TopFilms(CommonScene):
         last_intents: dict = request.state.get('last_intents', {})
         if last_intents:
             if intents.TOP_BY_GENRE in last_intents.keys():
-                request.request_body['request']['nlu']['intents'].update(last_intents)
+                request.merge_intents(last_intents)
                 return await self.top_by_genre(request)
             elif intents.TOP_BY_RATING in last_intents.keys():
-                request.request_body['request']['nlu']['intents'].update(last_intents)
+                request.merge_intents(last_intents)
                 return await self.top_by_rating(request)
 
         return await self.make_response(
@@ -278,7 +384,7 @@ class TopFilms(CommonScene):
         return tts, buttons
 
     def handle_local_intents(self, request: AliceRequest):
-        if set(request.intents) & set(TOP_FILM_INTENTS):
+        if not TOP_FILM_INTENTS.isdisjoint(request.intents):
             return self
 
 
@@ -298,289 +404,297 @@ class FilmInfo(CommonScene):
         }
 
     @property
-    def intents_handler(self) -> dict[str, Callable[[AliceRequest], Awaitable]]:
+    def intents_handler(self) -> dict[str, Callable[..., Awaitable]]:
         return self.intents_dict
 
     async def reply(self, request: AliceRequest) -> dict[str, Any]:
-        intent = list(request.intents.keys())[0]
+        intent = next(iter(request.intents))
         handler = self.intents_handler[intent]
-        return await handler(request)
+        if intent == intents.REPEAT:
+            return await handler(request)
+        film_id = await self._get_film_id(request)
+        return await self.reply_cached(request, intent, handler, 'film_id', film_id)
 
     @staticmethod
     async def _get_film_id(request: AliceRequest):
         film_id = request.state.get('film_id', '')
         film_name = request.slots.get('film_name', '')
         if film_name:
-            query = film_name
-            search_response = await request.search_service.search_films(query_string=query)
-            if search_response:
-                logger.debug('search response: %s', search_response)
-                return search_response.items[0].uuid
+            found_film_id = await request.search_service.get_film_id(
+                film_name=film_name, deadline=request.deadline
+            )
+            logger.debug('film_id for film_name %s - %s', film_name, found_film_id)
+            if found_film_id:
+                return found_film_id
 
         return film_id
 
-    async def film_director(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                film_title = search_response.title_ru
-                directors_list = search_response.directors_names_ru
-                if directors_list:
-                    directors = get_string_from_list(directors_list)
-                    text = f'Фильм "{film_title}" был снят {directors}.'
-                else:
-                    text = f'У меня нет информации о режиссере, снявшем фильм "{film_title}".'
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Автор сценария', hide=True),
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
-                )
-
-        return await self.make_response(text='')
+    @timed
+    async def film_director(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_DIRECTOR],
+            deadline=request.deadline,
+        )
+        if search_response:
+            film_title = search_response.title_ru
+            directors_list = search_response.directors_names_ru
+            if directors_list:
+                directors = get_string_from_list(directors_list)
+                text = f'Фильм "{film_title}" был снят {directors}.'
+            else:
+                text = f'У меня нет информации о режиссере, снявшем фильм "{film_title}".'
 
-    async def film_writers(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                film_title = search_response.title_ru
-                writers_list = search_response.writers_names_ru
-                if writers_list:
-                    writers = get_string_from_list(writers_list)
-                    text = f'Фильм "{film_title}" был снят по сценарию {writers}'
-                else:
-                    text = f'У меня нет информации об авторах сценария фильма "{film_title}".'
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
-                )
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Автор сценария', hide=True),
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-        return await self.make_response(text='')
+    @timed
+    async def film_writers(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_WRITERS],
+            deadline=request.deadline,
+        )
+        if search_response:
+            film_title = search_response.title_ru
+            writers_list = search_response.writers_names_ru
+            if writers_list:
+                writers = get_string_from_list(writers_list)
+                text = f'Фильм "{film_title}" был снят по сценарию {writers}'
+            else:
+                text = f'У меня нет информации об авторах сценария фильма "{film_title}".'
 
-    async def film_actors(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                film_title = search_response.title_ru
-                actors_list = search_response.actors_names_ru
-                if actors_list:
-                    actors = get_string_from_list(actors_list)
-                    text = f'Главные роли в фильме "{film_title}" сыграли:\n {actors}'
-                else:
-                    text = f'Сожалею, но я не смогла найти имена актеров, сыгравших в фильме "{film_title}".'
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Автор сценария', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
-                )
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-        return await self.make_response(text='')
+    @timed
+    async def film_actors(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_ACTORS],
+            deadline=request.deadline,
+        )
+        if search_response:
+            film_title = search_response.title_ru
+            actors_list = search_response.actors_names_ru
+            if actors_list:
+                actors = get_string_from_list(actors_list)
+                text = f'Главные роли в фильме "{film_title}" сыграли:\n {actors}'
+            else:
+                text = f'Сожалею, но я не смогла найти имена актеров, сыгравших в фильме "{film_title}".'
 
-    async def film_description(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                title = search_response.title_ru
-                film_description = search_response.description_ru
-                if film_description:
-                    text = f'Вот что я нашла по сюжету фильма "{title}":\n {film_description}'
-                else:
-                    text = f'К сожалению, по фильму "{title}" нет описания сюжета :-('
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
-                )
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Автор сценария', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-        return await self.make_response(text='')
+    @timed
+    async def film_description(
+        self, request: AliceRequest, film_id: str
+    ) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_DESCRIPTION],
+            deadline=request.deadline,
+        )
+        if search_response:
+            title = search_response.title_ru
+            film_description = search_response.description_ru
+            if film_description:
+                text = f'Вот что я нашла по сюжету фильма "{title}":\n {film_description}'
+            else:
+                text = f'К сожалению, по фильму "{title}" нет описания сюжета :-('
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-    async def film_duration(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                title = search_response.title_ru
-                duration = search_response.runtime_mins
-                if duration:
-                    plural_form = minute_plural[get_plural_form(duration)]
-                    text = f'Продолжительность фильма "{title}" составляет {duration} {plural_form}.'
-                else:
-                    text = (
-                        f'Я не нашла данных о продолжительности фильма {title} или это сериал.'
-                    )
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
+    @timed
+    async def film_duration(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_DURATION],
+            deadline=request.deadline,
+        )
+        if search_response:
+            title = search_response.title_ru
+            duration = search_response.runtime_mins
+            if duration:
+                plural_form = minute_plural[get_plural_form(duration)]
+                text = f'Продолжительность фильма "{title}" составляет {duration} {plural_form}.'
+            else:
+                text = (
+                    f'Я не нашла данных о продолжительности фильма {title} или это сериал.'
                 )
 
-        return await self.make_response(text='')
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-    async def film_genres(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                film_title = search_response.title_ru
-                genre_list = [genres[genre.name]['name'] for genre in search_response.genre]
-                if len(genre_list) == 1:
-                    genre, prefix = genre_list[0], 'в жанре'
-                else:
-                    genre, prefix = (
-                        ' и '.join([', '.join(genre_list[:-1]), *genre_list[-1:]]),
-                        'в жанрах',
-                    )
-
-                text = f'Фильм "{film_title}" снят {prefix} {genre}.'
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Рейтинг фильма', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
+    @timed
+    async def film_genres(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_GENRES],
+            deadline=request.deadline,
+        )
+        if search_response:
+            film_title = search_response.title_ru
+            genre_list = [genres[genre.name]['name'] for genre in search_response.genre]
+            if len(genre_list) == 1:
+                genre, prefix = genre_list[0], 'в жанре'
+            else:
+                genre, prefix = (
+                    ' и '.join([', '.join(genre_list[:-1]), *genre_list[-1:]]),
+                    'в жанрах',
                 )
 
-        return await self.make_response(text='')
+            text = f'Фильм "{film_title}" снят {prefix} {genre}.'
 
-    async def film_rating(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                film_rating = search_response.imdb_rating
-                film_title = search_response.title_ru
-                if film_rating:
-                    text = f'Рейтинг фильма "{film_title}" по версии IMDB - {film_rating}.'
-                else:
-                    text = (
-                        f'К сожалению, у меня нет информации о рейтинге фильма "{film_title}".'
-                    )
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Автор сценария', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Рейтинг фильма', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
+
+    @timed
+    async def film_rating(self, request: AliceRequest, film_id: str) -> Optional[dict[str, Any]]:
+        # Для ответа о рейтинге достаточно результата поиска фильма, запрос деталей не требуется
+        search_response = await request.search_service.get_film_summary(
+            film_id=film_id, deadline=request.deadline
+        )
+        if search_response:
+            film_rating = search_response.imdb_rating
+            film_title = search_response.title_ru
+            if film_rating:
+                text = f'Рейтинг фильма "{film_title}" по версии IMDB - {film_rating}.'
+            else:
+                text = (
+                    f'К сожалению, у меня нет информации о рейтинге фильма "{film_title}".'
                 )
 
-        return await self.make_response(text='')
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Автор сценария', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-    async def film_release_date(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            if search_response:
-                title = search_response.title_ru
-                film_release_date = search_response.release_date
-                film_release_date = film_release_date.strftime('%d.%m.%Y')
-                if film_release_date:
-                    text = (
-                        f'Фильм "{title}" впервые был показан на экранах {film_release_date}.'
-                    )
-                else:
-                    text = f'Я не смогла найти информацию о дате релиза фильма "{title}"'
-
-                return await self.make_response(
-                    text=text,
-                    state={'film_id': film_id},
-                    buttons=[
-                        make_button('Актеры фильма', hide=True),
-                        make_button('Режиссёр фильма', hide=True),
-                        make_button('Автор сценария', hide=True),
-                        make_button('Подробнее о фильме', hide=True),
-                    ],
+    @timed
+    async def film_release_date(
+        self, request: AliceRequest, film_id: str
+    ) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id,
+            fields=FILM_FIELDS[intents.FILM_RELEASE_DATE],
+            deadline=request.deadline,
+        )
+        if search_response:
+            title = search_response.title_ru
+            film_release_date = search_response.release_date
+            film_release_date = film_release_date.strftime('%d.%m.%Y')
+            if film_release_date:
+                text = (
+                    f'Фильм "{title}" впервые был показан на экранах {film_release_date}.'
                 )
+            else:
+                text = f'Я не смогла найти информацию о дате релиза фильма "{title}"'
 
-        return await self.make_response(text='')
+            return self.render_response(
+                text=text,
+                buttons=[
+                    make_button('Актеры фильма', hide=True),
+                    make_button('Режиссёр фильма', hide=True),
+                    make_button('Автор сценария', hide=True),
+                    make_button('Подробнее о фильме', hide=True),
+                ],
+            )
 
-    async def film_full_detail(self, request: AliceRequest):
-        film_id = await self._get_film_id(request)
+    @timed
+    async def film_full_detail(
+        self, request: AliceRequest, film_id: str
+    ) -> Optional[dict[str, Any]]:
         logger.debug('film_id - %s', film_id)
-        if film_id:
-            search_response = await request.search_service.get_film_detail(film_id=film_id)
-            logger.debug('search_response - %s', search_response)
+        search_response = await request.search_service.get_film_detail(
+            film_id=film_id, deadline=request.deadline
+        )
+        logger.debug('search_response - %s', search_response)
 
-            if search_response:
-                title = search_response.title_ru
-                description = search_response.description_ru or 'нет данных'
-                actors_list = search_response.actors_names_ru
-                actors = get_string_from_list(actors_list) or 'нет данных'
-                writers_list = search_response.writers_names_ru
-                writers = get_string_from_list(writers_list) or 'нет данных'
-                directors_list = search_response.directors_names_ru
-                directors = get_string_from_list(directors_list) or 'нет данных'
-                rating = search_response.imdb_rating
-                genre_list = [genres[genre.name]['name'] for genre in search_response.genre]
-                genre = get_string_from_list(genre_list)
-                duration = search_response.runtime_mins
-                if duration:
-                    duration = f'{duration} {minute_plural[get_plural_form(duration)]}'
-                release = search_response.release_date or 'нет данных'
-                if release:
-                    release = release.strftime('%d.%m.%Y')
-
-                text = f"""
-                Название: "{title}"
-                Жанры: {genre}
-                Режиссёр: {directors}
-                Сценарий: {writers}
-                Актёры: {actors}
-                Сюжет фильма: {description}
-                IMDB рейтинг фильма: {rating}
-                Продолжительность фильма: {duration if duration else 'нет данных'}
-                Дата релиза: {release}
-                """
-                return await self.make_response(text=text, state={'film_id': film_id},)
-
-        return await self.make_response(text='')
+        if search_response:
+            title = search_response.title_ru
+            description = search_response.description_ru or 'нет данных'
+            actors_list = search_response.actors_names_ru
+            actors = get_string_from_list(actors_list) or 'нет данных'
+            writers_list = search_response.writers_names_ru
+            writers = get_string_from_list(writers_list) or 'нет данных'
+            directors_list = search_response.directors_names_ru
+            directors = get_string_from_list(directors_list) or 'нет данных'
+            rating = search_response.imdb_rating
+            genre_list = [genres[genre.name]['name'] for genre in search_response.genre]
+            genre = get_string_from_list(genre_list)
+            duration = search_response.runtime_mins
+            if duration:
+                duration = f'{duration} {minute_plural[get_plural_form(duration)]}'
+            release = search_response.release_date or 'нет данных'
+            if release:
+                release = release.strftime('%d.%m.%Y')
+
+            text = f"""
+            Название: "{title}"
+            Жанры: {genre}
+            Режиссёр: {directors}
+            Сценарий: {writers}
+            Актёры: {actors}
+            Сюжет фильма: {description}
+            IMDB рейтинг фильма: {rating}
+            Продолжительность фильма: {duration if duration else 'нет данных'}
+            Дата релиза: {release}
+            """
+            return self.render_response(text=text)
 
     async def repeat(self, request: AliceRequest):
         state = request.state
-        last_phrase = state.get('last_phrase')
+        last_phrase = await get_state_codec().get_last_phrase(state)
 
         return await self.make_response(text=last_phrase, state=state)
 
     def handle_local_intents(self, request: AliceRequest):
-        if set(request.intents) & set(FILM_INFO_INTENTS):
+        if not FILM_INFO_INTENTS.isdisjoint(request.intents):
             return self
 
 
@@ -594,134 +708,137 @@ class PersonInfo(CommonScene):
         }
 
     @property
-    def intents_handler(self) -> dict[str, Callable[[AliceRequest], Awaitable]]:
+    def intents_handler(self) -> dict[str, Callable[..., Awaitable]]:
         return self.intents_dict
 
     async def reply(self, request: AliceRequest) -> dict[str, Any]:
-        intent = list(request.intents.keys())[0]
+        intent = next(iter(request.intents))
         logger.debug('intent - %s', intent)
         handler = self.intents_handler[intent]
-        return await handler(request)
+        if intent == intents.REPEAT:
+            return await handler(request)
+        person_id = await self._get_person_id(request)
+        return await self.reply_cached(request, intent, handler, 'person_id', person_id)
 
     @staticmethod
     async def _get_person_id(request: AliceRequest):
         person_id = request.state.get('person_id', '')
         person_name = request.slots.get('person_name', '')
-        logger.info('person_id - %s, person_name - %s', person_id, person_name)
+        logger.debug('person_id - %s, person_name - %s', person_id, person_name)
         if person_name:
-            query = person_name
-            logger.info('query person name - %s', query)
-            search_response = await request.search_service.search_persons(query_string=query)
-            logger.info('search_response for person_id - %s', search_response)
-            if search_response:
-                return search_response.items[0].uuid
-            else:
-                return
+            return await request.search_service.get_person_id(
+                person_name=person_name, deadline=request.deadline
+            )
 
         return person_id
 
-    async def person_roles(self, request: AliceRequest):
-        person_id = await self._get_person_id(request)
-        if person_id:
-            search_response = await request.search_service.get_person_detail(
-                person_id=person_id
-            )
-            if search_response:
-                roles = [roles_dictionary[role] for role in search_response.roles]
-                text_roles = get_string_from_list(roles)
-                full_name = search_response.full_name_ru
-                text = f'{full_name} в своей карьере выступал в роли {text_roles}.'
-
-                return await self.make_response(
-                    text=text,
-                    state={'person_id': person_id},
-                    buttons=[make_button(f'Фильмы {full_name}', hide=True)],
-                )
+    @staticmethod
+    async def _get_person_with_films(
+        request: AliceRequest, person_id: str
+    ) -> tuple[Optional[APIPersonDetail], Optional[APIFilmsList]]:
+        """Получение детальной информации о персоне и списка фильмов с ее участием.
+        Запросы независимы друг от друга, поэтому выполняются одновременно в рамках общего времени на ответ.
+        """
+        return await asyncio.gather(
+            request.search_service.get_person_detail(
+                person_id=person_id, fields=PERSON_FIELDS, deadline=request.deadline
+            ),
+            request.search_service.get_list_films_by_person(
+                person_id=person_id, deadline=request.deadline
+            ),
+        )
 
-        return await self.make_response(text='')
+    @timed
+    async def person_roles(self, request: AliceRequest, person_id: str) -> Optional[dict[str, Any]]:
+        search_response = await request.search_service.get_person_detail(
+            person_id=person_id, fields=PERSON_FIELDS, deadline=request.deadline
+        )
+        if search_response:
+            roles = [roles_dictionary[role] for role in search_response.roles]
+            text_roles = get_string_from_list(roles)
+            full_name = search_response.full_name_ru
+            text = f'{full_name} в своей карьере выступал в роли {text_roles}.'
 
-    async def person_films(self, request: AliceRequest):
-        person_id = await self._get_person_id(request)
-        logger.info(person_id)
-        if person_id:
-            search_response_person = await request.search_service.get_person_detail(
-                person_id=person_id
-            )
-            if search_response_person:
-                full_name = search_response_person.full_name_ru
-                search_response = await request.search_service.get_list_films_by_person(
-                    person_id=person_id
-                )
-                logger.info(search_response)
-                if search_response:
-                    person_films = [
-                        (film.title_ru, film.imdb_rating) for film in search_response.items
-                    ]
-                    total_count = search_response.total
-                    plural_form = film_plural_[get_plural_form(total_count)]
-                    if total_count >= 5:
-                        phrase = 'Вот 5 самых высоко оцененных: '
-                    else:
-                        phrase = 'Вот они: '
-                    text = [
-                        f'{full_name} упоминается в {total_count} {plural_form} нашего кинотеатра. {phrase}'
-                    ]
-                    for title, rating in person_films:
-                        text.append(f'{title}, рейтинг - {rating}')
-                    result_text = '\n'.join(text)
-
-                    return await self.make_response(
-                        text=result_text, state={'person_id': person_id},
-                    )
-
-        return await self.make_response(text='')
-
-    async def person_full_detail(self, request: AliceRequest):
-        person_id = await self._get_person_id(request)
-        if person_id:
-            search_response = await request.search_service.get_person_detail(
-                person_id=person_id
+            return self.render_response(
+                text=text,
+                buttons=[make_button(f'Фильмы {full_name}', hide=True)],
             )
+
+    @timed
+    async def person_films(self, request: AliceRequest, person_id: str) -> Optional[dict[str, Any]]:
+        search_response_person, search_response = await self._get_person_with_films(
+            request, person_id
+        )
+        if search_response_person:
+            full_name = search_response_person.full_name_ru
             if search_response:
-                roles = [roles_dictionary[role] for role in search_response.roles]
-                text_roles = get_string_from_list(roles)
-                full_name = search_response.full_name_ru.title()
-                text = [f'{full_name} в своей карьере выступал в роли {text_roles}.']
-                search_film_response = await request.search_service.get_list_films_by_person(
-                    person_id=person_id
+                person_films = [
+                    (film.title_ru, film.imdb_rating) for film in search_response.items
+                ]
+                total_count = search_response.total
+                plural_form = film_plural_[get_plural_form(total_count)]
+                if total_count >= 5:
+                    phrase = 'Вот 5 самых высоко оцененных: '
+                else:
+                    phrase = 'Вот они: '
+                text = [
+                    f'{full_name} упоминается в {total_count} {plural_form} нашего кинотеатра. {phrase}'
+                ]
+                for title, rating in person_films:
+                    text.append(f'{title}, рейтинг - {rating}')
+                result_text = '\n'.join(text)
+                card = await self.make_films_card(request, f'Фильмы {full_name}', search_response.items)
+
+                return self.render_response(text=result_text, card=card)
+            if request.deadline is not None and request.deadline.expired:
+                return self.render_response(
+                    text=f'Я не успела получить список фильмов {full_name}. '
+                    f'Пожалуйста, повторите вопрос.',
                 )
-                if search_film_response:
-                    person_films = [
-                        (film.title_ru, film.imdb_rating)
-                        for film in search_film_response.items
-                    ]
-                    total_count = search_film_response.total
-                    plural_form = film_plural[get_plural_form(total_count)]
-                    if total_count >= 5:
-                        phrase = 'Вот 5 самых высоко оцененных: '
-                    else:
-                        phrase = 'Вот они: '
-                    text.append(
-                        f'В нашем кинотеатре есть {total_count} {plural_form} с его участием. {phrase}'
-                    )
-                    for title, rating in person_films:
-                        text.append(f'{title}, рейтинг - {rating}')
-                    result_text = '\n'.join(text)
-
-                    return await self.make_response(
-                        text=result_text, state={'person_id': person_id},
-                    )
-
-        return await self.make_response(text='')
+
+    @timed
+    async def person_full_detail(
+        self, request: AliceRequest, person_id: str
+    ) -> Optional[dict[str, Any]]:
+        search_response, search_film_response = await self._get_person_with_films(
+            request, person_id
+        )
+        if search_response:
+            roles = [roles_dictionary[role] for role in search_response.roles]
+            text_roles = get_string_from_list(roles)
+            full_name = search_response.full_name_ru.title()
+            text = [f'{full_name} в своей карьере выступал в роли {text_roles}.']
+            if search_film_response:
+                person_films = [
+                    (film.title_ru, film.imdb_rating)
+                    for film in search_film_response.items
+                ]
+                total_count = search_film_response.total
+                plural_form = film_plural[get_plural_form(total_count)]
+                if total_count >= 5:
+                    phrase = 'Вот 5 самых высоко оцененных: '
+                else:
+                    phrase = 'Вот они: '
+                text.append(
+                    f'В нашем кинотеатре есть {total_count} {plural_form} с его участием. {phrase}'
+                )
+                for title, rating in person_films:
+                    text.append(f'{title}, рейтинг - {rating}')
+            elif request.deadline is not None and request.deadline.expired:
+                # Частичный ответ: роли персоны получены, а список фильмов - нет
+                text.append('Список фильмов с его участием я не успела получить.')
+            result_text = '\n'.join(text)
+
+            return self.render_response(text=result_text)
 
     async def repeat(self, request: AliceRequest):
         state = request.state
-        last_phrase = state.get('last_phrase')
+        last_phrase = await get_state_codec().get_last_phrase(state)
 
         return await self.make_response(text=last_phrase, state=state)
 
     def handle_local_intents(self, request: AliceRequest):
-        if set(request.intents) & set(PERSON_INFO_INTENTS):
+        if not PERSON_INFO_INTENTS.isdisjoint(request.intents):
             logger.debug('есть локальный интент %s', request.intents)
             return self
 
@@ -730,10 +847,32 @@ def _list_scenes():
     current_module = sys.modules[__name__]
     scenes = []
     for name, obj in inspect.getmembers(current_module):
-        if inspect.isclass(obj) and issubclass(obj, Scene):
+        if inspect.isclass(obj) and issubclass(obj, Scene) and not inspect.isabstract(obj):
             scenes.append(obj)
     return scenes
 
 
-SCENES = {scene.id(): scene for scene in _list_scenes()}
-DEFAULT_SCENE = Welcome
+def _compile_routes(
+    transitions: list[tuple[frozenset[str], Scene]]
+) -> dict[str, tuple[int, Scene]]:
+    """Построение таблицы переходов: интент -> (приоритет, сцена).
+    Приоритет определяется порядком групп интентов, интент из нескольких групп относится к первой из них.
+    """
+    routes = {}
+    for priority, (intents_set, scene) in enumerate(transitions):
+        for intent in intents_set:
+            routes.setdefault(intent, (priority, scene))
+    return routes
+
+
+# Сцены не хранят состояние запроса, поэтому создаются один раз и используются всеми запросами
+SCENES = {scene.id(): scene() for scene in _list_scenes()}
+DEFAULT_SCENE = SCENES[Welcome.id()]
+GLOBAL_ROUTES = _compile_routes(
+    [
+        (HELP_INTENTS, SCENES[Helper.id()]),
+        (TOP_FILM_INTENTS, SCENES[TopFilms.id()]),
+        (FILM_INFO_INTENTS, SCENES[FilmInfo.id()]),
+        (PERSON_INFO_INTENTS, SCENES[PersonInfo.id()]),
+    ]
+)
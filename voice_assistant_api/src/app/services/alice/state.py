@@ -1,2 +1,274 @@
+import base64
+import hashlib
+import logging
+import zlib
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Optional
+from uuid import UUID
+
+import orjson
+
+from app.core.config import settings
+from app.db.cache.memory import MemoryCache
+from app.db.cache.redis import get_redis_cache
+from app.db.cache.tiered import TieredCache
+from app.models.models import SessionPhrase
+from app.services.alice import intents
+
+logger = logging.getLogger(__name__)
+
 STATE_REQUEST_KEY = 'session'
 STATE_RESPONSE_KEY = 'session_state'
+
+# Короткие коды сцен и интентов в компактном состоянии сессии
+SCENE_CODES = {'Welcome': 'w', 'Helper': 'h', 'TopFilms': 't', 'FilmInfo': 'f', 'PersonInfo': 'p'}
+INTENT_CODES = {
+    intents.TOP_BY_GENRE: 'g',
+    intents.TOP_BY_RATING: 'r',
+    intents.NEXT: 'n',
+    intents.PREVIOUS: 'b',
+    intents.FILM_RATING: 'fr',
+    intents.FILM_GENRES: 'fg',
+    intents.FILM_ACTORS: 'fa',
+    intents.FILM_DIRECTOR: 'fd',
+    intents.FILM_WRITERS: 'fw',
+    intents.FILM_DESCRIPTION: 'fs',
+    intents.FILM_RELEASE_DATE: 'fy',
+    intents.FILM_DURATION: 'fl',
+    intents.DETAILS_FILM: 'fi',
+    intents.PERSON_ROLES: 'pr',
+    intents.PERSON_FILMS: 'pf',
+    intents.DETAILS_PERSON: 'pi',
+    intents.HELP: 'h',
+    intents.WHAT_CAN_YOU_DO: 'wc',
+    intents.REPEAT: 'rp',
+}
+SCENE_NAMES = {code: name for name, code in SCENE_CODES.items()}
+INTENT_NAMES = {code: name for name, code in INTENT_CODES.items()}
+
+# Ключи компактного состояния: сцена, ключ последней фразы, сжатая последняя фраза, страница, число страниц,
+# интенты, UUID
+SCENE_KEY = 's'
+PHRASE_KEY = 'l'
+PACKED_PHRASE_KEY = 'z'
+PAGE_KEY = 'p'
+MAX_PAGE_KEY = 'm'
+INTENTS_KEY = 'i'
+UUID_KEYS = {'film_id': 'f', 'person_id': 'e'}
+UUID_NAMES = {code: name for name, code in UUID_KEYS.items()}
+
+# Ключ последней фразы в раскодированном состоянии
+LAST_PHRASE_KEY = 'last_phrase_key'
+
+
+@dataclass
+class StateCodecStats:
+    turns: int = 0
+    legacy_bytes: int = 0
+    compact_bytes: int = 0
+    phrase_hits: int = 0
+    phrase_misses: int = 0
+
+
+def get_phrase_key(text: str) -> str:
+    # Ключ зависит только от текста, поэтому одинаковые ответы разных сессий хранятся один раз
+    return base64.urlsafe_b64encode(hashlib.blake2b(text.encode(), digest_size=6).digest()).decode()
+
+
+def pack_phrase(text: str) -> Optional[str]:
+    # Кириллица в cp1251 занимает байт вместо двух в UTF-8, сжатие без заголовка zlib и base85,
+    # не требующий экранирования в JSON, сокращают длинные фразы примерно вдвое
+    try:
+        data = text.encode('cp1251')
+    except UnicodeEncodeError:
+        return None
+    compressor = zlib.compressobj(zlib.Z_BEST_COMPRESSION, zlib.DEFLATED, -zlib.MAX_WBITS)
+    return base64.b85encode(compressor.compress(data) + compressor.flush()).decode()
+
+
+def unpack_phrase(value: str) -> Optional[str]:
+    try:
+        return zlib.decompress(base64.b85decode(value), -zlib.MAX_WBITS).decode('cp1251')
+    except (ValueError, zlib.error):
+        return None
+
+
+def encode_uuid(value: str) -> Optional[str]:
+    try:
+        return base64.urlsafe_b64encode(UUID(value).bytes).decode().rstrip('=')
+    except (ValueError, TypeError, AttributeError):
+        return None
+
+
+def decode_uuid(value: str) -> str:
+    return str(UUID(bytes=base64.urlsafe_b64decode(value + '==')))
+
+
+def encode_intents(request_intents: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    # Из слотов сохраняются только значения: тип слота сценами не используется
+    return {
+        INTENT_CODES.get(intent, intent): {
+            slot: value.get('value') for slot, value in (data or {}).get('slots', {}).items()
+        }
+        for intent, data in request_intents.items()
+    }
+
+
+def decode_intents(compact_intents: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    return {
+        INTENT_NAMES.get(code, code): {'slots': {slot: {'value': value} for slot, value in slots.items()}}
+        for code, slots in compact_intents.items()
+    }
+
+
+class SessionStateCodec:
+    """Кодирование состояния сессии, которое Алиса возвращает в каждом следующем запросе.
+    Вместо имени сцены, словаря интентов NLU и UUID в строковом виде передаются короткие коды,
+    значения слотов и UUID в base64. Последняя фраза навыка (до 1024 символов) при общем кеше в Redis
+    хранится в нем по короткому ключу от ее текста, а в состоянии передается только ключ.
+    Без Redis фраза остается в состоянии в сжатом виде: следующий запрос сессии может попасть в другой
+    воркер, кеш процесса которого ее не содержит, и повтор фразы перестал бы работать.
+    Состояние в прежнем виде раскодируется без изменений, поэтому сессии, начатые до включения
+    компактного вида, продолжаются без ошибок.
+    """
+
+    def __init__(self, phrases: TieredCache, phrase_ttl: float, compact: bool, offload_phrase: bool) -> None:
+        self.phrases = phrases
+        self.phrase_ttl = phrase_ttl
+        self.compact = compact
+        self.offload_phrase = offload_phrase
+        self.stats = StateCodecStats()
+
+    async def encode(self, state: dict[str, Any]) -> dict[str, Any]:
+        """Кодирование состояния сессии для ответа навыка.
+
+        :param state: состояние сессии со сценой и последней фразой в прежнем виде.
+        :return: состояние сессии для ответа Алисе.
+        """
+        state = {key: value for key, value in state.items() if key != LAST_PHRASE_KEY}
+        if not self.compact:
+            return state
+        compact: dict[str, Any] = {}
+        for key, value in state.items():
+            if key == 'scene':
+                compact[SCENE_KEY] = SCENE_CODES.get(value, value)
+            elif key == 'last_phrase':
+                if not self.offload_phrase:
+                    packed = pack_phrase(value) if value else None
+                    if packed is not None and len(packed) < len(orjson.dumps(value)):
+                        compact[PACKED_PHRASE_KEY] = packed
+                    else:
+                        compact[key] = value
+                elif value:
+                    compact[PHRASE_KEY] = await self._save_phrase(value)
+            elif key == 'page':
+                compact[PAGE_KEY] = value
+            elif key == 'max_page':
+                compact[MAX_PAGE_KEY] = value
+            elif key == 'last_intents':
+                compact[INTENTS_KEY] = encode_intents(value)
+            elif key in UUID_KEYS:
+                object_id = encode_uuid(value)
+                if object_id is None:
+                    compact[key] = value
+                else:
+                    compact[UUID_KEYS[key]] = object_id
+            else:
+                # Неизвестные поля передаются без изменений
+                compact[key] = value
+        self.stats.turns += 1
+        self.stats.legacy_bytes += len(orjson.dumps(state))
+        self.stats.compact_bytes += len(orjson.dumps(compact))
+        return compact
+
+    def decode(self, state: Optional[dict[str, Any]]) -> Optional[dict[str, Any]]:
+        """Раскодирование состояния сессии из запроса навыка.
+        Последняя фраза не загружается из кеша: она нужна только для повтора и получается get_last_phrase.
+
+        :param state: состояние сессии из запроса Алисы.
+        :return: состояние сессии в прежнем виде, вместо последней фразы содержит ее ключ.
+        """
+        if not state or SCENE_KEY not in state:
+            return state
+        result: dict[str, Any] = {}
+        for key, value in state.items():
+            if key == SCENE_KEY:
+                result['scene'] = SCENE_NAMES.get(value, value)
+            elif key == PHRASE_KEY:
+                result[LAST_PHRASE_KEY] = value
+            elif key == PACKED_PHRASE_KEY:
+                phrase = unpack_phrase(value)
+                if phrase is None:
+                    logger.warning('Invalid packed phrase in session state: %r', value)
+                else:
+                    result['last_phrase'] = phrase
+            elif key == PAGE_KEY:
+                result['page'] = value
+            elif key == MAX_PAGE_KEY:
+                result['max_page'] = value
+            elif key == INTENTS_KEY:
+                result['last_intents'] = decode_intents(value)
+            elif key in UUID_NAMES:
+                try:
+                    result[UUID_NAMES[key]] = decode_uuid(value)
+                except ValueError:
+                    logger.warning('Invalid UUID in session state: %s=%r', key, value)
+            else:
+                result[key] = value
+        return result
+
+    async def get_last_phrase(self, state: Optional[dict[str, Any]]) -> Optional[str]:
+        """Получение последней фразы навыка из раскодированного состояния сессии.
+
+        :param state: состояние сессии, полученное decode.
+        :return: текст последней фразы или None, если фраза не найдена в кеше.
+        """
+        if not state:
+            return None
+        if 'last_phrase' in state:
+            return state['last_phrase']
+        phrase_key = state.get(LAST_PHRASE_KEY)
+        if not phrase_key:
+            return None
+        phrase = await self.phrases.get(f'phrase:{phrase_key}')
+        if phrase is None:
+            self.stats.phrase_misses += 1
+            return None
+        self.stats.phrase_hits += 1
+        return phrase.text
+
+    async def _save_phrase(self, text: str) -> str:
+        phrase_key = get_phrase_key(text)
+        cache_key = f'phrase:{phrase_key}'
+        # Фраза уже сохранена этим воркером, например при ответе из кеша отрисованных ответов
+        if not await self.phrases.local.contains(cache_key):
+            await self.phrases.set(cache_key, SessionPhrase(text=text), ttl=self.phrase_ttl)
+        return phrase_key
+
+    def get_stats(self) -> dict[str, Any]:
+        turns = self.stats.turns
+        saved = self.stats.legacy_bytes - self.stats.compact_bytes
+        return {
+            **asdict(self.stats),
+            'compact': self.compact,
+            'offload_phrase': self.offload_phrase,
+            'saved_bytes_per_turn': saved / turns if turns else 0.0,
+            'compact_ratio': self.stats.compact_bytes / self.stats.legacy_bytes if turns else 1.0,
+        }
+
+
+@lru_cache()
+def get_state_codec() -> SessionStateCodec:
+    local = MemoryCache(
+        ttl=settings.STATE.PHRASE_TTL,
+        max_items=settings.STATE.PHRASE_MAX_ITEMS,
+        max_memory=settings.CACHE.MAX_MEMORY,
+    )
+    remote = get_redis_cache() if settings.REDIS.ENABLED else None
+    return SessionStateCodec(
+        phrases=TieredCache(local=local, remote=remote),
+        phrase_ttl=settings.STATE.PHRASE_TTL,
+        compact=settings.STATE.COMPACT,
+        offload_phrase=remote is not None,
+    )
@@ -1,14 +1,17 @@
 import logging
-from functools import lru_cache
-from typing import Any
+import time
+from typing import Any, Optional
 
-from fastapi import Depends
+from starlette.requests import Request
 
+from app.core.config import settings
+from app.services.alice.base_scene import Scene
 from app.services.alice.request import AliceRequest
 from app.services.alice.scenes import DEFAULT_SCENE, SCENES
-from app.services.alice.state import STATE_REQUEST_KEY
 from app.services.alice_voice_assistant_abstract import VoiceAssistantAbstractService
-from app.services.movies_data_search import get_movies_data_search, MoviesDataSearch
+from app.services.movies_data_search import MoviesDataSearch
+from app.utils.deadline import Deadline
+from app.utils.metrics import WEBHOOK_LATENCY, WEBHOOK_REQUESTS
 
 logger = logging.getLogger(__name__)
 
@@ -17,37 +20,50 @@ class AliceVoiceAssistantService(VoiceAssistantAbstractService):
     def __init__(self, search_service: MoviesDataSearch) -> None:
         self.search_service = search_service
 
-    async def handler(self, request_body: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    async def handler(
+        self, request_body: dict[str, Any], deadline: Optional[Deadline] = None
+    ) -> tuple[dict[str, Any], str]:
+        started = time.perf_counter()
+        if deadline is None:
+            deadline = Deadline(settings.APP.RESPONSE_TIMEOUT)
         alice_request = AliceRequest(
-            request_body=request_body, search_service=self.search_service
-        )
-        current_scene_id = (
-            request_body.get('state', {}).get(STATE_REQUEST_KEY, {}).get('scene')
+            request_body=request_body, search_service=self.search_service, deadline=deadline
         )
+        scene, response, collection = await self.reply(alice_request)
+        intent = next(iter(alice_request.intents), 'none')
+        WEBHOOK_LATENCY.labels(scene=scene.id(), intent=intent).observe(time.perf_counter() - started)
+        WEBHOOK_REQUESTS.labels(collection=collection).inc()
+        return response, collection
+
+    @staticmethod
+    async def reply(alice_request: AliceRequest) -> tuple[Scene, dict[str, Any], str]:
+        """Метод выбора сцены и генерации ответа на запрос навыка.
+
+        :param alice_request: запрос навыка.
+        :return: кортеж из ответившей сцены, ответа webhook и имени коллекции журнала запросов.
+        """
+        current_scene_id = (alice_request.state or {}).get('scene')
 
         if current_scene_id is None:
             collection = 'alice_response'
-            return await DEFAULT_SCENE().reply(alice_request), collection
+            return DEFAULT_SCENE, await DEFAULT_SCENE.reply(alice_request), collection
 
-        current_scene = SCENES.get(current_scene_id, DEFAULT_SCENE)()
+        current_scene = SCENES.get(current_scene_id, DEFAULT_SCENE)
         next_scene = current_scene.move(alice_request)
 
         if next_scene is not None:
             response: dict = await next_scene.reply(alice_request)
             logger.debug('Response from scene [%s]: %s', next_scene, response)
             collection = 'alice_response'
-            return response, collection
+            return next_scene, response, collection
         else:
             fallback_response = await current_scene.fallback(alice_request)
             logger.debug(
                 'Fallback response from scene [%s]: %s', next_scene, fallback_response
             )
             collection = 'alice_fallback_request'
-            return fallback_response, collection
+            return current_scene, fallback_response, collection
 
 
-@lru_cache()
-async def get_alice_voice_assistant_service(
-    search_service: MoviesDataSearch = Depends(get_movies_data_search),
-) -> AliceVoiceAssistantService:
-    return AliceVoiceAssistantService(search_service=search_service)
+async def get_alice_voice_assistant_service(request: Request) -> AliceVoiceAssistantService:
+    return request.app.state.alice_service
@@ -1,10 +1,14 @@
 from abc import abstractmethod, ABC
-from typing import Any
+from typing import Any, Optional
 
 from starlette.requests import Request
 
+from app.utils.deadline import Deadline
+
 
 class VoiceAssistantAbstractService(ABC):
     @abstractmethod
-    async def handler(self, request_body: dict[str, Any]) -> tuple[dict[str, Any], str]:
+    async def handler(
+        self, request_body: dict[str, Any], deadline: Optional[Deadline] = None
+    ) -> tuple[dict[str, Any], str]:
         pass
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from functools import lru_cache
+from typing import Any, Optional, Sequence
+
+from aiohttp import ClientError, ClientTimeout
+from starlette import status
+
+from app.core import session
+from app.core.config import settings
+from app.db.cache.memory import MemoryCache
+from app.db.cache.redis import get_redis_cache
+from app.db.cache.tiered import TieredCache
+from app.models.models import SkillImage
+from app.utils.deadline import Deadline
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ImageStorageStats:
+    hits: int = 0
+    misses: int = 0
+    uploaded: int = 0
+    failed: int = 0
+    skipped: int = 0
+    timeouts: int = 0
+
+
+class ImageStorage:
+    """Идентификаторы постеров, загруженных в хранилище изображений навыка Яндекс Диалогов.
+    Карточки Алисы показывают только изображения из хранилища навыка, а загрузка по URL занимает
+    секунды, поэтому при ответе навыка идентификатор берется только из кеша. Отсутствующие в кеше
+    постеры загружаются в фоне и показываются в карточках следующих ответов.
+
+    :param images: кеш идентификаторов изображений по URL постера.
+    :param url: адрес API загрузки изображений навыка.
+    :param token: OAuth-токен владельца навыка.
+    :param timeout: максимальное время загрузки одного изображения в секундах.
+    :param max_tasks: максимальное количество одновременных фоновых загрузок.
+    """
+
+    def __init__(self, images: TieredCache, url: str, token: str, timeout: float, max_tasks: int) -> None:
+        self.images = images
+        self.url = url
+        self.headers = {'Authorization': f'OAuth {token}'}
+        self.timeout = ClientTimeout(total=timeout)
+        self.max_tasks = max_tasks
+        # Фоновые загрузки по URL постера
+        self.tasks: dict[str, asyncio.Task] = {}
+        self.stats = ImageStorageStats()
+
+    async def get_image_ids(
+        self, image_urls: Sequence[Optional[str]], deadline: Optional[Deadline] = None
+    ) -> list[Optional[str]]:
+        """Получение идентификаторов изображений из кеша одним запросом.
+        Для отсутствующих в кеше изображений запускается фоновая загрузка.
+
+        :param image_urls: URL постеров фильмов, None для фильмов без постера.
+        :param deadline: крайний срок обработки запроса навыка.
+        :return: идентификаторы изображений, None для еще не загруженных изображений.
+        """
+        urls = [image_url for image_url in image_urls if image_url]
+        if not urls:
+            return [None] * len(image_urls)
+        try:
+            entries = await asyncio.wait_for(
+                self.images.get_entries([f'image:{image_url}' for image_url in urls]),
+                timeout=deadline.remaining() if deadline is not None else None,
+            )
+        except asyncio.TimeoutError:
+            # Карточка показывается без постеров, чтобы не задерживать ответ навыка
+            logger.warning('Image cache lookup timed out for %s images', len(urls))
+            self.stats.timeouts += 1
+            return [None] * len(image_urls)
+        image_ids = {}
+        for image_url, entry in zip(urls, entries):
+            if entry is None:
+                self.stats.misses += 1
+                self.upload(image_url)
+                continue
+            self.stats.hits += 1
+            image_ids[image_url] = entry[0].id or None
+        return [image_ids.get(image_url) if image_url else None for image_url in image_urls]
+
+    def upload(self, image_url: str) -> None:
+        """Запуск фоновой загрузки изображения. Для каждого URL выполняется не более одной загрузки."""
+        if image_url in self.tasks:
+            return
+        if len(self.tasks) >= self.max_tasks:
+            self.stats.skipped += 1
+            return
+        task = asyncio.create_task(self._upload(image_url))
+        self.tasks[image_url] = task
+        task.add_done_callback(lambda _: self.tasks.pop(image_url, None))
+
+    def cancel(self) -> None:
+        for task in self.tasks.values():
+            task.cancel()
+        self.tasks.clear()
+
+    async def _upload(self, image_url: str) -> None:
+        image_id = await self._request(image_url)
+        if image_id:
+            self.stats.uploaded += 1
+            ttl = settings.CARD.IMAGE_TTL
+        else:
+            # Неудачная загрузка запоминается, чтобы не повторять ее на каждый ответ навыка
+            self.stats.failed += 1
+            ttl = settings.CARD.FAILED_TTL
+        await self.images.set(f'image:{image_url}', SkillImage(id=image_id or ''), ttl=ttl)
+
+    async def _request(self, image_url: str) -> Optional[str]:
+        client_session = session.session
+        if client_session is None or client_session.closed:
+            return None
+        try:
+            async with client_session.post(
+                self.url, json={'url': image_url}, headers=self.headers, timeout=self.timeout
+            ) as response:
+                data = await response.json(content_type=None)
+                if response.status != status.HTTP_201_CREATED:
+                    logger.warning('Image upload failed with status %s: %s', response.status, image_url)
+                    return None
+                return data['image']['id']
+        except (ClientError, asyncio.TimeoutError, KeyError, TypeError, ValueError) as err:
+            logger.warning('Image upload failed: %s - %r', image_url, err)
+            return None
+
+    def get_stats(self) -> dict[str, Any]:
+        return {**asdict(self.stats), 'in_flight': len(self.tasks), 'cache': self.images.get_stats()}
+
+
+@lru_cache()
+def get_image_storage() -> ImageStorage:
+    local = MemoryCache(
+        ttl=settings.CARD.IMAGE_TTL,
+        max_items=settings.CARD.IMAGE_MAX_ITEMS,
+        max_memory=settings.CACHE.MAX_MEMORY,
+    )
+    remote = get_redis_cache() if settings.REDIS.ENABLED else None
+    return ImageStorage(
+        images=TieredCache(local=local, remote=remote),
+        url=f'{settings.CARD.UPLOAD_URL}/skills/{settings.CARD.SKILL_ID}/images',
+        token=settings.CARD.OAUTH_TOKEN,
+        timeout=settings.CARD.UPLOAD_TIMEOUT,
+        max_tasks=settings.CARD.UPLOAD_MAX_TASKS,
+    )
@@ -0,0 +1,152 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from app.core.config import settings
+from app.db.cache.abstract import Cache
+from app.db.disk_snapshot import DiskSnapshot
+from app.models.base import BaseFilmModel, ORJSONModel
+from app.models.models import APIFilmsList, APIPersonDetail
+from app.services.title_index import TitleIndex
+from app.services.top_films_snapshot import TopFilmsSnapshot
+from app.utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+
+logger = logging.getLogger(__name__)
+
+
+class LastKnownGood:
+    """Последние успешно полученные от AsyncAPI топы фильмов по жанрам и детальная информация
+    о самых запрашиваемых фильмах и персонах в снимке на диске.
+    Если AsyncAPI недоступен и данных нет в кеше, ответ строится по снимку сразу, без ожидания таймаута.
+    Пока цепь запросов к AsyncAPI разомкнута, навык работает в режиме деградации: флаг режима
+    и количество ответов из снимка видны в метриках.
+
+    :param snapshot: файл снимка.
+    :param breaker: размыкатель цепи запросов к AsyncAPI.
+    :param refresh_interval: интервал обновления снимка в секундах.
+    :param max_items: максимальное количество объектов в снимке.
+    """
+
+    def __init__(
+        self, snapshot: DiskSnapshot, breaker: CircuitBreaker, refresh_interval: float, max_items: int
+    ) -> None:
+        self.snapshot = snapshot
+        self.breaker = breaker
+        self.refresh_interval = refresh_interval
+        self.max_items = max_items
+        self.served = 0
+        self.misses = 0
+        self.saves = 0
+        self.errors = 0
+        self.last_save_duration = 0.0
+
+    @property
+    def degraded(self) -> bool:
+        """Режим деградации: цепь запросов к AsyncAPI разомкнута, ответы строятся по кешу и снимку."""
+        return not self.breaker.closed
+
+    def get(self, cache_key: str) -> Optional[ORJSONModel]:
+        """Получение объекта из снимка, когда AsyncAPI не вернул данные.
+
+        :param cache_key: ключ кеша объекта.
+        :return: объект или None, если его нет в снимке.
+        """
+        obj = self.snapshot.get(cache_key)
+        if obj is None:
+            self.misses += 1
+            return None
+        self.served += 1
+        logger.debug('Last known good object served: %s', cache_key)
+        return obj
+
+    def index_titles(self, title_index: TitleIndex) -> None:
+        """Добавление фильмов и персон снимка в локальный индекс названий, чтобы вопросы о них
+        распознавались без поиска в ES, пока индекс не синхронизирован с AsyncAPI.
+
+        :param title_index: локальный индекс названий фильмов и имен персон.
+        """
+        for key in self.snapshot.keys():
+            obj = self.snapshot.get(key)
+            if isinstance(obj, APIFilmsList):
+                title_index.add_films(obj.items)
+            elif isinstance(obj, BaseFilmModel):
+                title_index.add_films([obj])
+            elif isinstance(obj, APIPersonDetail):
+                title_index.add_persons([obj])
+
+    async def refresh(self, cache: Cache, top_films: TopFilmsSnapshot, keys: Iterable[str]) -> None:
+        """Сохранение нового снимка из снимка топов и кеша данных.
+        Объекты, которых сейчас нет в кеше, переносятся из прежнего снимка.
+
+        :param cache: кеш результатов запросов к AsyncAPI.
+        :param top_films: снимок топов фильмов в памяти.
+        :param keys: ключи кеша самых запрашиваемых объектов в порядке убывания числа запросов.
+        """
+        started = time.perf_counter()
+        entries: dict[str, ORJSONModel] = {
+            f'films:{genre}:{page}:{per_page}': films
+            for (genre, page, per_page), films in top_films.items().items()
+        }
+        keys = [key for key in (*keys, *self.snapshot.keys()) if key not in entries]
+        for key in dict.fromkeys(keys):
+            if len(entries) >= self.max_items:
+                break
+            obj = await cache.get(key)
+            if obj is None:
+                obj = self.snapshot.get(key)
+            if obj is not None:
+                entries[key] = obj
+        if not entries:
+            return
+        await self.snapshot.save(entries)
+        self.saves += 1
+        self.last_save_duration = time.perf_counter() - started
+        logger.info(
+            'Last known good snapshot saved: %s objects in %.2f s', len(entries), self.last_save_duration
+        )
+
+    async def run(
+        self, cache: Cache, top_films: TopFilmsSnapshot, get_keys: Callable[[], Iterable[str]]
+    ) -> None:
+        """Фоновое обновление снимка с заданным интервалом. Первое обновление выполняется через интервал
+        после старта, чтобы снимок не перезаписывался до загрузки данных в кеш. Во время деградации
+        снимок не обновляется.
+
+        :param cache: кеш результатов запросов к AsyncAPI.
+        :param top_films: снимок топов фильмов в памяти.
+        :param get_keys: функция получения ключей кеша самых запрашиваемых объектов.
+        """
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            if self.degraded:
+                continue
+            try:
+                await self.refresh(cache, top_films, get_keys())
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception('Last known good snapshot refresh failed')
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'degraded': self.degraded,
+            'served': self.served,
+            'misses': self.misses,
+            'saves': self.saves,
+            'errors': self.errors,
+            'last_save_duration': self.last_save_duration,
+            'snapshot': self.snapshot.get_stats(),
+        }
+
+
+@lru_cache()
+def get_last_known_good() -> LastKnownGood:
+    return LastKnownGood(
+        snapshot=DiskSnapshot(settings.DISK_SNAPSHOT.PATH),
+        breaker=get_circuit_breaker(),
+        refresh_interval=settings.DISK_SNAPSHOT.REFRESH_INTERVAL,
+        max_items=settings.DISK_SNAPSHOT.MAX_ITEMS,
+    )
@@ -1,27 +1,87 @@
 import asyncio
 import logging
-from collections import abc
-from typing import Awaitable, Optional
+import time
+from typing import NamedTuple, Optional, Sequence, Type
+from urllib.parse import urlsplit
 
-from aiohttp import ClientSession
-from fastapi import Depends
+from aiohttp import ClientError, ClientSession
+from pydantic import ValidationError
 from starlette import status
+from starlette.requests import Request
 
 from app.core.config import settings
-from app.core.session import get_session
+from app.db.cache.abstract import Cache
+from app.db.cache.memory import get_slot_cache
+from app.db.cache.tiered import get_data_cache
+from app.models.base import BaseFilmModel, ORJSONModel
 from app.models.models import APIFilmsList, APIFilmDetail, APIPersonsList, APIPersonDetail
+from app.services.last_known_good import LastKnownGood, get_last_known_good
 from app.services.movies_data_search_abstract import MoviesDataSearchAbstract
-from app.utils.text import encode_uri
+from app.services.title_index import TitleIndex, get_title_index
+from app.services.top_films_snapshot import TopFilmsSnapshot, get_top_films_snapshot
+from app.utils.circuit_breaker import CircuitBreaker, get_circuit_breaker
+from app.utils.metrics import UPSTREAM_LATENCY, UPSTREAM_TIMEOUTS, get_endpoint, observed
+from app.utils.deadline import Deadline, get_timeout
+from app.utils.text import encode_uri, normalize_query
 
 logger = logging.getLogger(__name__)
 
+# Маркер отсутствия фильма или персоны в кеше поиска UUID по названию/имени
+NOT_FOUND = ''
+
+
+class CachePolicy(NamedTuple):
+    """Время хранения результатов метода в кеше: после мягкого TTL результат отдается из кеша
+    и обновляется в фоне, после жесткого TTL загружается синхронно.
+    """
+
+    soft_ttl: float
+    hard_ttl: float
+
+
+LIST_FILMS_POLICY = CachePolicy(settings.CACHE.LIST_FILMS_SOFT_TTL, settings.CACHE.LIST_FILMS_HARD_TTL)
+FILM_DETAIL_POLICY = CachePolicy(settings.CACHE.FILM_DETAIL_SOFT_TTL, settings.CACHE.FILM_DETAIL_HARD_TTL)
+PERSON_DETAIL_POLICY = CachePolicy(
+    settings.CACHE.PERSON_DETAIL_SOFT_TTL, settings.CACHE.PERSON_DETAIL_HARD_TTL
+)
+FILMS_BY_PERSON_POLICY = CachePolicy(
+    settings.CACHE.FILMS_BY_PERSON_SOFT_TTL, settings.CACHE.FILMS_BY_PERSON_HARD_TTL
+)
+
 
 class MoviesDataSearch(MoviesDataSearchAbstract):
-    def __init__(self, session: ClientSession) -> None:
+    def __init__(
+        self,
+        session: ClientSession,
+        cache: Cache,
+        slot_cache: Cache,
+        snapshot: TopFilmsSnapshot,
+        title_index: TitleIndex,
+        breaker: CircuitBreaker,
+        last_known_good: LastKnownGood,
+    ) -> None:
         self.session = session
+        self.cache = cache
+        self.slot_cache = slot_cache
+        self.snapshot = snapshot
+        self.title_index = title_index
+        self.breaker = breaker
+        self.last_known_good = last_known_good
+        # Выполняющиеся запросы к AsyncAPI по закодированному URL для объединения одинаковых запросов
+        self.in_flight: dict[str, asyncio.Task] = {}
+        self.deduplicated = 0
+        # Ссылки на фоновые загрузки, продолжающиеся после истечения времени ожидания ответа
+        self.background_tasks: set[asyncio.Task] = set()
+        # Фоновые загрузки следующих страниц списков фильмов по ключу кеша
+        self.prefetch_tasks: dict[str, asyncio.Task] = {}
+        self.prefetch_stats = {'started': 0, 'skipped': 0, 'cancelled': 0}
+        # Фоновые обновления устаревших записей кеша по ключу кеша
+        self.revalidate_tasks: dict[str, asyncio.Task] = {}
+        self.revalidate_stats = {'started': 0, 'failed': 0}
         self.url = settings.REQUEST.ASYNC_API_URL
         self.headers = {'Authorization': f'Bearer {settings.AUTH.ACCESS_TOKEN}'}
 
+    @observed
     async def search_films(
         self,
         query_string: str,
@@ -29,99 +89,466 @@ class MoviesDataSearch(MoviesDataSearchAbstract):
         page: int = 1,
         per_page: int = settings.APP.PER_PAGE,
         in_description: bool = False,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIFilmsList]:
+        return await self._search_films(query_string, multiple, page, per_page, deadline)
+
+    async def _search_films(
+        self,
+        query_string: str,
+        multiple: bool = False,
+        page: int = 1,
+        per_page: int = settings.APP.PER_PAGE,
+        deadline: Optional[Deadline] = None,
     ) -> Optional[APIFilmsList]:
+        # Вложенные вызовы публичных методов выполняются без @observed,
+        # чтобы время одного вызова не учитывалось в гистограмме дважды
         url = f'{self.url}/film/search?q={query_string}&page={page}'
         if multiple:
             url += f'&limit={per_page}'
         else:
             url += '&limit=1'
-        data, resp_status = await self.safe_request(url=url, headers=self.headers)
+        data, resp_status = await self.safe_request(url=url, headers=self.headers, deadline=deadline)
         if resp_status != status.HTTP_200_OK:
             return
         return APIFilmsList(**data)
 
-    async def get_film_detail(self, film_id: str) -> APIFilmDetail:
+    @observed
+    async def get_film_id(
+        self, film_name: str, deadline: Optional[Deadline] = None
+    ) -> Optional[str]:
+        cache_key = f'film_id:{normalize_query(film_name)}'
+        film_id = await self.slot_cache.get(cache_key)
+        if film_id is None:
+            # Точное или близкое совпадение с известным названием не требует нечеткого поиска в ES
+            film_id = self.title_index.find_film(film_name)
+        if film_id is None:
+            search_response = await self._search_films(query_string=film_name, deadline=deadline)
+            if search_response is None and self.is_interrupted(deadline):
+                # Поиск прерван по крайнему сроку запроса или размыканием цепи, а не из-за отсутствия фильма
+                return
+            film_id = NOT_FOUND
+            if search_response:
+                film = search_response.items[0]
+                film_id = str(film.uuid)
+                self.title_index.add_films([film])
+                # Результат поиска содержит название и рейтинг фильма, которых достаточно для части ответов
+                await self.cache.set(f'film_short:{film_id}', film)
+            await self.slot_cache.set(cache_key, film_id, ttl=self._get_slot_ttl(film_id))
+        return film_id or None
+
+    @observed
+    async def get_film_detail(
+        self,
+        film_id: str,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIFilmDetail]:
+        return await self._get_film_detail(film_id, fields, deadline)
+
+    async def _get_film_detail(
+        self,
+        film_id: str,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIFilmDetail]:
         url = f'{self.url}/film/{film_id}'
-        data, _ = await self.request(url=url, headers=self.headers)
-        return APIFilmDetail(**data)
+        return await self._get_detail(
+            f'film:{film_id}', url, APIFilmDetail, FILM_DETAIL_POLICY, fields, deadline
+        )
+
+    @observed
+    async def get_film_summary(
+        self, film_id: str, deadline: Optional[Deadline] = None
+    ) -> Optional[BaseFilmModel]:
+        entries = await self.cache.get_entries([f'film:{film_id}', f'film_short:{film_id}'])
+        film = next((entry[0] for entry in entries if entry is not None), None)
+        if film is None:
+            film = await self._get_film_detail(
+                film_id=film_id, fields=('title', 'title_ru', 'imdb_rating'), deadline=deadline
+            )
+        return film
 
+    @observed
     async def search_persons(
         self,
         query_string: str,
         multiple: bool = False,
         page: int = 1,
         per_page: int = settings.APP.PER_PAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIPersonsList]:
+        return await self._search_persons(query_string, multiple, page, per_page, deadline)
+
+    async def _search_persons(
+        self,
+        query_string: str,
+        multiple: bool = False,
+        page: int = 1,
+        per_page: int = settings.APP.PER_PAGE,
+        deadline: Optional[Deadline] = None,
     ) -> Optional[APIPersonsList]:
         limit = per_page if multiple else 1
         url = f'{self.url}/person/search?q={query_string}&page={page}&limit={limit}'
-        data, resp_status = await self.safe_request(url=url, headers=self.headers)
+        data, resp_status = await self.safe_request(url=url, headers=self.headers, deadline=deadline)
         if resp_status != status.HTTP_200_OK:
             return
         return APIPersonsList(**data)
 
-    async def get_person_detail(self, person_id: str) -> APIPersonDetail:
+    @observed
+    async def get_person_id(
+        self, person_name: str, deadline: Optional[Deadline] = None
+    ) -> Optional[str]:
+        cache_key = f'person_id:{normalize_query(person_name)}'
+        person_id = await self.slot_cache.get(cache_key)
+        if person_id is None:
+            person_id = self.title_index.find_person(person_name)
+        if person_id is None:
+            search_response = await self._search_persons(query_string=person_name, deadline=deadline)
+            if search_response is None and self.is_interrupted(deadline):
+                # Поиск прерван по крайнему сроку запроса или размыканием цепи, а не из-за отсутствия персоны
+                return
+            person_id = NOT_FOUND
+            if search_response:
+                person = search_response.items[0]
+                person_id = str(person.uuid)
+                self.title_index.add_persons([person])
+                # Результат поиска персоны совпадает с ее детальной информацией, повторный запрос не нужен
+                await self.cache.set(
+                    f'person:{person_id}',
+                    person,
+                    ttl=PERSON_DETAIL_POLICY.hard_ttl,
+                    soft_ttl=PERSON_DETAIL_POLICY.soft_ttl,
+                )
+            await self.slot_cache.set(cache_key, person_id, ttl=self._get_slot_ttl(person_id))
+        return person_id or None
+
+    @observed
+    async def get_person_detail(
+        self,
+        person_id: str,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIPersonDetail]:
         url = f'{self.url}/person/{person_id}'
-        data, _ = await self.request(url=url, headers=self.headers)
-        return APIPersonDetail(**data)
+        return await self._get_detail(
+            f'person:{person_id}', url, APIPersonDetail, PERSON_DETAIL_POLICY, fields, deadline
+        )
 
+    @observed
     async def get_list_films(
+        self,
+        genre: str = '',
+        page: int = 1,
+        per_page: int = settings.APP.PER_PAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIFilmsList]:
+        films = self.snapshot.get(genre=genre, page=page, per_page=per_page)
+        if films is not None:
+            return films
+        url = self._get_list_films_url(genre=genre, page=page, per_page=per_page)
+        cache_key = f'films:{genre}:{page}:{per_page}'
+        return await self._get_cached(cache_key, url, APIFilmsList, LIST_FILMS_POLICY, deadline)
+
+    @observed
+    async def load_list_films(
         self, genre: str = '', page: int = 1, per_page: int = settings.APP.PER_PAGE
-    ) -> APIFilmsList:
-        if genre:
-            url = (
-                f'{self.url}/film?sort=-imdb_rating&page={page}&limit={per_page}&genre={genre}'
-            )
-        else:
-            url = f'{self.url}/film?sort=-imdb_rating&page={page}&limit={per_page}'
-        data, _ = await self.request(url=url, headers=self.headers)
+    ) -> Optional[APIFilmsList]:
+        url = self._get_list_films_url(genre=genre, page=page, per_page=per_page)
+        data, resp_status = await self.safe_request(url=url, headers=self.headers)
+        if resp_status != status.HTTP_200_OK:
+            return
         return APIFilmsList(**data)
 
+    @observed
+    async def load_list_persons(
+        self, page: int = 1, per_page: int = settings.TITLE_INDEX.PAGE_SIZE
+    ) -> Optional[APIPersonsList]:
+        url = f'{self.url}/person?page={page}&limit={per_page}'
+        data, resp_status = await self.safe_request(url=url, headers=self.headers)
+        if resp_status != status.HTTP_200_OK:
+            return
+        return APIPersonsList(**data)
+
+    async def prefetch_list_films(
+        self, genre: str = '', page: int = 1, per_page: int = settings.APP.PER_PAGE
+    ) -> None:
+        url = self._get_list_films_url(genre=genre, page=page, per_page=per_page)
+        cache_key = f'films:{genre}:{page}:{per_page}'
+        if self.snapshot.get(genre=genre, page=page, per_page=per_page) is not None:
+            return
+        if cache_key in self.prefetch_tasks or await self.cache.contains(cache_key):
+            return
+        if len(self.prefetch_tasks) >= settings.CACHE.PREFETCH_MAX_TASKS:
+            # Под нагрузкой предварительная загрузка не должна конкурировать с запросами пользователей
+            self.prefetch_stats['skipped'] += 1
+            return
+        task = asyncio.create_task(self._prefetch(cache_key, url, APIFilmsList, LIST_FILMS_POLICY))
+        self.prefetch_tasks[cache_key] = task
+        task.add_done_callback(lambda _: self.prefetch_tasks.pop(cache_key, None))
+        self.prefetch_stats['started'] += 1
+
+    def cancel_prefetch(self) -> None:
+        for task in self.prefetch_tasks.values():
+            task.cancel()
+        self.prefetch_stats['cancelled'] += len(self.prefetch_tasks)
+        self.prefetch_tasks.clear()
+        for task in self.revalidate_tasks.values():
+            task.cancel()
+        self.revalidate_tasks.clear()
+
+    @observed
     async def get_list_films_by_person(
-        self, person_id: str, page: int = 1, per_page: int = settings.APP.PER_PAGE
-    ) -> APIFilmsList:
+        self,
+        person_id: str,
+        page: int = 1,
+        per_page: int = settings.APP.PER_PAGE,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[APIFilmsList]:
         url = f'{self.url}/person/{person_id}/film?sort=-imdb_rating&page={page}&limit={per_page}'
-        logger.info('url for search films by persons - %s', url)
-        data, _ = await self.request(url=url, headers=self.headers)
-        logger.info('data - %s', data)
-        return APIFilmsList(**data)
+        logger.debug('url for search films by persons - %s', url)
+        cache_key = f'person_films:{person_id}:{page}:{per_page}'
+        return await self._get_cached(cache_key, url, APIFilmsList, FILMS_BY_PERSON_POLICY, deadline)
+
+    def _get_list_films_url(self, genre: str, page: int, per_page: int) -> str:
+        url = f'{self.url}/film?sort=-imdb_rating&page={page}&limit={per_page}'
+        if genre:
+            url += f'&genre={genre}'
+        return url
+
+    def is_interrupted(self, deadline: Optional[Deadline] = None) -> bool:
+        return (deadline is not None and deadline.expired) or not self.breaker.closed
+
+    @staticmethod
+    def _get_slot_ttl(object_id: str) -> int:
+        """Время хранения результата поиска UUID. Отсутствующие в ES названия и имена хранятся недолго,
+        чтобы повторные запросы не ждали медленный нечеткий поиск, но появление новых данных учитывалось быстро.
+        """
+        return settings.CACHE.SLOT_TTL if object_id else settings.CACHE.NOT_FOUND_TTL
+
+    async def _get_detail(
+        self,
+        cache_key: str,
+        url: str,
+        model: Type[ORJSONModel],
+        policy: CachePolicy,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
+        """Метод получения детальной информации об объекте целиком или только указанных полей.
+        Полный объект из кеша содержит любые поля, поэтому при его наличии запрос к AsyncAPI не выполняется.
+        """
+        fallback_key = cache_key
+        if fields:
+            fields_param = ','.join(fields)
+            fields_key = f'{cache_key}:{fields_param}'
+            # Полный объект и объект с запрошенными полями проверяются одним запросом к кешу
+            obj_entry, fields_entry = await self.cache.get_entries([cache_key, fields_key])
+            if obj_entry is not None:
+                return obj_entry[0]
+            url = f'{url}?fields={fields_param}'
+            cache_key = fields_key
+            if fields_entry is not None:
+                obj, stale = fields_entry
+                if stale:
+                    self._revalidate(cache_key, url, model, policy)
+                return obj
+        return await self._get_cached(
+            cache_key, url, model, policy, deadline, fallback_key=fallback_key
+        )
+
+    async def _get_cached(
+        self,
+        cache_key: str,
+        url: str,
+        model: Type[ORJSONModel],
+        policy: CachePolicy,
+        deadline: Optional[Deadline] = None,
+        fallback_key: Optional[str] = None,
+    ) -> Optional[ORJSONModel]:
+        """Метод получения объекта из кеша или из AsyncAPI с ограничением времени ожидания.
+        Если ответ не успевает прийти до крайнего срока, загрузка продолжается в фоне и ее результат
+        сохраняется в кеш, поэтому повторный вопрос пользователя будет обработан без обращения к AsyncAPI.
+        Устаревший по мягкому TTL объект отдается сразу, а его обновление запускается в фоне.
+        Если AsyncAPI не вернул объект, он берется из снимка последних успешных ответов на диске.
+
+        :param cache_key: ключ кеша.
+        :param url: строка URL.
+        :param model: модель для сериализации ответа.
+        :param policy: время хранения объекта в кеше.
+        :param deadline: крайний срок обработки запроса навыка.
+        :param fallback_key: ключ объекта в снимке на диске, если отличается от ключа кеша.
+        :return: объект, сериализованный с помощью модели, или None, если ответ не получен.
+        """
+        obj = await self._get_or_load(cache_key, url, model, policy, deadline)
+        if obj is None:
+            obj = self.last_known_good.get(fallback_key or cache_key)
+        return obj
+
+    async def _get_or_load(
+        self,
+        cache_key: str,
+        url: str,
+        model: Type[ORJSONModel],
+        policy: CachePolicy,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
+        entry = await self.cache.get_entry(cache_key)
+        if entry is not None:
+            obj, stale = entry
+            if stale:
+                self._revalidate(cache_key, url, model, policy)
+            return obj
+        timeout = get_timeout(deadline, settings.REQUEST.TIMEOUT)
+        if timeout <= 0:
+            UPSTREAM_TIMEOUTS.labels(reason='deadline').inc()
+            return
+        task = asyncio.create_task(self._load(cache_key, url, model, policy))
+        self.background_tasks.add(task)
+        task.add_done_callback(self.background_tasks.discard)
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout=timeout)
+        except asyncio.TimeoutError:
+            UPSTREAM_TIMEOUTS.labels(reason='timeout').inc()
+            logger.warning('AsyncAPI response timeout %.2f s exceeded: %s', timeout, url)
+            return
+
+    async def _load(
+        self, cache_key: str, url: str, model: Type[ORJSONModel], policy: CachePolicy
+    ) -> Optional[ORJSONModel]:
+        data, resp_status = await self.request(url=url, headers=self.headers)
+        if resp_status != status.HTTP_200_OK:
+            return
+        try:
+            obj = model(**data)
+        except ValidationError as err:
+            # Ответ без обязательных полей модели считается промахом, а не ошибкой обработки запроса навыка
+            logger.warning('Invalid AsyncAPI response for %s: %s', url, err)
+            return
+        await self.cache.set(cache_key, obj, ttl=policy.hard_ttl, soft_ttl=policy.soft_ttl)
+        return obj
+
+    async def _prefetch(
+        self, cache_key: str, url: str, model: Type[ORJSONModel], policy: CachePolicy
+    ) -> Optional[ORJSONModel]:
+        try:
+            return await asyncio.wait_for(
+                self._load(cache_key, url, model, policy), timeout=settings.REQUEST.TIMEOUT
+            )
+        except asyncio.TimeoutError:
+            logger.debug('Prefetch timeout exceeded: %s', url)
+
+    def _revalidate(
+        self, cache_key: str, url: str, model: Type[ORJSONModel], policy: CachePolicy
+    ) -> None:
+        """Фоновое обновление устаревшей записи кеша. Для каждого ключа выполняется не более одного
+        обновления, при ошибке устаревшая запись продолжает отдаваться до истечения жесткого TTL.
+        """
+        if cache_key in self.revalidate_tasks:
+            return
+        task = asyncio.create_task(self._prefetch(cache_key, url, model, policy))
+        self.revalidate_tasks[cache_key] = task
+        task.add_done_callback(lambda done: self._revalidated(cache_key, done))
+        self.revalidate_stats['started'] += 1
 
-    async def safe_request(self, url: str, headers: dict):
+    def _revalidated(self, cache_key: str, task: asyncio.Task) -> None:
+        self.revalidate_tasks.pop(cache_key, None)
+        if task.cancelled() or task.exception() is not None or task.result() is None:
+            self.revalidate_stats['failed'] += 1
+
+    async def safe_request(self, url: str, headers: dict, deadline: Optional[Deadline] = None):
         """Метод ограничивающий время ожидания ответа от сервиса AsyncAPI.
         Ожидается что webhook ответит на запрос навыка Яндекс Диалоги в течение 3 секунд.
         https://yandex.ru/blog/dialogs/bolshe-vremeni-na-otvet-time-out-3-sekundy
         ES может отвечать на некоторые запросы существенно дольше, когда запрашиваемое имя персоны
         или наименование фильма отсутствуют в ES. В основном затрагивает запросы поиска по имени персоны
         или названию фильма.
+        Время ожидания ограничено как таймаутом одного запроса, так и временем, оставшимся до крайнего
+        срока обработки запроса навыка.
 
         :param url: строка URL.
         :param headers: словарь со значениями HTTP-заголовков.
+        :param deadline: крайний срок обработки запроса навыка.
         :return: кортеж из тела ответа в JSON и статус ответа.
         """
-        response_timeout = 2.5
-        background_tasks = set()
-        task = asyncio.create_task(self.request(url=url, headers=headers))
-        background_tasks.add(task)
-        task.add_done_callback(background_tasks.discard)
+        timeout = get_timeout(deadline, settings.REQUEST.TIMEOUT)
+        if timeout <= 0:
+            UPSTREAM_TIMEOUTS.labels(reason='deadline').inc()
+            return {}, status.HTTP_408_REQUEST_TIMEOUT
         try:
-            await asyncio.wait_for(asyncio.shield(task), timeout=response_timeout)
-            return task.result()
+            # request ожидает общий запрос через shield, поэтому по таймауту сам запрос не отменяется
+            return await asyncio.wait_for(self.request(url=url, headers=headers), timeout=timeout)
         except asyncio.TimeoutError:
+            UPSTREAM_TIMEOUTS.labels(reason='timeout').inc()
+            logger.warning('AsyncAPI response timeout %.2f s exceeded: %s', timeout, url)
             return {}, status.HTTP_408_REQUEST_TIMEOUT
 
     async def request(self, url: str, headers: dict):
+        """Метод выполнения GET-запроса к AsyncAPI.
+        Одновременные запросы с одинаковым URL объединяются: первый запрос выполняется, остальные ожидают
+        его результат. Это защищает AsyncAPI и ES от лавины одинаковых запросов, например к топу популярного жанра.
+
+        При разомкнутой цепи новые запросы не выполняются: ответ со статусом 503 возвращается сразу,
+        чтобы навык ответил из кеша или сообщил о недоступности каталога, не дожидаясь таймаута.
+
+        :param url: строка URL.
+        :param headers: словарь со значениями HTTP-заголовков.
+        :return: кортеж из тела ответа в JSON и статус ответа.
+        """
         logger.debug('URL before encode: %s', url)
         url = encode_uri(url)  # avoid cyrillic characters in urls
         logger.debug('URL after encode: %s', url)
-        async with self.session.get(url=url, headers=headers) as search_response:
-            resp_status = search_response.status
-            result = await search_response.json()
-            logger.debug('Response from AsyncAPI: %s', result)
-            return result, resp_status
-
-
-async def get_movies_data_search(
-    session: Awaitable[ClientSession] = Depends(get_session),
-) -> MoviesDataSearch:
-    if isinstance(session, abc.Awaitable):
-        session = await session
-    return MoviesDataSearch(session=session)
+        task = self.in_flight.get(url)
+        if task is None:
+            if not self.breaker.allow():
+                logger.debug('AsyncAPI circuit is open, request rejected: %s', url)
+                return {}, status.HTTP_503_SERVICE_UNAVAILABLE
+            task = asyncio.create_task(self._get(url=url, headers=headers))
+            self.breaker.watch(
+                task, is_failure=lambda result: result[1] >= status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+            self.in_flight[url] = task
+            task.add_done_callback(lambda _: self.in_flight.pop(url, None))
+        else:
+            self.deduplicated += 1
+            logger.debug('Join in-flight request: %s', url)
+        # shield не дает отмене одного из ожидающих отменить запрос для остальных
+        return await asyncio.shield(task)
+
+    async def _get(self, url: str, headers: dict):
+        started = time.perf_counter()
+        try:
+            async with self.session.get(url=url, headers=headers) as search_response:
+                resp_status = search_response.status
+                result = await search_response.json()
+                logger.debug('Response from AsyncAPI: %s', result)
+                return result, resp_status
+        except ClientError as err:
+            logger.error('Request to AsyncAPI failed: %s - %s', url, err)
+            return {}, status.HTTP_503_SERVICE_UNAVAILABLE
+        finally:
+            UPSTREAM_LATENCY.labels(endpoint=get_endpoint(urlsplit(url).path)).observe(
+                time.perf_counter() - started
+            )
+
+
+def create_movies_data_search(session: ClientSession) -> MoviesDataSearch:
+    """Создание сервиса поиска с общими для воркера кешами, снимками и предохранителем.
+    Вызывается один раз при старте приложения, запросы получают готовый экземпляр из состояния приложения.
+
+    :param session: сессия aiohttp для запросов к AsyncAPI.
+    :return: сервис поиска данных в AsyncAPI.
+    """
+    return MoviesDataSearch(
+        session=session,
+        cache=get_data_cache(),
+        slot_cache=get_slot_cache(),
+        snapshot=get_top_films_snapshot(),
+        title_index=get_title_index(),
+        breaker=get_circuit_breaker(),
+        last_known_good=get_last_known_good(),
+    )
+
+
+async def get_movies_data_search(request: Request) -> MoviesDataSearch:
+    return request.app.state.search_service
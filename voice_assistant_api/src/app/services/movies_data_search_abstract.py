@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import Optional, Sequence
 
 from app.models.base import ORJSONModel
+from app.utils.deadline import Deadline
 
 
 class MoviesDataSearchAbstract(ABC):
@@ -15,7 +16,8 @@ class MoviesDataSearchAbstract(ABC):
         page: int = 1,
         per_page: int = 5,
         in_description: bool = False,
-    ) -> ORJSONModel:
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения фильма или списка фильмов при поиске по наименованию или описанию фильма.
 
         :param query_string: строка поискового запроса.
@@ -24,23 +26,65 @@ class MoviesDataSearchAbstract(ABC):
         :param page: номер страницы, возвращаемой в результатах поиска.
         :param per_page: количество записей на странице.
         :param in_description: флаг поиска в описании (сюжете) фильма
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
         :return: фильм или список фильмов, сериализованные с помощью модели.
         """
         pass
 
     @abstractmethod
-    async def get_film_detail(self, film_id: str) -> ORJSONModel:
+    async def get_film_id(
+        self, film_name: str, deadline: Optional[Deadline] = None
+    ) -> Optional[str]:
+        """Метод получения UUID наиболее релевантного фильма по его названию.
+        Результат поиска, в том числе отсутствие фильма, кешируется по нормализованному названию.
+
+        :param film_name: название фильма из слота запроса пользователя.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
+        :return: уникальный идентификатор фильма или None, если фильм не найден.
+        """
+        pass
+
+    @abstractmethod
+    async def get_film_detail(
+        self,
+        film_id: str,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения детальной информации о фильме.
 
         :param film_id: уникальный идентификатор фильма.
-        :return: детальная информация о фильме, сериализованная с помощью модели.
+        :param fields: поля фильма, необходимые для ответа. По умолчанию запрашиваются все поля.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
+        :return: детальная информация о фильме, сериализованная с помощью модели, или None, если ответ
+            не получен.
+        """
+        pass
+
+    @abstractmethod
+    async def get_film_summary(
+        self, film_id: str, deadline: Optional[Deadline] = None
+    ) -> Optional[ORJSONModel]:
+        """Метод получения краткой информации о фильме: названия и рейтинга.
+        Использует ранее полученную детальную информацию или результат поиска фильма по названию,
+        запрос к AsyncAPI выполняется только при их отсутствии.
+
+        :param film_id: уникальный идентификатор фильма.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
+        :return: краткая информация о фильме, сериализованная с помощью модели, или None, если ответ
+            не получен.
         """
         pass
 
     @abstractmethod
     async def search_persons(
-        self, query_string: str, multiple: bool = False, page: int = 1, per_page: int = 5
-    ) -> ORJSONModel:
+        self,
+        query_string: str,
+        multiple: bool = False,
+        page: int = 1,
+        per_page: int = 5,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения списка персоны или списка персон при поиске по имени персоны.
 
         :param query_string: строка поискового запроса.
@@ -48,42 +92,126 @@ class MoviesDataSearchAbstract(ABC):
             возвращает наиболее релевантный (имеющий наибольший score) результат поиска.
         :param page: номер страницы, возвращаемой в результатах поиска.
         :param per_page: количество записей на странице.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
         :return: персона или список персон, сериализованные с помощью модели.
         """
         pass
 
     @abstractmethod
-    async def get_person_detail(self, person_id: str) -> ORJSONModel:
+    async def get_person_id(
+        self, person_name: str, deadline: Optional[Deadline] = None
+    ) -> Optional[str]:
+        """Метод получения UUID наиболее релевантной персоны по ее имени.
+        Результат поиска, в том числе отсутствие персоны, кешируется по нормализованному имени.
+
+        :param person_name: имя персоны из слота запроса пользователя.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
+        :return: уникальный идентификатор персоны или None, если персона не найдена.
+        """
+        pass
+
+    @abstractmethod
+    async def get_person_detail(
+        self,
+        person_id: str,
+        fields: Optional[Sequence[str]] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения детальной информации о персоне.
 
         :param person_id: уникальный идентификатор персоны.
-        :return: детальная информация о персоне, сериализованная с помощью модели.
+        :param fields: поля персоны, необходимые для ответа. По умолчанию запрашиваются все поля.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
+        :return: детальная информация о персоне, сериализованная с помощью модели, или None, если ответ
+            не получен.
         """
         pass
 
     @abstractmethod
     async def get_list_films(
-        self, genre: Optional[str] = None, page: int = 1, per_page: int = 5
-    ) -> ORJSONModel:
+        self,
+        genre: Optional[str] = None,
+        page: int = 1,
+        per_page: int = 5,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения списка фильмов, отсортированного в порядке убывания рейтинга, с возможностью фильтрации по
         жанру фильма.
 
         :param genre: жанр фильма для фильтрации по жанру.
         :param page: номер страницы, возвращаемой в результатах поиска.
         :param per_page: количество записей на странице.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
         :return: список фильмов, сериализованный с помощью модели.
         """
         pass
 
+    @abstractmethod
+    async def load_list_films(
+        self, genre: str = '', page: int = 1, per_page: int = 5
+    ) -> Optional[ORJSONModel]:
+        """Метод загрузки страницы списка фильмов из AsyncAPI в обход кеша.
+        Используется фоновым обновлением снимка топов фильмов.
+
+        :param genre: уникальный идентификатор жанра.
+        :param page: номер страницы, возвращаемой в результатах поиска.
+        :param per_page: количество записей на странице.
+        :return: список фильмов, сериализованный с помощью модели, или None, если ответ не получен.
+        """
+        pass
+
+    @abstractmethod
+    async def load_list_persons(self, page: int = 1, per_page: int = 100) -> Optional[ORJSONModel]:
+        """Метод загрузки страницы списка персон из AsyncAPI в обход кеша.
+        Используется фоновой синхронизацией локального индекса имен персон.
+
+        :param page: номер страницы, возвращаемой в результатах поиска.
+        :param per_page: количество записей на странице.
+        :return: список персон, сериализованный с помощью модели, или None, если ответ не получен.
+        """
+        pass
+
+    @abstractmethod
+    async def prefetch_list_films(self, genre: str = '', page: int = 1, per_page: int = 5) -> None:
+        """Метод фоновой загрузки страницы списка фильмов в кеш без ожидания результата.
+        Используется для следующей страницы топа фильмов, чтобы навигация "дальше" не ждала ответа AsyncAPI.
+        Количество одновременных загрузок ограничено, при превышении лимита загрузка пропускается.
+
+        :param genre: уникальный идентификатор жанра.
+        :param page: номер загружаемой страницы.
+        :param per_page: количество записей на странице.
+        """
+        pass
+
+    @abstractmethod
+    def cancel_prefetch(self) -> None:
+        """Метод отмены всех выполняющихся фоновых загрузок страниц списков фильмов."""
+        pass
+
+    @abstractmethod
+    def is_interrupted(self, deadline: Optional[Deadline] = None) -> bool:
+        """Метод проверки, что данные могли быть не получены из-за истечения времени на обработку запроса
+        или размыкания цепи запросов к AsyncAPI, а не из-за их отсутствия.
+
+        :param deadline: крайний срок обработки запроса навыка.
+        :return: True, если запросы к AsyncAPI прерваны или отклонены.
+        """
+        pass
+
     @abstractmethod
     async def get_list_films_by_person(
-        self, person_id: str, page: int = 1, per_page: int = 10
-    ) -> ORJSONModel:
+        self,
+        person_id: str,
+        page: int = 1,
+        per_page: int = 10,
+        deadline: Optional[Deadline] = None,
+    ) -> Optional[ORJSONModel]:
         """Метод получения списка фильмов c участием персоны.
 
         :param person_id: уникальный идентификатор персоны.
         :param page: номер страницы, возвращаемой в результатах поиска.
         :param per_page: количество записей на странице.
+        :param deadline: крайний срок обработки запроса навыка, ограничивающий время ожидания ответа.
         :return: список фильмов, сериализованные с помощью модели.
         """
         pass
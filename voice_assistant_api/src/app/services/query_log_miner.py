@@ -0,0 +1,342 @@
+import asyncio
+import logging
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Awaitable, Callable, NamedTuple, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo.errors import PyMongoError
+
+from app.core.config import settings
+from app.services.alice import intents
+from app.services.alice.fixtures import genres
+from app.services.alice.state import (
+    INTENT_CODES,
+    INTENTS_KEY,
+    PAGE_KEY,
+    SCENE_CODES,
+    SCENE_KEY,
+    UUID_KEYS,
+    decode_uuid,
+)
+from app.services.movies_data_search import MoviesDataSearch
+
+logger = logging.getLogger(__name__)
+
+# Коллекции журнала запросов навыка и путь к состоянию сессии с объектом разговора в их документах.
+# Ответ на нераспознанный запрос не содержит объект разговора, он есть только в состоянии запроса Алисы
+LOG_COLLECTIONS = {'alice_response': '$session_state', 'alice_fallback_request': '$state.session'}
+TOP_FILMS_SCENES = ['TopFilms', SCENE_CODES['TopFilms']]
+
+
+class PrewarmTarget(NamedTuple):
+    """Запись кеша, которую нужно прогреть, и количество запросов пользователей к ней за окно журнала."""
+
+    cache_key: str
+    count: int
+    load: Callable[[], Awaitable[Any]]
+
+
+def if_null(*expressions: Any) -> Any:
+    # $ifNull с несколькими аргументами появился только в MongoDB 5.0, поэтому выражения вкладываются
+    result = expressions[-1]
+    for expression in reversed(expressions[:-1]):
+        result = {'$ifNull': [expression, result]}
+    return result
+
+
+def state_field(state: str, compact_path: str, legacy_path: str) -> Any:
+    """Поле состояния сессии в компактном или прежнем виде."""
+    return if_null(f'{state}.{compact_path}', f'{state}.{legacy_path}', None)
+
+
+def top(field: str, limit: int) -> list[dict[str, Any]]:
+    return [
+        {'$match': {field: {'$ne': None}}},
+        {'$group': {'_id': f'${field}', 'count': {'$sum': 1}}},
+        {'$sort': {'count': -1}},
+        {'$limit': limit},
+    ]
+
+
+def get_pipeline(state: str, since: datetime, limit: int) -> list[dict[str, Any]]:
+    """Агрегация самых запрашиваемых фильмов, персон и страниц топов за скользящее окно.
+    Время записи берется из _id документа, поэтому окно выбирается по индексу _id без отдельного поля даты.
+
+    :param state: путь к состоянию сессии в документе журнала.
+    :param since: начало окна.
+    :param limit: количество результатов каждого вида.
+    :return: конвейер агрегации MongoDB.
+    """
+    genre_code = INTENT_CODES[intents.TOP_BY_GENRE]
+    return [
+        {'$match': {'_id': {'$gte': ObjectId.from_datetime(since)}}},
+        {
+            '$project': {
+                '_id': 0,
+                'film': state_field(state, UUID_KEYS['film_id'], 'film_id'),
+                'person': state_field(state, UUID_KEYS['person_id'], 'person_id'),
+                'scene': state_field(state, SCENE_KEY, 'scene'),
+                'page': state_field(state, PAGE_KEY, 'page'),
+                'genre': state_field(
+                    state,
+                    f'{INTENTS_KEY}.{genre_code}.type',
+                    f'last_intents.{intents.TOP_BY_GENRE}.slots.type.value',
+                ),
+            }
+        },
+        {
+            '$facet': {
+                'films': top('film', limit),
+                'persons': top('person', limit),
+                'pages': [
+                    {'$match': {'scene': {'$in': TOP_FILMS_SCENES}, 'page': {'$ne': None}}},
+                    {'$group': {'_id': {'genre': '$genre', 'page': '$page'}, 'count': {'$sum': 1}}},
+                    {'$sort': {'count': -1}},
+                    {'$limit': limit},
+                ],
+            }
+        },
+    ]
+
+
+def get_object_id(value: Any) -> Optional[str]:
+    """UUID фильма или персоны из состояния сессии в прежнем или компактном виде."""
+    if not isinstance(value, str):
+        return None
+    if len(value) == 36:
+        return value
+    try:
+        return decode_uuid(value)
+    except ValueError:
+        return None
+
+
+def get_genre_id(value: Optional[str]) -> Optional[str]:
+    """UUID жанра по значению слота топа по жанру. Общему топу по рейтингу соответствует пустая строка."""
+    if value is None:
+        return ''
+    genre = genres.get(value.replace('_', '-'))
+    return genre['uuid'] if genre else None
+
+
+class QueryLogMiner:
+    """Прогрев кешей по журналу запросов навыка в MongoDB.
+    Периодически находит фильмы, персоны и страницы топов, о которых чаще всего спрашивали пользователи
+    за скользящее окно, и загружает отсутствующие в кеше данные. Загрузка идет через AsyncAPI, поэтому
+    прогревается и его кеш. После первого прогрева после старта кеш процесса уже содержит то,
+    о чем спрашивают пользователи, а не заполняется их первыми запросами.
+    Каждый прогрев записывается в коллекцию отчетов: доля запросов окна, которые были бы обслужены
+    из кеша до и после прогрева, и доля попаданий в кеш данных с предыдущего прогрева.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        interval: float,
+        start_delay: float,
+        limit: int,
+        concurrency: int,
+        max_time: float,
+        report_collection: str,
+    ) -> None:
+        self.window = window
+        self.interval = interval
+        self.start_delay = start_delay
+        self.limit = limit
+        self.concurrency = concurrency
+        self.max_time = max_time
+        self.report_collection = report_collection
+        self.runs = 0
+        self.errors = 0
+        self.last_report: Optional[dict[str, Any]] = None
+        # Ключи кеша самых запрашиваемых объектов последнего прогрева в порядке убывания числа запросов
+        self.last_keys: list[str] = []
+        # Счетчики попаданий и промахов кеша данных на момент предыдущего прогрева
+        self._cache_counts: Optional[tuple[int, int]] = None
+
+    async def mine(self, db: AsyncIOMotorDatabase) -> dict[str, Counter]:
+        """Агрегация журнала запросов навыка по всем коллекциям журнала.
+
+        :param db: база данных MongoDB навыка.
+        :return: количество запросов по UUID фильмов и персон и по паре из UUID жанра и страницы топа.
+        """
+        since = datetime.now(timezone.utc) - timedelta(seconds=self.window)
+        demand = {'films': Counter(), 'persons': Counter(), 'pages': Counter()}
+        for collection, state in LOG_COLLECTIONS.items():
+            pipeline = get_pipeline(state, since, self.limit)
+            cursor = db[collection].aggregate(pipeline, maxTimeMS=int(self.max_time * 1000))
+            for result in await cursor.to_list(length=1):
+                for kind in ('films', 'persons'):
+                    for row in result[kind]:
+                        object_id = get_object_id(row['_id'])
+                        if object_id is not None:
+                            demand[kind][object_id] += row['count']
+                for row in result['pages']:
+                    genre_id = get_genre_id(row['_id'].get('genre'))
+                    page = row['_id'].get('page')
+                    if genre_id is not None and isinstance(page, int):
+                        demand['pages'][genre_id, page] += row['count']
+        return {kind: Counter(dict(counter.most_common(self.limit))) for kind, counter in demand.items()}
+
+    @staticmethod
+    def get_targets(
+        search_service: MoviesDataSearch, demand: dict[str, Counter]
+    ) -> list[PrewarmTarget]:
+        per_page = settings.APP.PER_PAGE
+        targets = []
+        for film_id, count in demand['films'].items():
+            targets.append(PrewarmTarget(
+                f'film:{film_id}',
+                count,
+                lambda film_id=film_id: search_service.get_film_detail(film_id=film_id),
+            ))
+        for person_id, count in demand['persons'].items():
+            targets.append(PrewarmTarget(
+                f'person:{person_id}',
+                count,
+                lambda person_id=person_id: search_service.get_person_detail(person_id=person_id),
+            ))
+            targets.append(PrewarmTarget(
+                f'person_films:{person_id}:1:{per_page}',
+                count,
+                lambda person_id=person_id: search_service.get_list_films_by_person(person_id=person_id),
+            ))
+        for (genre_id, page), count in demand['pages'].items():
+            # Страницы из снимка топов уже находятся в памяти
+            if search_service.snapshot.get(genre=genre_id, page=page, per_page=per_page) is not None:
+                continue
+            targets.append(PrewarmTarget(
+                f'films:{genre_id}:{page}:{per_page}',
+                count,
+                lambda genre_id=genre_id, page=page: search_service.get_list_films(
+                    genre=genre_id, page=page
+                ),
+            ))
+        return targets
+
+    async def prewarm(
+        self, search_service: MoviesDataSearch, targets: list[PrewarmTarget]
+    ) -> tuple[int, int]:
+        """Загрузка отсутствующих в кеше записей не более чем CONCURRENCY одновременными запросами.
+
+        :return: количество загруженных и не загруженных записей.
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def load(target: PrewarmTarget) -> bool:
+            async with semaphore:
+                return await target.load() is not None
+
+        results = await asyncio.gather(*(load(target) for target in targets))
+        loaded = sum(results)
+        return loaded, len(results) - loaded
+
+    @staticmethod
+    async def get_coverage(search_service: MoviesDataSearch, targets: list[PrewarmTarget]) -> float:
+        """Доля запросов окна журнала, данные для которых находятся в кеше."""
+        total = sum(target.count for target in targets)
+        if not total:
+            return 1.0
+        cached = 0
+        for target in targets:
+            if await search_service.cache.contains(target.cache_key):
+                cached += target.count
+        return cached / total
+
+    def get_interval_hit_rate(self, search_service: MoviesDataSearch) -> Optional[float]:
+        """Доля попаданий в кеш данных процесса с предыдущего прогрева."""
+        stats = search_service.cache.get_stats()
+        counts = stats['hits'], stats['misses']
+        previous, self._cache_counts = self._cache_counts, counts
+        if previous is None:
+            return None
+        hits, misses = counts[0] - previous[0], counts[1] - previous[1]
+        return hits / (hits + misses) if hits + misses else None
+
+    async def refresh(
+        self, db: AsyncIOMotorDatabase, search_service: MoviesDataSearch
+    ) -> dict[str, Any]:
+        """Один прогрев кеша по журналу запросов навыка с записью отчета в MongoDB.
+
+        :param db: база данных MongoDB навыка.
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        :return: отчет о прогреве.
+        """
+        started = time.perf_counter()
+        demand = await self.mine(db)
+        targets = self.get_targets(search_service, demand)
+        self.last_keys = [target.cache_key for target in sorted(targets, key=lambda target: -target.count)]
+        coverage_before = await self.get_coverage(search_service, targets)
+        missing = [
+            target for target in targets if not await search_service.cache.contains(target.cache_key)
+        ]
+        loaded, failed = await self.prewarm(search_service, missing)
+        report = {
+            'window': self.window,
+            'films': len(demand['films']),
+            'persons': len(demand['persons']),
+            'pages': len(demand['pages']),
+            'requests': sum(sum(counter.values()) for counter in demand.values()),
+            'loaded': loaded,
+            'failed': failed,
+            'coverage_before': coverage_before,
+            'coverage_after': await self.get_coverage(search_service, targets),
+            'interval_hit_rate': self.get_interval_hit_rate(search_service),
+            'duration': time.perf_counter() - started,
+        }
+        self.runs += 1
+        self.last_report = report
+        try:
+            await db[self.report_collection].insert_one({'_id': ObjectId(), **report})
+        except PyMongoError:
+            logger.exception('Failed to save cache prewarm report')
+        logger.info(
+            'Cache prewarmed from query log: %s entries loaded, coverage %.2f -> %.2f',
+            loaded,
+            report['coverage_before'],
+            report['coverage_after'],
+        )
+        return report
+
+    async def run(self, db: AsyncIOMotorDatabase, search_service: MoviesDataSearch) -> None:
+        """Фоновый прогрев кеша вскоре после старта приложения и далее с заданным интервалом.
+
+        :param db: база данных MongoDB навыка.
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        """
+        await asyncio.sleep(self.start_delay)
+        while True:
+            try:
+                await self.refresh(db, search_service)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception('Cache prewarm from query log failed')
+            await asyncio.sleep(self.interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'window': self.window,
+            'interval': self.interval,
+            'runs': self.runs,
+            'errors': self.errors,
+            'last_report': self.last_report,
+        }
+
+
+@lru_cache()
+def get_query_log_miner() -> QueryLogMiner:
+    return QueryLogMiner(
+        window=settings.PREWARM.WINDOW,
+        interval=settings.PREWARM.INTERVAL,
+        start_delay=settings.PREWARM.START_DELAY,
+        limit=settings.PREWARM.LIMIT,
+        concurrency=settings.PREWARM.CONCURRENCY,
+        max_time=settings.PREWARM.MAX_TIME,
+        report_collection=settings.PREWARM.REPORT_COLLECTION,
+    )
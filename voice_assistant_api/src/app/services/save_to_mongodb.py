@@ -1,29 +1,294 @@
+import asyncio
 import logging
-from typing import Any
+import time
+from collections import defaultdict, deque
+from typing import Any, Optional
 
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
 from pymongo import WriteConcern
+from pymongo.errors import BulkWriteError, PyMongoError
 from starlette.requests import Request
 
+from app.db.spool import DiskSpool, Record
+from app.utils.metrics import MONGO_LAG
+
 logger = logging.getLogger(__name__)
 
+# Код ошибки MongoDB при вставке документа с уже существующим _id
+DUPLICATE_KEY_ERROR = 11000
+
+
+class MongoBatchWriter:
+    """Буферизованная запись запросов навыка и ответов на них в MongoDB.
+    Документы накапливаются в ограниченной очереди и записываются пачками через insert_many,
+    когда набирается batch_size документов или проходит flush_interval секунд с первого документа пачки.
+    При переполнении очереди новые документы отбрасываются, чтобы медленная MongoDB не увеличивала
+    потребление памяти и время ответа навыка.
+    Если запись в MongoDB завершается ошибкой или превышает порог времени error_threshold раз подряд,
+    writer переходит в режим деградации и пишет пачки в локальный спул. Фоновая задача периодически
+    проверяет доступность MongoDB и после восстановления воспроизводит спул в исходные коллекции.
+    """
+
+    def __init__(
+        self,
+        db: AsyncIOMotorDatabase,
+        spool: DiskSpool,
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+        write_timeout: float,
+        latency_threshold: float,
+        error_threshold: int,
+        retry_interval: float,
+    ) -> None:
+        self.db = db
+        self.spool = spool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.write_timeout = write_timeout
+        self.latency_threshold = latency_threshold
+        self.error_threshold = error_threshold
+        self.retry_interval = retry_interval
+        self.queue: asyncio.Queue[Record] = asyncio.Queue(maxsize=queue_size)
+        self.degraded = False
+        self.failures = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.written = 0
+        self.failed = 0
+        self.batches = 0
+        self.batch_latency_total = 0.0
+        self.batch_latency_max = 0.0
+        self.last_batch_latency = 0.0
+        self._dropping = False
+        self._batch: list[Record] = []
+        # Время постановки в очередь документов очереди и накапливаемой пачки в порядке очереди
+        self._enqueued_at: deque[float] = deque()
+        self.lag_last = 0.0
+        self.lag_max = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._write_task: Optional[asyncio.Task] = None
+        self._recovery_task: Optional[asyncio.Task] = None
+
+    def put(self, collection: str, document: dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait((collection, document))
+            self._enqueued_at.append(time.monotonic())
+            self._dropping = False
+        except asyncio.QueueFull:
+            self.dropped += 1
+            if not self._dropping:
+                # Сообщение пишется один раз на каждый период переполнения очереди
+                logger.warning('MongoDB write queue is full, documents are dropped')
+                self._dropping = True
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self.run())
+        self._recovery_task = asyncio.create_task(self.recover())
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch.append(await self.queue.get())
+            flush_at = loop.time() + self.flush_interval
+            while len(self._batch) < self.batch_size:
+                timeout = flush_at - loop.time()
+                if timeout <= 0 or not await self._get_next(timeout):
+                    break
+            batch, self._batch = self._batch, []
+            enqueued_at = self._pop_enqueued(len(batch))
+            # Отмена при остановке приложения не должна прерывать уже начатую запись пачки
+            self._write_task = asyncio.create_task(self.write(batch, enqueued_at))
+            try:
+                await asyncio.shield(self._write_task)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                # Ошибка одной пачки, например переполнение диска при записи в спул или документ,
+                # который нельзя сериализовать в BSON, не должна останавливать запись следующих пачек
+                self.failed += len(batch)
+                logger.exception('Failed to write batch of %s documents', len(batch))
+
+    async def _get_next(self, timeout: float) -> bool:
+        # wait_for может поглотить отмену задачи при одновременном получении документа,
+        # поэтому ожидание очереди реализовано через wait с явной обработкой отмены
+        getter = asyncio.ensure_future(self.queue.get())
+        try:
+            await asyncio.wait({getter}, timeout=timeout)
+        finally:
+            if getter.done() and not getter.cancelled():
+                self._batch.append(getter.result())
+            else:
+                getter.cancel()
+        return getter.done() and not getter.cancelled()
+
+    async def close(self) -> None:
+        """Остановка фоновой записи с записью всех накопленных документов."""
+        if self._recovery_task is not None:
+            self._recovery_task.cancel()
+            await asyncio.gather(self._recovery_task, return_exceptions=True)
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._write_task is not None:
+            await asyncio.gather(self._write_task, return_exceptions=True)
+        batch, self._batch = self._batch, []
+        while not self.queue.empty():
+            batch.append(self.queue.get_nowait())
+        if batch:
+            await self.write(batch, self._pop_enqueued(len(batch)))
+
+    def _pop_enqueued(self, count: int) -> Optional[float]:
+        # Документы пачки взяты из начала очереди, первый из них - самый старый
+        enqueued_at = self._enqueued_at[0] if self._enqueued_at else None
+        for _ in range(min(count, len(self._enqueued_at))):
+            self._enqueued_at.popleft()
+        return enqueued_at
+
+    async def write(self, batch: list[Record], enqueued_at: Optional[float] = None) -> None:
+        """Запись пачки документов в MongoDB или, в режиме деградации, в локальный спул.
+
+        :param batch: список пар из имени коллекции и документа.
+        :param enqueued_at: время постановки в очередь самого старого документа пачки по time.monotonic.
+        """
+        started = time.perf_counter()
+        if self.degraded:
+            await self.spool.append(batch)
+            return
+        failed = await self.insert(batch)
+        latency = time.perf_counter() - started
+        if failed:
+            self.failed += len(failed)
+            await self.spool.append(failed)
+        if failed or latency > self.latency_threshold:
+            self._register_failure()
+        else:
+            self.failures = 0
+        self.batches += 1
+        self.batch_latency_total += latency
+        self.batch_latency_max = max(self.batch_latency_max, latency)
+        self.last_batch_latency = latency
+        if enqueued_at is not None and not failed:
+            # Отставание журнала: сколько самый старый документ пачки ждал записи в MongoDB
+            self.lag_last = time.monotonic() - enqueued_at
+            self.lag_max = max(self.lag_max, self.lag_last)
+            MONGO_LAG.observe(self.lag_last)
+        logger.debug('Saved batch of %s documents to MongoDB in %.3f s', len(batch), latency)
+
+    async def insert(self, batch: list[Record]) -> list[Record]:
+        """Вставка пачки документов в коллекции MongoDB.
+
+        :param batch: список пар из имени коллекции и документа.
+        :return: документы, которые не удалось записать.
+        """
+        documents = defaultdict(list)
+        for collection, document in batch:
+            documents[collection].append(document)
+        failed = []
+        for collection, collection_documents in documents.items():
+            try:
+                await asyncio.wait_for(
+                    self._insert_many(collection, collection_documents), timeout=self.write_timeout
+                )
+                self.written += len(collection_documents)
+            except (PyMongoError, asyncio.TimeoutError) as err:
+                logger.error(
+                    'Save %s documents in collection [%s] MongoDB failed: %r',
+                    len(collection_documents),
+                    collection,
+                    err,
+                )
+                failed.extend((collection, document) for document in collection_documents)
+        return failed
+
+    async def _insert_many(self, collection: str, documents: list[dict[str, Any]]) -> None:
+        try:
+            await (
+                self.db[collection]
+                .with_options(write_concern=WriteConcern(w='majority'))
+                .insert_many(documents, ordered=False)
+            )
+        except BulkWriteError as err:
+            # Документы из спула могли быть частично записаны до сбоя, их повторная вставка не ошибка
+            write_errors = err.details.get('writeErrors', [])
+            if any(error['code'] != DUPLICATE_KEY_ERROR for error in write_errors):
+                raise
+
+    def _register_failure(self) -> None:
+        self.failures += 1
+        if not self.degraded and self.failures >= self.error_threshold:
+            self.degraded = True
+            logger.warning('MongoDB is unavailable or slow, webhook logs are written to local spool')
+
+    async def recover(self) -> None:
+        """Периодическая проверка доступности MongoDB и воспроизведение спула."""
+        while True:
+            try:
+                await self._recover()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception('Local spool recovery failed')
+            await asyncio.sleep(self.retry_interval)
+
+    async def _recover(self) -> None:
+        if not (self.degraded or self.spool.size):
+            return
+        try:
+            await asyncio.wait_for(self.db.command('ping'), timeout=self.write_timeout)
+        except (PyMongoError, asyncio.TimeoutError):
+            logger.debug('MongoDB is still unavailable')
+            return
+        if self.degraded:
+            logger.info('MongoDB is available again, replaying local spool')
+        self.degraded = False
+        self.failures = 0
+        await self.replay()
+
+    async def replay(self) -> None:
+        reader = await self.spool.open_replay()
+        if reader is None:
+            return
+        completed = False
+        try:
+            while True:
+                records = await asyncio.to_thread(reader.read, self.batch_size)
+                if not records:
+                    completed = reader.corrupted_offset is None
+                    break
+                if await self.insert(records):
+                    self._register_failure()
+                    break
+                reader.commit()
+                self.replayed += len(records)
+        finally:
+            await self.spool.close_replay(reader, completed)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'queue_depth': self.queue.qsize(),
+            'queue_size': self.queue.maxsize,
+            'dropped': self.dropped,
+            'written': self.written,
+            'failed': self.failed,
+            'batches': self.batches,
+            'batch_latency_avg': self.batch_latency_total / self.batches if self.batches else 0.0,
+            'batch_latency_max': self.batch_latency_max,
+            'batch_latency_last': self.last_batch_latency,
+            'lag_last': self.lag_last,
+            'lag_max': self.lag_max,
+            'degraded': self.degraded,
+            'replayed': self.replayed,
+            'spool': self.spool.get_stats(),
+        }
+
 
-async def save_doc(
+def save_doc(
     request: Request, event: dict[str, Any], response: dict[str, Any], collection: str
 ) -> None:
-    if not request.app.mongodb:
+    writer: Optional[MongoBatchWriter] = getattr(request.app, 'mongodb_writer', None)
+    if writer is None:
         return
-    resp_with_request = response.copy()
-    resp_with_request.update(event)
-    save_request = await (
-        request.app.mongodb[collection]
-        .with_options(write_concern=WriteConcern(w='majority'))
-        .insert_one(resp_with_request)
-    )
-    if save_request.acknowledged:
-        logger.info(
-            'Save in collection [%s] MongoDB with ObjectId [%s] response %s to the request %s',
-            collection,
-            save_request.inserted_id,
-            response,
-            event,
-        )
+    # _id задается заранее, чтобы повторная запись документа из локального спула не создала дубликат
+    writer.put(collection, {'_id': ObjectId(), **response, **event})
@@ -0,0 +1,253 @@
+from typing import Any, Iterator, Optional
+
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, Metric
+
+from app.core.config import settings
+from app.db.cache.memory import get_response_cache
+from app.services.alice.state import get_state_codec
+from app.services.image_storage import get_image_storage
+from app.services.movies_data_search import MoviesDataSearch
+from app.services.query_log_miner import get_query_log_miner
+from app.services.save_to_mongodb import MongoBatchWriter
+
+CACHE_COUNTERS = ('hits', 'misses', 'stale_hits', 'evictions', 'expirations')
+CACHE_GAUGES = ('items', 'memory')
+
+
+def counter(name: str, documentation: str, value: float) -> CounterMetricFamily:
+    return CounterMetricFamily(name, documentation, value=value)
+
+
+def gauge(name: str, documentation: str, value: float) -> GaugeMetricFamily:
+    return GaugeMetricFamily(name, documentation, value=value)
+
+
+class StatsCollector:
+    """Экспорт в Prometheus счетчиков, которые сервисы навыка уже ведут для эндпоинтов отладки.
+    Значения читаются из get_stats сервисов только при запросе метрик, поэтому сбор не добавляет
+    работы на обработку запросов навыка.
+    """
+
+    def __init__(
+        self, search_service: MoviesDataSearch, writer: Optional[MongoBatchWriter] = None
+    ) -> None:
+        self.search_service = search_service
+        self.writer = writer
+
+    def collect(self) -> Iterator[Metric]:
+        yield gauge(
+            'voice_response_timeout_seconds',
+            'Время на обработку запроса навыка до ответа по умолчанию',
+            settings.APP.RESPONSE_TIMEOUT,
+        )
+        yield from self.collect_caches()
+        yield from self.collect_requests()
+        yield from self.collect_breaker()
+        yield from self.collect_background()
+        yield from self.collect_state()
+        yield from self.collect_images()
+        yield from self.collect_prewarm()
+        yield from self.collect_last_known_good()
+        if self.writer is not None:
+            yield from self.collect_mongo()
+
+    def collect_caches(self) -> Iterator[Metric]:
+        caches: dict[str, dict[str, Any]] = {
+            'data': self.search_service.cache.get_stats(),
+            'slots': self.search_service.slot_cache.get_stats(),
+            'responses': get_response_cache().get_stats(),
+            'phrases': get_state_codec().phrases.get_stats(),
+            'images': get_image_storage().images.get_stats(),
+        }
+        redis = caches['data'].pop('redis', None)
+        families = {
+            name: CounterMetricFamily(
+                f'voice_cache_{name}', f'Счетчик {name} кеша процесса', labels=['cache']
+            )
+            for name in CACHE_COUNTERS
+        }
+        families.update({
+            name: GaugeMetricFamily(
+                f'voice_cache_{name}', f'Текущее значение {name} кеша процесса', labels=['cache']
+            )
+            for name in CACHE_GAUGES
+        })
+        for cache, stats in caches.items():
+            for name, family in families.items():
+                family.add_metric([cache], stats.get(name, 0))
+        yield from families.values()
+        if redis is not None:
+            redis_family = CounterMetricFamily(
+                'voice_redis_cache', 'Счетчики запросов к кешу Redis', labels=['result']
+            )
+            for name in ('hits', 'misses', 'errors'):
+                redis_family.add_metric([name], redis[name])
+            yield redis_family
+
+    def collect_requests(self) -> Iterator[Metric]:
+        search_service = self.search_service
+        yield gauge(
+            'voice_asyncapi_in_flight',
+            'Количество выполняющихся запросов к AsyncAPI',
+            len(search_service.in_flight),
+        )
+        yield counter(
+            'voice_asyncapi_deduplicated',
+            'Количество запросов, объединенных с уже выполняющимся запросом',
+            search_service.deduplicated,
+        )
+        background_stats = {
+            'prefetch': search_service.prefetch_stats,
+            'revalidate': search_service.revalidate_stats,
+        }
+        for name, stats in background_stats.items():
+            family = CounterMetricFamily(
+                f'voice_{name}', f'Счетчики фоновых задач {name}', labels=['result']
+            )
+            for result, value in stats.items():
+                family.add_metric([result], value)
+            yield family
+
+    def collect_breaker(self) -> Iterator[Metric]:
+        stats = self.search_service.breaker.get_stats()
+        state = GaugeMetricFamily(
+            'voice_breaker_state', 'Текущее состояние размыкателя цепи', labels=['state']
+        )
+        for name in ('closed', 'open', 'half_open'):
+            state.add_metric([name], int(stats['state'] == name))
+        yield state
+        yield counter(
+            'voice_breaker_rejected', 'Количество отклоненных размыкателем запросов', stats['rejected']
+        )
+        transitions = CounterMetricFamily(
+            'voice_breaker_transitions',
+            'Количество переходов между состояниями цепи',
+            labels=['transition'],
+        )
+        for transition, value in stats['transitions'].items():
+            transitions.add_metric([transition], value)
+        yield transitions
+
+    def collect_background(self) -> Iterator[Metric]:
+        snapshot = self.search_service.snapshot.get_stats()
+        if snapshot['age'] is not None:
+            yield gauge('voice_snapshot_age_seconds', 'Возраст снимка топов фильмов', snapshot['age'])
+        yield counter(
+            'voice_snapshot_refreshes', 'Количество обновлений снимка топов', snapshot['refreshes']
+        )
+        yield counter(
+            'voice_snapshot_errors', 'Количество ошибок обновления снимка топов', snapshot['errors']
+        )
+        title_index = self.search_service.title_index.get_stats()
+        lookups = CounterMetricFamily(
+            'voice_title_index_lookups',
+            'Количество поисков UUID в локальном индексе названий',
+            labels=['result'],
+        )
+        lookups.add_metric(['hit'], title_index['hits'])
+        lookups.add_metric(['miss'], title_index['misses'])
+        yield lookups
+        names = GaugeMetricFamily(
+            'voice_title_index_names', 'Количество названий в индексе', labels=['index']
+        )
+        names.add_metric(['films'], title_index['films']['names'])
+        names.add_metric(['persons'], title_index['persons']['names'])
+        yield names
+
+    def collect_state(self) -> Iterator[Metric]:
+        stats = get_state_codec().get_stats()
+        yield counter('voice_state_turns', 'Количество закодированных состояний сессии', stats['turns'])
+        size = CounterMetricFamily(
+            'voice_state_bytes', 'Суммарный размер состояний сессии в байтах', labels=['encoding']
+        )
+        size.add_metric(['legacy'], stats['legacy_bytes'])
+        size.add_metric(['compact'], stats['compact_bytes'])
+        yield size
+
+    def collect_images(self) -> Iterator[Metric]:
+        stats = get_image_storage().get_stats()
+        uploads = CounterMetricFamily(
+            'voice_image_uploads', 'Количество фоновых загрузок постеров в навык', labels=['result']
+        )
+        for result in ('uploaded', 'failed', 'skipped'):
+            uploads.add_metric([result], stats[result])
+        yield uploads
+        yield gauge(
+            'voice_image_uploads_in_flight', 'Количество выполняющихся загрузок постеров', stats['in_flight']
+        )
+        yield counter(
+            'voice_image_lookup_timeouts',
+            'Количество карточек, показанных без постеров из-за истечения времени на ответ',
+            stats['timeouts'],
+        )
+
+    def collect_prewarm(self) -> Iterator[Metric]:
+        stats = get_query_log_miner().get_stats()
+        yield counter('voice_prewarm_runs', 'Количество прогревов кеша по журналу запросов', stats['runs'])
+        yield counter('voice_prewarm_errors', 'Количество ошибок прогрева кеша', stats['errors'])
+        report = stats['last_report']
+        if report is None:
+            return
+        coverage = GaugeMetricFamily(
+            'voice_prewarm_coverage',
+            'Доля запросов окна журнала, обслуживаемых из кеша, до и после последнего прогрева',
+            labels=['stage'],
+        )
+        coverage.add_metric(['before'], report['coverage_before'])
+        coverage.add_metric(['after'], report['coverage_after'])
+        yield coverage
+        if report['interval_hit_rate'] is not None:
+            yield gauge(
+                'voice_prewarm_interval_hit_rate',
+                'Доля попаданий в кеш данных между двумя последними прогревами',
+                report['interval_hit_rate'],
+            )
+
+    def collect_last_known_good(self) -> Iterator[Metric]:
+        stats = self.search_service.last_known_good.get_stats()
+        yield gauge(
+            'voice_degraded_mode',
+            'Режим деградации: 1, если цепь запросов к AsyncAPI разомкнута',
+            int(stats['degraded']),
+        )
+        yield counter(
+            'voice_last_known_good_served',
+            'Количество объектов, отданных из снимка на диске',
+            stats['served'],
+        )
+        yield counter(
+            'voice_last_known_good_saves', 'Количество сохранений снимка на диске', stats['saves']
+        )
+        snapshot = stats['snapshot']
+        yield gauge(
+            'voice_last_known_good_items', 'Количество объектов в снимке на диске', snapshot['items']
+        )
+        if snapshot['age'] is not None:
+            yield gauge(
+                'voice_last_known_good_age_seconds', 'Возраст снимка на диске в секундах', snapshot['age']
+            )
+
+    def collect_mongo(self) -> Iterator[Metric]:
+        stats = self.writer.get_stats()
+        yield gauge(
+            'voice_mongo_queue_depth', 'Количество документов в очереди записи', stats['queue_depth']
+        )
+        documents = CounterMetricFamily(
+            'voice_mongo_documents',
+            'Количество документов журнала по результату записи',
+            labels=['result'],
+        )
+        for result in ('written', 'dropped', 'failed', 'replayed'):
+            documents.add_metric([result], stats[result])
+        yield documents
+        yield gauge(
+            'voice_mongo_degraded', 'Запись журнала в локальный спул вместо MongoDB', int(stats['degraded'])
+        )
+        yield gauge(
+            'voice_mongo_spool_bytes', 'Размер локального спула в байтах', stats['spool']['size']
+        )
+        yield counter(
+            'voice_mongo_spool_corrupted',
+            'Количество воспроизведений спула, остановленных поврежденной записью',
+            stats['spool']['corrupted'],
+        )
@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import re
+import time
+from collections import Counter, defaultdict
+from functools import lru_cache
+from typing import Any, Callable, Iterable, Optional
+
+from app.core.config import settings
+from app.models.base import BaseFilmModel
+from app.models.models import APIBaseItemsList, APIPersonDetail
+from app.services.movies_data_search_abstract import MoviesDataSearchAbstract
+from app.utils.text import normalize_query
+
+logger = logging.getLogger(__name__)
+
+# Максимальное количество документов, доступное постраничным запросом к ES (index.max_result_window)
+MAX_RESULT_WINDOW = 10000
+
+# Маркер названия, которое носят несколько разных фильмов или персон
+AMBIGUOUS = ''
+
+ROMAN_NUMERAL = re.compile(r'm{0,3}(cm|cd|d?c{0,3})(xc|xl|l?x{0,3})(ix|iv|v?i{0,3})')
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10, 'l': 50, 'c': 100, 'd': 500, 'm': 1000}
+
+
+def get_trigrams(text: str) -> set[str]:
+    padded = f'  {text} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def get_similarity(first: str, second: str) -> float:
+    """Схожесть строк от 0 до 1 на основе расстояния Левенштейна, отнесенного к длине более длинной строки."""
+    if first == second:
+        return 1.0
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (first_char != second_char))
+            )
+        previous = current
+    return 1 - previous[-1] / len(first)
+
+
+def get_roman_value(numeral: str) -> int:
+    values = [ROMAN_VALUES[char] for char in numeral]
+    return sum(-value if value < next_value else value for value, next_value in zip(values, values[1:] + [0]))
+
+
+def get_numbers(text: str) -> list[int]:
+    """Числа из арабских и римских цифр в нормализованном тексте в порядке возрастания.
+    Названия частей фильма отличаются только номером, поэтому нечеткое совпадение с другим номером
+    не принимается.
+    """
+    numbers = []
+    for token in re.findall(r'\w+', text):
+        if token.isdigit():
+            numbers.append(int(token))
+        elif ROMAN_NUMERAL.fullmatch(token):
+            numbers.append(get_roman_value(token))
+    return sorted(numbers)
+
+
+class FuzzyIndex:
+    """Индекс нечеткого поиска UUID по нормализованным названиям фильмов или именам персон.
+    Кандидаты отбираются по количеству общих триграмм с запросом, лучший из них определяется по расстоянию
+    Левенштейна. Кандидаты, числа в названии которых не совпадают с числами запроса, отбрасываются.
+    """
+
+    def __init__(self, max_candidates: int) -> None:
+        self.max_candidates = max_candidates
+        self._ids: dict[str, str] = {}
+        self._trigrams: defaultdict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def add(self, object_id: str, *names: str) -> None:
+        for name in names:
+            name = normalize_query(name or '')
+            known_id = self._ids.get(name)
+            if not name or known_id == object_id or known_id == AMBIGUOUS:
+                continue
+            if known_id is not None:
+                # Для одинаковых названий разных фильмов выбор остается за полнотекстовым поиском ES
+                self._ids[name] = AMBIGUOUS
+                continue
+            self._ids[name] = object_id
+            for trigram in get_trigrams(name):
+                self._trigrams[trigram].add(name)
+
+    def search(self, query: str) -> tuple[Optional[str], float]:
+        """Поиск UUID по названию или имени.
+
+        :param query: название фильма или имя персоны из слота запроса навыка.
+        :return: кортеж из UUID наиболее похожего объекта и оценки схожести от 0 до 1.
+        """
+        query = normalize_query(query)
+        object_id = self._ids.get(query)
+        if object_id is not None:
+            return object_id or None, 1.0 if object_id else 0.0
+        counts = Counter()
+        for trigram in get_trigrams(query):
+            counts.update(self._trigrams.get(trigram, ()))
+        numbers = get_numbers(query)
+        best_id, best_score = None, 0.0
+        for name, _ in counts.most_common(self.max_candidates):
+            object_id = self._ids[name]
+            if not object_id or get_numbers(name) != numbers:
+                continue
+            score = get_similarity(query, name)
+            if score > best_score:
+                best_id, best_score = object_id, score
+        return best_id, best_score
+
+    def get_stats(self) -> dict[str, Any]:
+        return {'names': len(self._ids), 'trigrams': len(self._trigrams)}
+
+
+class TitleIndex:
+    """Локальный индекс названий фильмов и имен персон для определения UUID по слотам запроса навыка.
+    Индекс заполняется в фоне постранично из списков фильмов и персон AsyncAPI и дополняется результатами
+    поиска ES. Если оценка схожести ниже min_score, UUID определяется поиском ES.
+    """
+
+    def __init__(
+        self,
+        min_score: float,
+        max_candidates: int,
+        page_size: int,
+        sync_interval: float,
+        resync_interval: float,
+    ) -> None:
+        self.min_score = min_score
+        self.page_size = page_size
+        self.sync_interval = sync_interval
+        self.resync_interval = resync_interval
+        self.films = FuzzyIndex(max_candidates)
+        self.persons = FuzzyIndex(max_candidates)
+        # Номер следующей загружаемой страницы, None после загрузки последней страницы
+        self.pages: dict[str, Optional[int]] = {'films': 1, 'persons': 1}
+        self.passes = 0
+        self.errors = 0
+        self.hits = 0
+        self.misses = 0
+        self.lookup_time_total = 0.0
+
+    def find_film(self, film_name: str) -> Optional[str]:
+        return self._find(self.films, film_name)
+
+    def find_person(self, person_name: str) -> Optional[str]:
+        return self._find(self.persons, person_name)
+
+    def _find(self, index: FuzzyIndex, query: str) -> Optional[str]:
+        started = time.perf_counter()
+        object_id, score = index.search(query)
+        self.lookup_time_total += time.perf_counter() - started
+        if object_id is None or score < self.min_score:
+            self.misses += 1
+            return
+        self.hits += 1
+        return object_id
+
+    def add_films(self, films: Iterable[BaseFilmModel]) -> None:
+        for film in films:
+            self.films.add(str(film.uuid), film.title, film.title_ru)
+
+    def add_persons(self, persons: Iterable[APIPersonDetail]) -> None:
+        for person in persons:
+            self.persons.add(str(person.uuid), person.full_name, person.full_name_ru)
+
+    async def sync(self, search_service: MoviesDataSearchAbstract) -> bool:
+        """Загрузка очередной страницы списков фильмов и персон.
+
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        :return: True, если загружены все страницы обоих списков.
+        """
+        films_page, persons_page = self.pages['films'], self.pages['persons']
+        films, persons = await asyncio.gather(
+            search_service.load_list_films(page=films_page, per_page=self.page_size)
+            if films_page else asyncio.sleep(0),
+            search_service.load_list_persons(page=persons_page, per_page=self.page_size)
+            if persons_page else asyncio.sleep(0),
+        )
+        if films_page:
+            self._sync_page('films', films, self.add_films)
+        if persons_page:
+            self._sync_page('persons', persons, self.add_persons)
+        return self.pages['films'] is None and self.pages['persons'] is None
+
+    def _sync_page(
+        self, name: str, objects: Optional[APIBaseItemsList], add: Callable[[Iterable], None]
+    ) -> None:
+        if objects is None:
+            # Страница будет запрошена повторно при следующей синхронизации
+            self.errors += 1
+            return
+        add(objects.items)
+        page = self.pages[name]
+        total = min(objects.total, MAX_RESULT_WINDOW)
+        self.pages[name] = page + 1 if objects.items and page * self.page_size < total else None
+
+    async def run(self, search_service: MoviesDataSearchAbstract) -> None:
+        """Фоновая синхронизация индекса: страница каждого списка за sync_interval секунд,
+        повторный проход по спискам через resync_interval секунд после завершения предыдущего.
+
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        """
+        while True:
+            try:
+                completed = await self.sync(search_service)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                completed = False
+                self.errors += 1
+                logger.exception('Title index sync failed')
+            if completed:
+                self.passes += 1
+                self.pages = {'films': 1, 'persons': 1}
+                logger.info(
+                    'Title index synced: %s film titles, %s person names', len(self.films), len(self.persons)
+                )
+                await asyncio.sleep(self.resync_interval)
+            else:
+                await asyncio.sleep(self.sync_interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            'films': self.films.get_stats(),
+            'persons': self.persons.get_stats(),
+            'pages': self.pages,
+            'passes': self.passes,
+            'errors': self.errors,
+            'hits': self.hits,
+            'misses': self.misses,
+            'lookup_time_avg': self.lookup_time_total / lookups if lookups else 0.0,
+        }
+
+
+@lru_cache()
+def get_title_index() -> TitleIndex:
+    return TitleIndex(
+        min_score=settings.TITLE_INDEX.MIN_SCORE,
+        max_candidates=settings.TITLE_INDEX.MAX_CANDIDATES,
+        page_size=settings.TITLE_INDEX.PAGE_SIZE,
+        sync_interval=settings.TITLE_INDEX.SYNC_INTERVAL,
+        resync_interval=settings.TITLE_INDEX.RESYNC_INTERVAL,
+    )
@@ -0,0 +1,114 @@
+import asyncio
+import logging
+import time
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+from app.core.config import settings
+from app.models.models import APIFilmsList
+from app.services.alice.fixtures import genres
+from app.services.movies_data_search_abstract import MoviesDataSearchAbstract
+
+logger = logging.getLogger(__name__)
+
+
+class TopFilmsSnapshot:
+    """Снимок первых страниц топа фильмов по каждому жанру и общего топа по рейтингу.
+    Снимок не изменяется после построения: при обновлении строится новый словарь и подменяется целиком,
+    поэтому чтение из обработчиков запросов не требует блокировок.
+    """
+
+    def __init__(self, pages: int, per_page: int, refresh_interval: float, concurrency: int) -> None:
+        self.pages = pages
+        self.per_page = per_page
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.updated_at: Optional[float] = None
+        self.refreshes = 0
+        self.errors = 0
+        self.last_refresh_duration = 0.0
+        self._items: Mapping[tuple[str, int, int], APIFilmsList] = MappingProxyType({})
+
+    def get(
+        self, genre: str = '', page: int = 1, per_page: int = settings.APP.PER_PAGE
+    ) -> Optional[APIFilmsList]:
+        return self._items.get((genre, page, per_page))
+
+    def items(self) -> Mapping[tuple[str, int, int], APIFilmsList]:
+        """Страницы снимка по жанру, номеру страницы и размеру страницы."""
+        return self._items
+
+    @property
+    def age(self) -> Optional[float]:
+        if self.updated_at is None:
+            return
+        return time.monotonic() - self.updated_at
+
+    async def refresh(self, search_service: MoviesDataSearchAbstract) -> None:
+        """Метод построения нового снимка топов фильмов.
+        Страницы, которые не удалось загрузить, берутся из предыдущего снимка.
+
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        """
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.concurrency)
+        keys = [
+            (genre_id, page, self.per_page)
+            for genre_id in ['', *(genre['uuid'] for genre in genres.values())]
+            for page in range(1, self.pages + 1)
+        ]
+
+        async def load(genre_id: str, page: int, per_page: int) -> Optional[APIFilmsList]:
+            async with semaphore:
+                return await search_service.load_list_films(genre=genre_id, page=page, per_page=per_page)
+
+        results = await asyncio.gather(*(load(*key) for key in keys))
+        items = dict(self._items)
+        for key, films in zip(keys, results):
+            if films is None:
+                self.errors += 1
+            elif films.items:
+                items[key] = films
+        self._items = MappingProxyType(items)
+        self.updated_at = time.monotonic()
+        self.refreshes += 1
+        self.last_refresh_duration = time.perf_counter() - started
+        logger.info(
+            'Top films snapshot refreshed: %s pages in %.2f s', len(items), self.last_refresh_duration
+        )
+
+    async def run(self, search_service: MoviesDataSearchAbstract) -> None:
+        """Фоновое обновление снимка при старте приложения и далее с заданным интервалом.
+
+        :param search_service: сервис взаимодействия с AsyncAPI.
+        """
+        while True:
+            try:
+                await self.refresh(search_service)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                self.errors += 1
+                logger.exception('Top films snapshot refresh failed')
+            await asyncio.sleep(self.refresh_interval)
+
+    def get_stats(self) -> dict[str, Any]:
+        return {
+            'items': len(self._items),
+            'age': self.age,
+            'refresh_interval': self.refresh_interval,
+            'last_refresh_duration': self.last_refresh_duration,
+            'refreshes': self.refreshes,
+            'errors': self.errors,
+        }
+
+
+@lru_cache()
+def get_top_films_snapshot() -> TopFilmsSnapshot:
+    return TopFilmsSnapshot(
+        pages=settings.SNAPSHOT.PAGES,
+        per_page=settings.APP.PER_PAGE,
+        refresh_interval=settings.SNAPSHOT.REFRESH_INTERVAL,
+        concurrency=settings.SNAPSHOT.CONCURRENCY,
+    )
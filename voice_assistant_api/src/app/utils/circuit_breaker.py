@@ -0,0 +1,167 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from functools import lru_cache
+from typing import Any, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Размыкатель цепи для запросов к AsyncAPI.
+    Результаты запросов за последние window секунд хранятся в скользящем окне. Когда в окне набирается
+    min_calls запросов и доля ошибок или медленных запросов достигает порога, цепь размыкается: новые запросы
+    отклоняются без обращения к AsyncAPI в течение open_duration секунд. Затем цепь переходит в полуоткрытое
+    состояние и пропускает half_open_probes пробных запросов: если все они успешны, цепь замыкается,
+    иначе снова размыкается.
+    Медленным считается запрос, не завершившийся за slow_call_duration секунд. Он учитывается в окне сразу
+    по истечении этого времени, не дожидаясь ответа.
+    """
+
+    def __init__(
+        self,
+        window: float,
+        min_calls: int,
+        failure_rate: float,
+        slow_call_duration: float,
+        slow_call_rate: float,
+        open_duration: float,
+        half_open_probes: int,
+    ) -> None:
+        self.window = window
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_duration = slow_call_duration
+        self.slow_call_rate = slow_call_rate
+        self.open_duration = open_duration
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_successes = 0
+        self.rejected = 0
+        self.transitions: dict[str, int] = {}
+        # Результаты запросов: время завершения, ошибка, медленный запрос, длительность
+        self._calls: deque[tuple[float, bool, bool, float]] = deque()
+
+    @property
+    def closed(self) -> bool:
+        return self.state == CLOSED
+
+    def allow(self) -> bool:
+        """Проверка возможности выполнить запрос к AsyncAPI.
+
+        :return: False, если цепь разомкнута и запрос следует отклонить.
+        """
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_duration:
+                self.rejected += 1
+                return False
+            self._transition(HALF_OPEN)
+        if self.probes < self.half_open_probes:
+            self.probes += 1
+            return True
+        self.rejected += 1
+        return False
+
+    def watch(self, task: asyncio.Future, is_failure: Callable[[Any], bool]) -> None:
+        """Учет результата запроса к AsyncAPI в скользящем окне.
+
+        :param task: задача выполнения запроса.
+        :param is_failure: функция проверки результата запроса на ошибку.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        probe = self.state == HALF_OPEN
+        slow = False
+
+        def on_slow() -> None:
+            nonlocal slow
+            slow = True
+            self.record(failed=False, slow=True, duration=self.slow_call_duration, probe=probe)
+
+        def on_done(done: asyncio.Future) -> None:
+            timer.cancel()
+            if slow:
+                return
+            failed = done.cancelled() or done.exception() is not None or is_failure(done.result())
+            self.record(failed=failed, slow=False, duration=loop.time() - started, probe=probe)
+
+        timer = loop.call_later(self.slow_call_duration, on_slow)
+        task.add_done_callback(on_done)
+
+    def record(self, failed: bool, slow: bool, duration: float, probe: bool = False) -> None:
+        if self.state == HALF_OPEN:
+            # Результаты запросов, начатых до размыкания цепи, не влияют на решение о ее замыкании
+            if not probe:
+                return
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self.probe_successes += 1
+            if self.probe_successes >= self.half_open_probes:
+                self._transition(CLOSED)
+            return
+        if self.state == OPEN:
+            return
+        now = time.monotonic()
+        self._calls.append((now, failed, slow, duration))
+        self._evict(now)
+        calls = len(self._calls)
+        if calls < self.min_calls:
+            return
+        failures = sum(1 for _, call_failed, _, _ in self._calls if call_failed)
+        slow_calls = sum(1 for _, _, call_slow, _ in self._calls if call_slow)
+        if failures / calls >= self.failure_rate or slow_calls / calls >= self.slow_call_rate:
+            self._transition(OPEN)
+
+    def _evict(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def _transition(self, state: str) -> None:
+        transition = f'{self.state}_{state}'
+        self.transitions[transition] = self.transitions.get(transition, 0) + 1
+        logger.warning('AsyncAPI circuit breaker: %s -> %s', self.state, state)
+        self.state = state
+        self.probes = 0
+        self.probe_successes = 0
+        if state == OPEN:
+            self.opened_at = time.monotonic()
+        self._calls.clear()
+
+    def get_stats(self) -> dict[str, Any]:
+        self._evict(time.monotonic())
+        calls = len(self._calls)
+        durations = sorted(duration for _, _, _, duration in self._calls)
+        return {
+            'state': self.state,
+            'calls': calls,
+            'failure_rate': sum(1 for call in self._calls if call[1]) / calls if calls else 0.0,
+            'slow_call_rate': sum(1 for call in self._calls if call[2]) / calls if calls else 0.0,
+            'latency_p95': durations[int(0.95 * (calls - 1))] if calls else 0.0,
+            'rejected': self.rejected,
+            'transitions': self.transitions,
+        }
+
+
+@lru_cache()
+def get_circuit_breaker() -> CircuitBreaker:
+    return CircuitBreaker(
+        window=settings.BREAKER.WINDOW,
+        min_calls=settings.BREAKER.MIN_CALLS,
+        failure_rate=settings.BREAKER.FAILURE_RATE,
+        slow_call_duration=settings.BREAKER.SLOW_CALL_DURATION,
+        slow_call_rate=settings.BREAKER.SLOW_CALL_RATE,
+        open_duration=settings.BREAKER.OPEN_DURATION,
+        half_open_probes=settings.BREAKER.HALF_OPEN_PROBES,
+    )
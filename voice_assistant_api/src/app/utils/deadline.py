@@ -0,0 +1,34 @@
+import time
+from typing import Optional
+
+
+class Deadline:
+    """Крайний срок обработки запроса навыка.
+    Создается при получении webhook-запроса и передается во все запросы к AsyncAPI, чтобы суммарное время
+    последовательных запросов не превышало время, отведенное Алисой на ответ.
+    """
+
+    __slots__ = ('expires_at',)
+
+    def __init__(self, timeout: float) -> None:
+        self.expires_at = time.monotonic() + timeout
+
+    def remaining(self) -> float:
+        """Оставшееся время до крайнего срока в секундах."""
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+def get_timeout(deadline: Optional[Deadline], timeout: float) -> float:
+    """Время ожидания ответа на запрос с учетом оставшегося до крайнего срока времени.
+
+    :param deadline: крайний срок обработки запроса навыка или None, если запрос выполняется вне webhook.
+    :param timeout: максимальное время ожидания ответа на один запрос.
+    :return: время ожидания в секундах.
+    """
+    if deadline is None:
+        return timeout
+    return min(timeout, deadline.remaining())
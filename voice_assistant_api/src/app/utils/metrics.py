@@ -0,0 +1,79 @@
+import re
+import time
+from functools import wraps
+from typing import Awaitable, Callable
+
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+# Отдельный реестр: в метрики навыка не попадают метрики процесса и платформы клиента Prometheus
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+# Границы корзин с запасом до 3 секунд, отведенных Алисой на ответ webhook
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 0.75, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0)
+
+WEBHOOK_LATENCY = Histogram(
+    'voice_webhook_duration_seconds',
+    'Время обработки запроса навыка по сцене ответа и интенту',
+    ['scene', 'intent'],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+WEBHOOK_REQUESTS = Counter(
+    'voice_webhook_requests_total',
+    'Количество запросов навыка по коллекции журнала: ответы и нераспознанные запросы',
+    ['collection'],
+    registry=REGISTRY,
+)
+SEARCH_LATENCY = Histogram(
+    'voice_search_method_duration_seconds',
+    'Время выполнения методов сервиса поиска данных о фильмах с учетом кеша',
+    ['method'],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+UPSTREAM_LATENCY = Histogram(
+    'voice_asyncapi_request_duration_seconds',
+    'Время выполнения HTTP-запроса к AsyncAPI по эндпоинту',
+    ['endpoint'],
+    buckets=LATENCY_BUCKETS,
+    registry=REGISTRY,
+)
+UPSTREAM_TIMEOUTS = Counter(
+    'voice_asyncapi_timeouts_total',
+    'Количество запросов к AsyncAPI, не дождавшихся ответа: deadline - время на ответ навыка истекло '
+    'до запроса, timeout - ответ не получен за отведенное время',
+    ['reason'],
+    registry=REGISTRY,
+)
+MONGO_LAG = Histogram(
+    'voice_mongo_log_lag_seconds',
+    'Время от постановки запроса навыка в очередь записи до окончания записи его пачки в MongoDB',
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0),
+    registry=REGISTRY,
+)
+
+_ID_SEGMENT = re.compile(r'/[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}(?=/|$)')
+
+
+def get_endpoint(path: str) -> str:
+    """Шаблон эндпоинта AsyncAPI для метки метрики: UUID в пути заменяется на {id}.
+
+    :param path: путь URL запроса без параметров.
+    :return: путь с {id} вместо UUID.
+    """
+    return _ID_SEGMENT.sub('/{id}', path)
+
+
+def observed(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Декоратор учета времени выполнения асинхронного метода в гистограмме SEARCH_LATENCY."""
+    histogram = SEARCH_LATENCY.labels(method=func.__name__)
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            histogram.observe(time.perf_counter() - start)
+
+    return wrapper
@@ -6,6 +6,12 @@ def encode_uri(url):
     return quote(url, safe="~@#$&()*!+=:;,.?/'")
 
 
+def normalize_query(text: str) -> str:
+    """Приведение текста слота к нормализованному виду для использования в качестве ключа кеша."""
+    text = text.casefold().replace('ё', 'е').strip(' "\'«»')
+    return ' '.join(text.split())
+
+
 def get_plural_form(number: int) -> int:
     if number % 10 == 1 and number % 100 != 11:
         return 0
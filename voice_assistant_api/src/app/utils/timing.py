@@ -0,0 +1,52 @@
+import logging
+import time
+from collections import defaultdict
+from functools import wraps
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class HandlerStats:
+    __slots__ = ('count', 'total', 'max')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, elapsed: float) -> None:
+        self.count += 1
+        self.total += elapsed
+        self.max = max(self.max, elapsed)
+
+    def dict(self) -> dict[str, Any]:
+        return {
+            'count': self.count,
+            'avg_ms': self.total / self.count * 1000 if self.count else 0.0,
+            'max_ms': self.max * 1000,
+        }
+
+
+handler_stats: defaultdict[str, HandlerStats] = defaultdict(HandlerStats)
+
+
+def timed(func: Callable[..., Awaitable]) -> Callable[..., Awaitable]:
+    """Декоратор учета времени выполнения асинхронного обработчика интента."""
+    name = func.__qualname__
+
+    @wraps(func)
+    async def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return await func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            handler_stats[name].add(elapsed)
+            logger.debug('Handler %s done in %.1f ms', name, elapsed * 1000)
+
+    return wrapper
+
+
+def get_handler_stats() -> dict[str, dict[str, Any]]:
+    return {name: stats.dict() for name, stats in handler_stats.items()}
@@ -0,0 +1,155 @@
+"""Бенчмарк разбора запроса навыка Алисы.
+
+Сравнивает прежний разбор тела запроса стандартным модулем json и вычисление интентов, слотов и состояния
+сессии при каждом обращении с разбором через orjson и объектом AliceRequest, сохраняющим вычисленные значения.
+Число обращений к свойствам соответствует обработке вопроса о фильме сценой FilmInfo.
+
+Запуск из каталога voice_assistant_api/src с заполненными переменными окружения приложения:
+    python -m benchmarks.request
+"""
+import json
+import timeit
+
+import orjson
+
+from app.services.alice.request import AliceRequest
+
+NUMBER = 50_000
+
+PAYLOADS = {
+    'film_director': {
+        'meta': {
+            'locale': 'ru-RU',
+            'timezone': 'UTC',
+            'client_id': 'ru.yandex.searchplugin/7.16 (none none; android 4.4.2)',
+            'interfaces': {'screen': {}, 'payments': {}, 'account_linking': {}},
+        },
+        'session': {
+            'message_id': 3,
+            'session_id': '2eac4854-fce721f3-b845abba-20d60',
+            'skill_id': '3ad36498-f5rd-4079-a14b-788652932056',
+            'user': {'user_id': '6C91DA5198D1758C6A9F63A7C5CDDF09359F683B13A18A151FBF4C8B092BB0C2'},
+            'application': {'application_id': '47C73714B580ED2469056E71081159529FFC676A4E5B059D629A819E857DC2F8'},
+            'new': False,
+        },
+        'request': {
+            'command': 'кто снял фильм звездные войны',
+            'original_utterance': 'Кто снял фильм Звездные войны?',
+            'nlu': {
+                'tokens': ['кто', 'снял', 'фильм', 'звездные', 'войны'],
+                'entities': [],
+                'intents': {
+                    'film_director': {
+                        'slots': {
+                            'film_name': {
+                                'type': 'YANDEX.STRING',
+                                'tokens': {'start': 3, 'end': 5},
+                                'value': 'звездные войны',
+                            }
+                        }
+                    }
+                },
+            },
+            'markup': {'dangerous_context': False},
+            'type': 'SimpleUtterance',
+        },
+        'state': {
+            'session': {
+                'scene': 'FilmInfo',
+                'last_phrase': 'Рейтинг фильма "Star Wars" по версии IMDB - 8.6.',
+                'film_id': '3d825f60-9fff-4dfe-b294-1a45fa1e115d',
+            },
+            'user': {},
+            'application': {},
+        },
+        'version': '1.0',
+    },
+    'next': {
+        'meta': {'locale': 'ru-RU', 'timezone': 'UTC', 'client_id': 'ru.yandex.searchplugin/7.16', 'interfaces': {}},
+        'session': {
+            'message_id': 7,
+            'session_id': '2eac4854-fce721f3-b845abba-20d60',
+            'skill_id': '3ad36498-f5rd-4079-a14b-788652932056',
+            'user': {'user_id': '6C91DA5198D1758C6A9F63A7C5CDDF09359F683B13A18A151FBF4C8B092BB0C2'},
+            'application': {'application_id': '47C73714B580ED2469056E71081159529FFC676A4E5B059D629A819E857DC2F8'},
+            'new': False,
+        },
+        'request': {
+            'command': 'дальше',
+            'original_utterance': 'Дальше',
+            'nlu': {'tokens': ['дальше'], 'entities': [], 'intents': {'next': {'slots': {}}}},
+            'markup': {'dangerous_context': False},
+            'type': 'SimpleUtterance',
+        },
+        'state': {
+            'session': {
+                'scene': 'TopFilms',
+                'last_phrase': 'Я нашла 39 фильмов в жанре Комедия. Вот пять из них с самым высоким рейтингом',
+                'page': 1,
+                'max_page': 8,
+                'last_intents': {
+                    'top_by_genre': {'slots': {'type': {'type': 'GenreType', 'value': 'Comedy'}}}
+                },
+            },
+            'user': {},
+            'application': {},
+        },
+        'version': '1.0',
+    },
+}
+
+
+class LegacyAliceRequest:
+    def __init__(self, request_body):
+        self.request_body = request_body
+
+    @property
+    def intents(self):
+        return self.request_body['request'].get('nlu', {}).get('intents', {})
+
+    @property
+    def slots(self):
+        request_intents = self.request_body['request']['nlu']['intents']
+        intent = list(request_intents.keys())[0]
+        result = {}
+        slots = self.request_body['request']['nlu']['intents'][intent]['slots']
+        for slot in slots:
+            result[slot] = slots[slot]['value']
+        return result
+
+    @property
+    def state(self):
+        return self.request_body.get('state', {}).get('session')
+
+
+def handle_turn(request) -> None:
+    # Обращения к свойствам запроса при переходе между сценами и ответе обработчика интента
+    for _ in range(4):
+        request.intents
+    for _ in range(2):
+        request.slots
+    for _ in range(4):
+        request.state
+
+
+def legacy(raw: bytes) -> None:
+    handle_turn(LegacyAliceRequest(json.loads(raw)))
+
+
+def current(raw: bytes) -> None:
+    handle_turn(AliceRequest(request_body=orjson.loads(raw), search_service=None))
+
+
+def main() -> None:
+    print(f'{"payload":<16}{"bytes":>8}{"legacy, us":>12}{"current, us":>13}')
+    for name, payload in PAYLOADS.items():
+        raw = json.dumps(payload, ensure_ascii=False).encode()
+        legacy_time = timeit.timeit(lambda: legacy(raw), number=NUMBER)
+        current_time = timeit.timeit(lambda: current(raw), number=NUMBER)
+        print(
+            f'{name:<16}{len(raw):>8}{legacy_time / NUMBER * 1e6:>12.2f}{current_time / NUMBER * 1e6:>13.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Микробенчмарк маршрутизации запроса навыка по сценам.
+
+Сравнивает выбор следующей сцены по скомпилированной таблице переходов с одиночными экземплярами сцен
+и прежний способ: создание экземпляра сцены на каждый запрос и построение множеств интентов при каждом вызове.
+
+Запуск из каталога voice_assistant_api/src с заполненными переменными окружения приложения:
+    python -m benchmarks.routing
+"""
+import timeit
+
+from app.services.alice import intents
+from app.services.alice.request import AliceRequest
+from app.services.alice.scenes import SCENES, FilmInfo, Helper, PersonInfo, TopFilms
+
+NUMBER = 100_000
+
+LEGACY_HELP_INTENTS = list(intents.HELP_INTENTS)
+LEGACY_TOP_FILM_INTENTS = list(intents.TOP_FILM_INTENTS)
+LEGACY_FILM_INFO_INTENTS = list(intents.FILM_INFO_INTENTS)
+LEGACY_PERSON_INFO_INTENTS = list(intents.PERSON_INFO_INTENTS)
+LEGACY_LOCAL_INTENTS = {
+    TopFilms: LEGACY_TOP_FILM_INTENTS,
+    FilmInfo: LEGACY_FILM_INFO_INTENTS,
+    PersonInfo: LEGACY_PERSON_INFO_INTENTS,
+}
+
+
+def legacy_move(scene_id: str, request: AliceRequest):
+    scene_class = type(SCENES[scene_id])
+    scene_class()
+    local_intents = LEGACY_LOCAL_INTENTS.get(scene_class)
+    if local_intents and set(request.intents) & set(local_intents):
+        return scene_class()
+    intents_set = set(request.intents)
+    if intents_set & set(LEGACY_HELP_INTENTS):
+        return Helper()
+    if intents_set & set(LEGACY_TOP_FILM_INTENTS):
+        return TopFilms()
+    if intents_set & set(LEGACY_FILM_INFO_INTENTS):
+        return FilmInfo()
+    if intents_set & set(LEGACY_PERSON_INFO_INTENTS):
+        return PersonInfo()
+
+
+def compiled_move(scene_id: str, request: AliceRequest):
+    return SCENES[scene_id].move(request)
+
+
+def make_request(intent: str) -> AliceRequest:
+    body = {'request': {'nlu': {'intents': {intent: {'slots': {}}}}}, 'state': {'session': {}}}
+    return AliceRequest(request_body=body, search_service=None)
+
+
+def main() -> None:
+    cases = [
+        ('Welcome', intents.TOP_BY_GENRE),
+        ('TopFilms', intents.NEXT),
+        ('TopFilms', intents.FILM_RATING),
+        ('FilmInfo', intents.DETAILS_FILM),
+        ('PersonInfo', intents.PERSON_FILMS),
+        ('PersonInfo', intents.HELP),
+    ]
+    print(f'{"scene":<12}{"intent":<20}{"legacy, us":>12}{"compiled, us":>14}')
+    for scene_id, intent in cases:
+        request = make_request(intent)
+        assert type(legacy_move(scene_id, request)) is type(compiled_move(scene_id, request))
+        legacy = timeit.timeit(lambda: legacy_move(scene_id, request), number=NUMBER)
+        compiled = timeit.timeit(lambda: compiled_move(scene_id, request), number=NUMBER)
+        print(
+            f'{scene_id:<12}{intent:<20}{legacy / NUMBER * 1e6:>12.2f}{compiled / NUMBER * 1e6:>14.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
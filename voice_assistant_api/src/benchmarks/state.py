@@ -0,0 +1,96 @@
+"""Размер состояния сессии навыка в прежнем и компактном виде.
+
+Алиса возвращает состояние сессии из ответа навыка в каждом следующем запросе, поэтому экономия на ходе
+диалога складывается из ответа навыка и следующего запроса. Для каждого типичного хода выводится размер
+состояния в байтах в прежнем и компактном виде, экономия за ход и время кодирования и раскодирования.
+Компактный вид измеряется в двух режимах: с общим кешем в Redis последняя фраза хранится в нем
+и в состоянии передается только ее ключ, без Redis (по умолчанию) фраза передается в состоянии в сжатом виде.
+
+Запуск из каталога voice_assistant_api/src с заполненными переменными окружения приложения:
+    python -m benchmarks.state
+"""
+import asyncio
+import time
+
+import orjson
+
+from app.services.alice.state import SessionStateCodec, get_state_codec
+
+NUMBER = 10_000
+
+DETAILS_TEXT = (
+    'Название: "Звёздные войны: Эпизод 4 – Новая надежда"\n'
+    'Жанры: Боевик, Приключения, Фэнтези, Фантастика\n'
+    'Режиссёр: Джордж Лукас\n'
+    'Сценарий: Джордж Лукас\n'
+    'Актёры: Марк Хэмилл, Харрисон Форд, Кэрри Фишер, Питер Кушинг, Алек Гиннесс\n'
+    'Сюжет фильма: Татуинская молодёжь Люк Скайуокер, мечтающий о приключениях, вместе с джедаем '
+    'Оби-Ваном Кеноби, контрабандистом Ханом Соло и двумя дроидами отправляется спасать принцессу Лею '
+    'из плена Галактической Империи и помогает повстанцам уничтожить Звезду Смерти.\n'
+    'IMDB рейтинг фильма: 8.6\n'
+    'Продолжительность фильма: 121 минута\n'
+    'Дата релиза: 1977-05-25\n'
+)
+
+TURNS = {
+    'top_by_genre': {
+        'scene': 'TopFilms',
+        'last_phrase': (
+            'Я нашла 39 фильмов в жанре Комедия. Вот пять из них с самым высоким рейтингом:\n'
+            ' 1. Большой Лебовски, рейтинг - 8.1 \n 2. Амели, рейтинг - 8.3 \n 3. Огни большого города, '
+            'рейтинг - 8.5 \n 4. Новые времена, рейтинг - 8.5 \n 5. Жизнь прекрасна, рейтинг - 8.6\n'
+        ),
+        'page': 1,
+        'max_page': 8,
+        'last_intents': {'top_by_genre': {'slots': {'type': {'type': 'GenreType', 'value': 'Comedy'}}}},
+    },
+    'film_director': {
+        'scene': 'FilmInfo',
+        'last_phrase': 'Фильм "Звёздные войны: Эпизод 4 – Новая надежда" был снят Джордж Лукас.',
+        'film_id': '3d825f60-9fff-4dfe-b294-1a45fa1e115d',
+    },
+    'details_film': {
+        'scene': 'FilmInfo',
+        'last_phrase': DETAILS_TEXT,
+        'film_id': '3d825f60-9fff-4dfe-b294-1a45fa1e115d',
+    },
+    'person_films': {
+        'scene': 'PersonInfo',
+        'last_phrase': (
+            'Харрисон Форд снимался в фильмах:\nЗвёздные войны: Эпизод 4 – Новая надежда, рейтинг - 8.6\n'
+            'Бегущий по лезвию, рейтинг - 8.1\nИндиана Джонс: В поисках утраченного ковчега, рейтинг - 8.4'
+        ),
+        'person_id': '5b4bf1bc-3397-4e83-9b17-8b10c6544ed1',
+    },
+}
+
+
+MODES = {'redis': True, 'inline': False}
+
+
+async def main() -> None:
+    codec = get_state_codec()
+    codec.compact = True
+    for mode, offload_phrase in MODES.items():
+        codec.offload_phrase = offload_phrase
+        print(f'\nLast phrase: {mode}')
+        await measure(codec)
+
+
+async def measure(codec: SessionStateCodec) -> None:
+    print(f'{"turn":<16}{"legacy, B":>11}{"compact, B":>12}{"saved/turn, B":>15}{"encode+decode, us":>19}')
+    for name, state in TURNS.items():
+        compact = await codec.encode(state)
+        legacy_size = len(orjson.dumps(state))
+        compact_size = len(orjson.dumps(compact))
+        started = time.perf_counter()
+        for _ in range(NUMBER):
+            codec.decode(await codec.encode(state))
+        elapsed = (time.perf_counter() - started) / NUMBER * 1e6
+        # Состояние передается дважды за ход: в ответе навыка и в следующем запросе Алисы
+        saved = 2 * (legacy_size - compact_size)
+        print(f'{name:<16}{legacy_size:>11}{compact_size:>12}{saved:>15}{elapsed:>19.2f}')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
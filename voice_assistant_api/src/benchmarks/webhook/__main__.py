@@ -0,0 +1,218 @@
+"""Бенчмарк webhook навыка на корпусе запросов Алисы.
+
+Воспроизводит корпус запросов по всем интентам навыка через приложение FastAPI. AsyncAPI заменяется
+локальной заглушкой aiohttp с задержкой ответа --latency. Для каждой пары сцены и интента выводятся
+перцентили p50, p95 и p99 времени ответа и пропускная способность при --concurrency одновременных запросах,
+в конце - те же показатели для смешанного потока запросов по всему корпусу.
+Если p99 какой-либо пары превышает --budget секунд, бенчмарк завершается с кодом 1.
+
+Запуск из каталога voice_assistant_api/src с заполненными переменными окружения приложения:
+    python -m benchmarks.webhook --latency 0.05 --requests 200 --concurrency 20
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Any
+
+import orjson
+
+from benchmarks.webhook.corpus import CORPUS, Case, get_missing_intents, make_body
+from benchmarks.webhook.stub import AsyncAPIStub
+
+WEBHOOK_PATH = '/api/v1/voice_assistant'
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Бенчмарк webhook навыка Алисы')
+    parser.add_argument('--latency', type=float, default=0.05, help='Задержка ответа AsyncAPI в секундах')
+    parser.add_argument('--requests', type=int, default=200, help='Количество запросов на каждый интент')
+    parser.add_argument('--concurrency', type=int, default=20, help='Количество одновременных запросов')
+    parser.add_argument('--budget', type=float, default=3.0, help='Допустимое время ответа p99 в секундах')
+    parser.add_argument('--warmup', type=float, default=0.0, help='Время фоновой загрузки данных в секундах')
+    parser.add_argument('--port', type=int, default=18080, help='Порт заглушки AsyncAPI')
+    return parser.parse_args()
+
+
+def percentile(values: list[float], q: float) -> float:
+    # Перцентиль по ближайшему рангу для отсортированного списка
+    return values[max(0, math.ceil(q * len(values)) - 1)]
+
+
+async def call_webhook(app, body: bytes) -> tuple[int, bytes]:
+    """Вызов webhook напрямую через интерфейс ASGI, без сетевого стека HTTP-клиента.
+
+    :param app: приложение FastAPI.
+    :param body: тело запроса Алисы.
+    :return: код и тело ответа.
+    """
+    scope = {
+        'type': 'http',
+        'asgi': {'version': '3.0'},
+        'http_version': '1.1',
+        'method': 'POST',
+        'scheme': 'http',
+        'path': WEBHOOK_PATH,
+        'raw_path': WEBHOOK_PATH.encode(),
+        'root_path': '',
+        'query_string': b'',
+        'headers': [(b'content-type', b'application/json'), (b'content-length', str(len(body)).encode())],
+        'client': ('127.0.0.1', 0),
+        'server': ('127.0.0.1', 80),
+    }
+    response_done = asyncio.Event()
+    request_sent = False
+    status = 0
+    chunks = []
+
+    async def receive() -> dict[str, Any]:
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {'type': 'http.request', 'body': body, 'more_body': False}
+        await response_done.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status
+        if message['type'] == 'http.response.start':
+            status = message['status']
+        elif message['type'] == 'http.response.body':
+            chunks.append(message.get('body', b''))
+            if not message.get('more_body', False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return status, b''.join(chunks)
+
+
+async def replay(app, cases: list[Case], requests: int, concurrency: int, results: dict) -> float:
+    """Воспроизведение реплик корпуса по кругу.
+
+    :param app: приложение FastAPI.
+    :param cases: реплики корпуса.
+    :param requests: количество запросов.
+    :param concurrency: количество одновременных запросов.
+    :param results: словарь времени ответа в секундах и количества ошибок по сцене и интенту.
+    :return: время воспроизведения в секундах.
+    """
+    from app.services.alice.state import get_state_codec
+
+    bodies = [
+        (case.intent or 'new_session', orjson.dumps(make_body(case, message_id)))
+        for message_id, case in enumerate(cases, start=1)
+    ]
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def send_one(index: int) -> None:
+        intent, body = bodies[index % len(bodies)]
+        async with semaphore:
+            started = time.perf_counter()
+            status, content = await call_webhook(app, body)
+            elapsed = time.perf_counter() - started
+        scene = '-'
+        if status == 200:
+            state = get_state_codec().decode(orjson.loads(content).get('session_state'))
+            scene = (state or {}).get('scene', '-')
+        key = (scene, intent)
+        results[key]['times'].append(elapsed)
+        if status != 200:
+            results[key]['errors'] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(send_one(index) for index in range(requests)))
+    return time.perf_counter() - started
+
+
+def print_report(title: str, results: dict, wall_times: dict[str, float], budget: float) -> bool:
+    """Вывод перцентилей и пропускной способности.
+
+    :return: True, если p99 всех пар сцены и интента укладывается в budget.
+    """
+    print(f'\n{title}')
+    print(
+        f'{"scene":<12}{"intent":<24}{"n":>6}{"errors":>8}{"p50, ms":>10}{"p95, ms":>10}'
+        f'{"p99, ms":>10}{"max, ms":>10}{"rps":>9}'
+    )
+    within_budget = True
+    for (scene, intent), result in sorted(results.items()):
+        times = sorted(result['times'])
+        p99 = percentile(times, 0.99)
+        within_budget = within_budget and p99 <= budget
+        # Пропускная способность интента считается по времени воспроизведения его запросов
+        intent_requests = sum(len(value['times']) for (_, name), value in results.items() if name == intent)
+        rps = intent_requests / wall_times[intent] if intent in wall_times else 0.0
+        print(
+            f'{scene:<12}{intent:<24}{len(times):>6}{result["errors"]:>8}'
+            f'{percentile(times, 0.5) * 1000:>10.1f}{percentile(times, 0.95) * 1000:>10.1f}'
+            f'{p99 * 1000:>10.1f}{times[-1] * 1000:>10.1f}{rps:>9.0f}'
+            f'{"" if p99 <= budget else "  > budget"}'
+        )
+    return within_budget
+
+
+async def main(args: argparse.Namespace) -> int:
+    missing = get_missing_intents()
+    if missing:
+        print(f'No corpus requests for intents: {", ".join(missing)}', file=sys.stderr)
+        return 1
+
+    from app.core import session
+    from app.main import app, init_services
+    from app.services.title_index import get_title_index
+    from app.services.top_films_snapshot import get_top_films_snapshot
+
+    stub = AsyncAPIStub(latency=args.latency)
+    await stub.start('127.0.0.1', args.port)
+    # Как при старте приложения, но без MongoDB и Redis: запись запросов навыка не входит в время ответа
+    session.session = await session.create_session()
+    init_services(session.session)
+    search_service = app.state.search_service
+    background = [
+        asyncio.create_task(get_top_films_snapshot().run(search_service)),
+        asyncio.create_task(get_title_index().run(search_service)),
+    ]
+    await asyncio.sleep(args.warmup)
+
+    try:
+        within_budget = True
+        results = defaultdict(lambda: {'times': [], 'errors': 0})
+        wall_times = {}
+        for intent, cases in CORPUS.items():
+            wall_times[intent] = await replay(app, cases, args.requests, args.concurrency, results)
+        within_budget &= print_report('By scene and intent', results, wall_times, args.budget)
+
+        # Смешанный поток: реплики всех интентов в случайном порядке
+        mixed_cases = [case for cases in CORPUS.values() for case in cases]
+        random.Random(0).shuffle(mixed_cases)
+        mixed_results = defaultdict(lambda: {'times': [], 'errors': 0})
+        requests = args.requests * len(CORPUS)
+        wall_time = await replay(app, mixed_cases, requests, args.concurrency, mixed_results)
+        all_times = {'times': [elapsed for value in mixed_results.values() for elapsed in value['times']]}
+        all_times['errors'] = sum(value['errors'] for value in mixed_results.values())
+        within_budget &= print_report('Mixed corpus', {('*', '*'): all_times}, {'*': wall_time}, args.budget)
+        print(f'\nAsyncAPI requests: {stub.requests}')
+    finally:
+        for task in background:
+            task.cancel()
+        search_service.cancel_prefetch()
+        await session.session.close()
+        await stub.close()
+    return 0 if within_budget else 1
+
+
+if __name__ == '__main__':
+    arguments = parse_args()
+    # Настройки приложения читаются при импорте, поэтому адрес заглушки задается до импорта app
+    os.environ['REQUEST_ASYNC_API_URL'] = f'http://127.0.0.1:{arguments.port}/api/v1'
+    os.environ.setdefault('REQUEST_AUTH_API_URL', 'http://127.0.0.1/api/v1')
+    os.environ.setdefault('AUTH_ACCESS_TOKEN', 'benchmark')
+    os.environ.setdefault('JAEGER_ENABLED', 'False')
+    exit_code = asyncio.run(main(arguments))
+    logging.shutdown()
+    sys.exit(exit_code)
@@ -0,0 +1,137 @@
+"""Корпус запросов Алисы для бенчмарка webhook.
+
+Для каждого интента из alice_skill_settings/intents задано несколько реплик со слотами и состоянием сессии
+предыдущего хода, по которым строятся тела запросов Алисы. Дополнительно корпус содержит начало сессии
+и встроенные интенты Алисы.
+"""
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
+from app.services.alice import intents
+
+INTENTS_DIR = Path(__file__).parents[2] / 'app/services/alice/alice_skill_settings/intents'
+
+# Имя файла грамматики интента не всегда совпадает с идентификатором интента
+INTENT_FILES = {
+    'film_realise_date': intents.FILM_RELEASE_DATE,
+}
+
+FILM_STATE = {
+    'scene': 'FilmInfo',
+    'last_phrase': 'Рейтинг фильма "Звездные войны" по версии IMDB - 9.5.',
+    'film_id': '00000000-0000-0000-0000-000000000001',
+}
+PERSON_STATE = {
+    'scene': 'PersonInfo',
+    'last_phrase': 'Харрисон Форд участвовал в фильмах как актёр.',
+    'person_id': '00000000-0000-0000-0000-000000002710',
+}
+TOP_STATE = {
+    'scene': 'TopFilms',
+    'last_phrase': 'Я нашла 16 фильмов в жанре Комедия. Вот пять из них с самым высоким рейтингом',
+    'page': 2,
+    'max_page': 4,
+    'last_intents': {intents.TOP_BY_GENRE: {'slots': {'type': {'type': 'GenreType', 'value': 'Comedy'}}}},
+}
+WELCOME_STATE = {'scene': 'Welcome', 'last_phrase': 'Привет! Я знаю всё о фильмах.'}
+
+FILMS = ['звездные войны', 'матрица', 'криминальное чтиво', 'крестный отец', 'интерстеллар', 'фильм 42']
+PERSONS = ['харрисон форд', 'марк хэмилл', 'киану ривз', 'квентин тарантино', 'персона 12']
+GENRES = ['Comedy', 'Drama', 'Sci-Fi', 'Action', 'Fantasy']
+
+
+class Case(NamedTuple):
+    intent: Optional[str]
+    utterance: str
+    slots: dict[str, str]
+    state: Optional[dict[str, Any]]
+
+
+def film_cases(intent: str, phrase: str) -> list[Case]:
+    cases = [
+        Case(intent, f'{phrase} {film}', {'type': 'movie', 'film_name': film}, WELCOME_STATE) for film in FILMS
+    ]
+    # Вопрос о фильме из предыдущего хода без названия
+    cases.append(Case(intent, phrase, {'type': 'movie'}, FILM_STATE))
+    return cases
+
+
+def person_cases(intent: str, phrase: str) -> list[Case]:
+    cases = [
+        Case(intent, f'{phrase} {person}', {'person_name': person}, WELCOME_STATE) for person in PERSONS
+    ]
+    cases.append(Case(intent, phrase, {}, PERSON_STATE))
+    return cases
+
+
+CORPUS: dict[str, list[Case]] = {
+    intents.TOP_BY_GENRE: [
+        Case(intents.TOP_BY_GENRE, f'топ {genre}', {'type': genre}, WELCOME_STATE) for genre in GENRES
+    ],
+    intents.TOP_BY_RATING: [Case(intents.TOP_BY_RATING, 'топ фильмов', {'type': 'movie'}, WELCOME_STATE)],
+    intents.NEXT: [Case(intents.NEXT, 'дальше', {}, TOP_STATE)],
+    intents.PREVIOUS: [Case(intents.PREVIOUS, 'назад', {}, TOP_STATE)],
+    intents.FILM_RATING: film_cases(intents.FILM_RATING, 'какой рейтинг у фильма'),
+    intents.FILM_GENRES: film_cases(intents.FILM_GENRES, 'какой жанр у фильма'),
+    intents.FILM_ACTORS: film_cases(intents.FILM_ACTORS, 'кто снялся в фильме'),
+    intents.FILM_DIRECTOR: film_cases(intents.FILM_DIRECTOR, 'кто снял фильм'),
+    intents.FILM_WRITERS: film_cases(intents.FILM_WRITERS, 'кто написал сценарий к фильму'),
+    intents.FILM_DESCRIPTION: film_cases(intents.FILM_DESCRIPTION, 'какой сюжет у фильма'),
+    intents.FILM_RELEASE_DATE: film_cases(intents.FILM_RELEASE_DATE, 'когда вышел фильм'),
+    intents.FILM_DURATION: film_cases(intents.FILM_DURATION, 'сколько идет фильм'),
+    intents.DETAILS_FILM: film_cases(intents.DETAILS_FILM, 'подробнее о фильме'),
+    intents.PERSON_ROLES: person_cases(intents.PERSON_ROLES, 'в каком качестве работал'),
+    intents.PERSON_FILMS: person_cases(intents.PERSON_FILMS, 'в каких фильмах снялся'),
+    intents.DETAILS_PERSON: person_cases(intents.DETAILS_PERSON, 'подробнее об актере'),
+    intents.HELP: [Case(intents.HELP, 'помощь', {}, WELCOME_STATE)],
+    intents.WHAT_CAN_YOU_DO: [Case(intents.WHAT_CAN_YOU_DO, 'что ты умеешь', {}, WELCOME_STATE)],
+    intents.REPEAT: [
+        Case(intents.REPEAT, 'повтори', {}, state) for state in (TOP_STATE, FILM_STATE, PERSON_STATE)
+    ],
+    # Начало новой сессии без состояния
+    'new_session': [Case(None, '', {}, None)],
+}
+
+
+def get_missing_intents() -> list[str]:
+    """Интенты из каталога грамматик навыка, для которых в корпусе нет реплик."""
+    names = (INTENT_FILES.get(path.stem, path.stem) for path in INTENTS_DIR.glob('*.yaml'))
+    return sorted(name for name in names if name not in CORPUS)
+
+
+def make_body(case: Case, message_id: int = 1) -> dict[str, Any]:
+    """Тело запроса Алисы для реплики корпуса.
+
+    :param case: реплика корпуса.
+    :param message_id: номер сообщения в сессии.
+    :return: тело запроса webhook.
+    """
+    nlu_intents = {}
+    if case.intent is not None:
+        nlu_intents[case.intent] = {
+            'slots': {
+                name: {'type': 'YANDEX.STRING', 'value': value} for name, value in case.slots.items()
+            }
+        }
+    return {
+        'meta': {
+            'locale': 'ru-RU', 'timezone': 'UTC', 'client_id': 'benchmark', 'interfaces': {'screen': {}},
+        },
+        'session': {
+            'message_id': message_id,
+            'session_id': f'benchmark-{message_id}',
+            'skill_id': 'benchmark',
+            'user': {'user_id': 'benchmark'},
+            'application': {'application_id': 'benchmark'},
+            'new': case.state is None,
+        },
+        'request': {
+            'command': case.utterance,
+            'original_utterance': case.utterance,
+            'nlu': {'tokens': case.utterance.split(), 'entities': [], 'intents': nlu_intents},
+            'markup': {'dangerous_context': False},
+            'type': 'SimpleUtterance',
+        },
+        'state': {'session': case.state or {}, 'user': {}, 'application': {}},
+        'version': '1.0',
+    }
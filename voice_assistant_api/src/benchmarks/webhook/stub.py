@@ -0,0 +1,183 @@
+"""Заглушка AsyncAPI для бенчмарка webhook.
+
+Отдает детерминированный набор фильмов и персон в формате AsyncAPI с настраиваемой задержкой ответа,
+поэтому время ответа навыка измеряется без Elasticsearch и сети.
+"""
+import asyncio
+from typing import Any, Optional
+from uuid import UUID
+
+from aiohttp import web
+
+from app.services.alice.fixtures import genres
+
+FILMS_COUNT = 200
+PERSONS_COUNT = 50
+
+FILM_TITLES = [
+    ('Star Wars', 'Звездные войны'),
+    ('The Matrix', 'Матрица'),
+    ('Pulp Fiction', 'Криминальное чтиво'),
+    ('The Godfather', 'Крестный отец'),
+    ('Interstellar', 'Интерстеллар'),
+    ('Fight Club', 'Бойцовский клуб'),
+    ('Forrest Gump', 'Форрест Гамп'),
+    ('Inception', 'Начало'),
+]
+PERSON_NAMES = [
+    ('Mark Hamill', 'Марк Хэмилл'),
+    ('Harrison Ford', 'Харрисон Форд'),
+    ('Keanu Reeves', 'Киану Ривз'),
+    ('Quentin Tarantino', 'Квентин Тарантино'),
+    ('Christopher Nolan', 'Кристофер Нолан'),
+]
+
+
+def make_films() -> list[dict[str, Any]]:
+    genre_items = [{'uuid': genre['uuid'], 'name': name} for name, genre in genres.items()]
+    films = []
+    for i in range(FILMS_COUNT):
+        title, title_ru = FILM_TITLES[i] if i < len(FILM_TITLES) else (f'Film {i}', f'Фильм {i}')
+        films.append({
+            'uuid': str(UUID(int=i + 1)),
+            'title': title,
+            'title_ru': title_ru,
+            'imdb_rating': round(9.5 - i * 4 / FILMS_COUNT, 1),
+            'description_ru': f'Сюжет фильма "{title_ru}" в нескольких предложениях.',
+            'genre': [genre_items[i % len(genre_items)], genre_items[(i * 7 + 3) % len(genre_items)]],
+            'actors_names': ['Mark Hamill', 'Harrison Ford'],
+            'actors_names_ru': ['Марк Хэмилл', 'Харрисон Форд'],
+            'directors_names': ['George Lucas'],
+            'directors_names_ru': ['Джордж Лукас'],
+            'writers_names': ['George Lucas'],
+            'writers_names_ru': ['Джордж Лукас'],
+            'imdb_image': f'https://images.example.com/{i + 1}.jpg',
+            'runtime_mins': 90 + i % 60,
+            'release_date': f'{1970 + i % 50}-05-25',
+        })
+    return films
+
+
+def make_persons(films: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    persons = []
+    for i in range(PERSONS_COUNT):
+        name, name_ru = PERSON_NAMES[i] if i < len(PERSON_NAMES) else (f'Person {i}', f'Персона {i}')
+        persons.append({
+            'uuid': str(UUID(int=10_000 + i)),
+            'full_name': name,
+            'full_name_ru': name_ru,
+            'roles': ['actor', 'director'] if i % 3 == 0 else ['actor'],
+            'film_ids': [film['uuid'] for film in films[i::PERSONS_COUNT]],
+        })
+    return persons
+
+
+BASE_FIELDS = ('uuid', 'title', 'title_ru', 'imdb_rating', 'imdb_image')
+
+
+class AsyncAPIStub:
+    """Заглушка эндпоинтов AsyncAPI, к которым обращается навык.
+
+    :param latency: задержка каждого ответа в секундах.
+    """
+
+    def __init__(self, latency: float) -> None:
+        self.latency = latency
+        self.films = make_films()
+        self.persons = make_persons(self.films)
+        self.films_by_id = {film['uuid']: film for film in self.films}
+        self.persons_by_id = {person['uuid']: person for person in self.persons}
+        self.requests = 0
+        self.runner: Optional[web.AppRunner] = None
+
+    async def start(self, host: str, port: int) -> None:
+        app = web.Application()
+        app.router.add_get('/api/v1/film/search', self.search_films)
+        app.router.add_get('/api/v1/film', self.list_films)
+        app.router.add_get('/api/v1/film/{film_id}', self.film_detail)
+        app.router.add_get('/api/v1/person/search', self.search_persons)
+        app.router.add_get('/api/v1/person', self.list_persons)
+        app.router.add_get('/api/v1/person/{person_id}', self.person_detail)
+        app.router.add_get('/api/v1/person/{person_id}/film', self.person_films)
+        app.middlewares.append(self.delay)
+        self.runner = web.AppRunner(app, access_log=None)
+        await self.runner.setup()
+        await web.TCPSite(self.runner, host, port).start()
+
+    async def close(self) -> None:
+        if self.runner is not None:
+            await self.runner.cleanup()
+
+    @web.middleware
+    async def delay(self, request: web.Request, handler):
+        self.requests += 1
+        await asyncio.sleep(self.latency)
+        return await handler(request)
+
+    @staticmethod
+    def page(request: web.Request, items: list[dict[str, Any]], fields=None) -> web.Response:
+        page = int(request.query.get('page', 1))
+        limit = int(request.query.get('limit', 50))
+        page_items = items[(page - 1) * limit:page * limit]
+        if fields is not None:
+            page_items = [{field: item[field] for field in fields} for item in page_items]
+        return web.json_response(
+            {'total': len(items), 'page': page, 'count': len(page_items), 'items': page_items}
+        )
+
+    async def search_films(self, request: web.Request) -> web.Response:
+        query = request.query['q'].lower()
+        found = [
+            film for film in self.films
+            if query in film['title'].lower() or query in film['title_ru'].lower()
+        ]
+        if not found:
+            return web.json_response({'detail': 'film not found'}, status=404)
+        return self.page(request, found, BASE_FIELDS)
+
+    async def list_films(self, request: web.Request) -> web.Response:
+        films = self.films
+        genre = request.query.get('genre')
+        if genre:
+            films = [film for film in films if any(item['uuid'] == genre for item in film['genre'])]
+        return self.page(request, films, BASE_FIELDS)
+
+    async def film_detail(self, request: web.Request) -> web.Response:
+        film = self.films_by_id.get(request.match_info['film_id'])
+        if film is None:
+            return web.json_response({'detail': 'film not found'}, status=404)
+        fields = request.query.get('fields')
+        if fields:
+            # Как и AsyncAPI, возвращаются только запрошенные поля и uuid
+            film = {field: film[field] for field in ('uuid', *fields.split(',')) if field in film}
+        return web.json_response(film)
+
+    async def search_persons(self, request: web.Request) -> web.Response:
+        query = request.query['q'].lower()
+        found = [
+            person for person in self.persons
+            if query in person['full_name'].lower() or query in person['full_name_ru'].lower()
+        ]
+        if not found:
+            return web.json_response({'detail': 'person not found'}, status=404)
+        return self.page(request, found)
+
+    async def list_persons(self, request: web.Request) -> web.Response:
+        return self.page(request, self.persons)
+
+    async def person_detail(self, request: web.Request) -> web.Response:
+        person = self.persons_by_id.get(request.match_info['person_id'])
+        if person is None:
+            return web.json_response({'detail': 'person not found'}, status=404)
+        return web.json_response(person)
+
+    async def person_films(self, request: web.Request) -> web.Response:
+        person = self.persons_by_id.get(request.match_info['person_id'])
+        if person is None:
+            return web.json_response({'detail': 'person not found'}, status=404)
+        films = sorted(
+            (self.films_by_id[film_id] for film_id in person['film_ids']),
+            key=lambda film: film['imdb_rating'],
+            reverse=True,
+        )
+        return self.page(request, films, BASE_FIELDS)
@@ -0,0 +1,83 @@
+from uuid import uuid4
+
+import pytest
+
+from app.services.title_index import FuzzyIndex, TitleIndex, get_numbers
+
+ROCKY_4_ID = str(uuid4())
+ROCKY_5_ID = str(uuid4())
+TERMINATOR_3_ID = str(uuid4())
+GODFATHER_2_ID = str(uuid4())
+MATRIX_ID = str(uuid4())
+
+
+@pytest.fixture
+def title_index():
+    index = TitleIndex(min_score=0.85, max_candidates=50, page_size=100, sync_interval=1, resync_interval=1)
+    index.films.add(ROCKY_4_ID, 'Rocky IV', 'Рокки 4')
+    index.films.add(TERMINATOR_3_ID, 'Terminator 3: Rise of the Machines', 'Терминатор 3: Восстание машин')
+    index.films.add(GODFATHER_2_ID, 'The Godfather Part II', 'Крестный отец 2')
+    index.films.add(MATRIX_ID, 'The Matrix', 'Матрица')
+    return index
+
+
+@pytest.mark.parametrize(
+    'text, numbers',
+    [
+        ('матрица', []),
+        ('рокки 4', [4]),
+        ('rocky iv', [4]),
+        ('терминатор 2: восстание машин', [2]),
+        ('крестный отец ii', [2]),
+        ('1+1', [1, 1]),
+        ('malcolm x', [10]),
+    ],
+)
+def test_get_numbers(text, numbers):
+    assert get_numbers(text) == numbers
+
+
+@pytest.mark.parametrize(
+    'query, film_id',
+    [
+        ('Рокки 4', ROCKY_4_ID),
+        ('rocky iv', ROCKY_4_ID),
+        ('терминатор 3 восстание машин', TERMINATOR_3_ID),
+        ('крестный отец 2', GODFATHER_2_ID),
+        ('матрицa', MATRIX_ID),
+        ('матрица', MATRIX_ID),
+    ],
+)
+def test_find_film_ok(title_index, query, film_id):
+    assert title_index.find_film(query) == film_id
+
+
+@pytest.mark.parametrize(
+    'query',
+    [
+        'рокки 5',
+        'rocky v',
+        'терминатор 2: восстание машин',
+        'крестный отец',
+        'крестный отец 3',
+        'матрица 2',
+    ],
+)
+def test_find_film_other_part_missing(title_index, query):
+    assert title_index.find_film(query) is None
+    assert title_index.misses == 1
+
+
+def test_find_film_other_part_indexed(title_index):
+    title_index.films.add(ROCKY_5_ID, 'Rocky V', 'Рокки 5')
+
+    assert title_index.find_film('рокки 5') == ROCKY_5_ID
+    assert title_index.find_film('рокки 4') == ROCKY_4_ID
+
+
+def test_search_ambiguous_name():
+    index = FuzzyIndex(max_candidates=50)
+    index.add(str(uuid4()), 'Двойник')
+    index.add(str(uuid4()), 'Двойник')
+
+    assert index.search('двойник') == (None, 0.0)